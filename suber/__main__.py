@@ -1,23 +1,30 @@
 #!/usr/bin/env python3
 
 import argparse
+import dataclasses
 import json
 
 from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
+from suber.data_types import Segment
 from suber.file_readers import read_input_file
-from suber.concat_input_files import create_concatenated_segments
-from suber.hyp_to_ref_alignment import levenshtein_align_hypothesis_to_reference
-from suber.hyp_to_ref_alignment import time_align_hypothesis_to_reference
-from suber.metrics.suber import calculate_SubER
 from suber.metrics.suber_statistics import SubERStatisticsCollector
-from suber.metrics.sacrebleu_interface import calculate_sacrebleu_metric
-from suber.metrics.jiwer_interface import calculate_word_error_rate
-from suber.metrics.cer import calculate_character_error_rate
-from suber.metrics.length_ratio import calculate_length_ratio
+from suber.metrics.metric_input_cache import MetricInputCache
+from suber.progress import ProgressReporter
+from suber.tracing import TracingHooks
+from suber.metrics.metric_statistics import (
+    check_metrics_are_mergeable, create_statistics_output, get_results_from_statistics)
+
+# Alignment and metric modules are imported only when needed. Their dependencies, e.g. sacrebleu and jiwer, take longer
+# to import than SubER computation takes for a typical file.
 
 
 def parse_arguments():
+    return create_argument_parser().parse_args()
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         description="SubER - Subtitle Edit Rate. An automatic, reference-based, segmentation- and timing-aware "
@@ -44,57 +51,224 @@ def parse_arguments():
     parser.add_argument("--suber-statistics", action="store_true",
                         help="If set, will create an '#info' field in the output containing statistics about the "
                              "different edit operations used to calculate the SubER score.")
-
-    return parser.parse_args()
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes. Used to read and parse the input files in parallel, either "
+                             "multiple hypothesis and reference files at once, or chunks of single large SRT files. "
+                             "Also, multiple metrics are computed in parallel, or, for a single WER metric or TER "
+                             "metric with '--ter-backend internal', the segments are scored in parallel.")
+    parser.add_argument("--ter-backend", default="sacrebleu", choices=["sacrebleu", "internal"],
+                        help="Implementation used for TER, TER-seg and TER-br, including the 'AS-' and 't-' variants. "
+                             "'internal' uses the edit distance code of SubER without the time constraints, it gives "
+                             "the same scores as sacrebleu but is faster and can use multiple worker processes.")
+    parser.add_argument("--input-cache-dir",
+                        help="If set, parsed input files are cached in this directory in a binary format, such that "
+                             "repeated runs on unchanged files (typically the references) can skip parsing. This roughly "
+                             "halves the reading time, constructing the words still takes the other half.")
+    parser.add_argument("--progress", action="store_true",
+                        help="If set, progress and estimated remaining time of SubER computation and of the "
+                             "Levenshtein alignment for 'AS-' metrics are reported on stderr. If several metrics are "
+                             "computed in parallel via '--jobs', only the number of completed metrics is reported.")
+    parser.add_argument("--checkpoint-file",
+                        help="If set, the results of the independent parts of SubER computation are stored in this "
+                             "file as soon as they are completed. If the computation is interrupted, e.g. for a long "
+                             "concatenation of many files, running it again with the same file continues where it "
+                             "stopped. Stored results are only reused for identical input.")
+    parser.add_argument("--emit-stats", action="store_true",
+                        help="If set, outputs the sufficient statistics of the metrics (e.g. number of edits and "
+                             "reference length) instead of the scores. Statistics of different parts of a test set, "
+                             "possibly scored on different machines, can be merged with 'suber-merge' to obtain the "
+                             "same scores as when passing all files to a single 'suber' call. Not supported for 'AS-' "
+                             "metrics, and not for 'length_ratio' in case of Japanese and Korean.")
+    parser.add_argument("--result-cache-dir",
+                        help="If set, the output is stored in this directory and returned directly, without reading "
+                             "the files or computing any metric, by later runs on input files with identical content "
+                             "and with identical options. Can be shared by concurrently running processes.")
+    parser.add_argument("--result-cache-max-size", type=float, default=100.0,
+                        help="Maximum total size of the result cache in megabytes. Least recently used results are "
+                             "removed if it is exceeded.")
+
+    return parser
 
 
 def main():
     args = parse_arguments()
 
+    print(create_output(args))
+
+
+def create_output(args: argparse.Namespace, calculate_results_function=None) -> str:
+    """
+    Returns the JSON output of the 'suber' command for the given command line arguments, either loaded from the result
+    cache or computed using 'calculate_results_function', which defaults to calculate_results().
+    """
+    calculate_results_function = calculate_results_function or calculate_results
+
     check_metrics(args.metrics)
     check_file_formats(args.hypothesis_format, args.reference_format, args.metrics)
+    if args.emit_stats:
+        check_metrics_are_mergeable(args.metrics, language=args.language)
+
+    metrics = list(OrderedDict.fromkeys(args.metrics))  # metrics specified multiple times by the user are computed once
+
+    if args.result_cache_dir is not None:
+        from suber.result_cache import get_result_cache_key, load_cached_result, store_result_in_cache
+
+        result_options = OrderedDict(
+            metrics=metrics, hypothesis_format=args.hypothesis_format, reference_format=args.reference_format,
+            language=args.language, suber_statistics=args.suber_statistics, ter_backend=args.ter_backend,
+            emit_stats=args.emit_stats)
+        result_cache_key = get_result_cache_key(args.hypothesis, args.reference, result_options)
+
+        json_results = load_cached_result(result_cache_key, args.result_cache_dir)
+        if json_results is not None:
+            return json_results
 
+    results = calculate_results_function(args, metrics)
+
+    json_results = json.dumps(results, indent=4)
+
+    if args.result_cache_dir is not None:
+        store_result_in_cache(json_results, result_cache_key, args.result_cache_dir,
+                              max_size_bytes=int(args.result_cache_max_size * 1024 * 1024))
+
+    return json_results
+
+
+def calculate_results(args: argparse.Namespace, metrics: List[str]) -> Dict[str, Any]:
+    """
+    Reads the input files and computes the output of the 'suber' command for the given command line arguments.
+    """
     # A "segment" is a subtitle in case of SRT file input, or a line of text in case of plain input.
     if len(args.hypothesis) == 1 and len(args.reference) == 1:
-        hypothesis_segments = read_input_file(args.hypothesis[0], file_format=args.hypothesis_format)
-        reference_segments = read_input_file(args.reference[0], file_format=args.reference_format)
+        hypothesis_segments = read_input_file(
+            args.hypothesis[0], file_format=args.hypothesis_format, cache_directory=args.input_cache_dir,
+            num_workers=args.jobs)
+        reference_segments = read_input_file(
+            args.reference[0], file_format=args.reference_format, cache_directory=args.input_cache_dir,
+            num_workers=args.jobs)
     else:
+        from suber.concat_input_files import create_concatenated_segments
+
         hypothesis_segments, reference_segments = create_concatenated_segments(
-            args.hypothesis, args.reference, args.hypothesis_format, args.reference_format)
+            args.hypothesis, args.reference, args.hypothesis_format, args.reference_format,
+            cache_directory=args.input_cache_dir, num_workers=args.jobs)
+
+    return calculate_results_for_segments(args, metrics, hypothesis_segments, reference_segments)
+
+
+def calculate_results_for_segments(args: argparse.Namespace, metrics: List[str], hypothesis_segments: List[Segment],
+                                   reference_segments: List[Segment],
+                                   metric_input_cache: Optional[MetricInputCache] = None) -> Dict[str, Any]:
+    """
+    Same as calculate_results() but for already read segments. A 'metric_input_cache' can be passed to reuse
+    pre-processed reference segments from earlier calls.
+    """
+    metric_calculator = MetricCalculator(
+        hypothesis_segments, reference_segments, language=args.language, suber_statistics=args.suber_statistics,
+        ter_backend=args.ter_backend, metric_input_cache=metric_input_cache, checkpoint_file=args.checkpoint_file,
+        progress=args.progress)
+
+    # Alignments are created before computing metrics in parallel, such that they are not created in each process.
+    metric_calculator.create_alignments(metrics)
+
+    if args.jobs > 1 and len(metrics) > 1:
+        import concurrent.futures
+
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(args.jobs, len(metrics)), initializer=_initialize_worker,
+                initargs=(metric_calculator,)) as executor:
+            futures = [executor.submit(_calculate_metric_statistics_in_worker, metric) for metric in metrics]
+
+            if args.progress:
+                # Workers do not report progress themselves, see _initialize_worker().
+                progress_reporter = ProgressReporter("Metrics", total_cost=len(metrics))
+                for num_completed_metrics, _ in enumerate(concurrent.futures.as_completed(futures), start=1):
+                    progress_reporter.update(num_completed_metrics, status=f"{num_completed_metrics}/{len(metrics)}")
+                progress_reporter.finish()
+
+            metric_statistics = [future.result() for future in futures]
+    else:
+        # Without parallelism across metrics, a single metric may use the worker processes itself.
+        metric_statistics = [
+            metric_calculator.calculate_statistics(metric, num_workers=args.jobs) for metric in metrics]
 
-    # Aligned hypotheses, either by Levenshtein distance or timing, are only needed by some metrics so we create them
-    # lazily here.
-    levenshtein_aligned_hypothesis_segments = None
-    time_aligned_hypothesis_segments = None
+    metric_statistics = OrderedDict(zip(metrics, metric_statistics))
 
-    results = OrderedDict()
-    additional_outputs = OrderedDict()
+    if args.emit_stats:
+        return create_statistics_output(metric_statistics, language=args.language)
+    else:
+        return get_results_from_statistics(metric_statistics, language=args.language)
+
+
+class MetricCalculator:
+    """
+    Computes single metrics for fixed hypothesis and reference segments. Metrics are independent of each other, so
+    calculate_statistics() can be called in parallel in several processes, each having a copy of this object.
+    """
+
+    def __init__(self, hypothesis_segments: List[Segment], reference_segments: List[Segment],
+                 language: Optional[str] = None, suber_statistics=False, ter_backend: str = "sacrebleu",
+                 metric_input_cache: Optional[MetricInputCache] = None, checkpoint_file: Optional[str] = None,
+                 progress=False, tracing_hooks: Optional[TracingHooks] = None):
+        self._hypothesis_segments = hypothesis_segments
+        self._reference_segments = reference_segments
+        self._language = language
+        self._suber_statistics = suber_statistics
+        self._ter_backend = ter_backend
+        self._checkpoint_file = checkpoint_file
+        self._progress = progress
+        self._tracing_hooks = tracing_hooks
+
+        # Aligned hypotheses, either by Levenshtein distance or timing, are only needed by some metrics so we create
+        # them lazily.
+        self._levenshtein_aligned_hypothesis_segments = None
+        self._time_aligned_hypothesis_segments = None
+
+        # Shared by the metrics to avoid repeating the same string conversions and reference pre-processing.
+        self._metric_input_cache = metric_input_cache if metric_input_cache is not None else MetricInputCache()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Cache entries are identified by object ids, which are not valid in other processes.
+        state["_metric_input_cache"] = MetricInputCache()
+        return state
+
+    def create_alignments(self, metrics: List[str]):
+        """
+        Creates all hypothesis-to-reference alignments needed to compute 'metrics'.
+        """
+        if any(metric.startswith("AS-") for metric in metrics):
+            self._get_levenshtein_aligned_hypothesis_segments()
+        if any(metric.startswith("t-") for metric in metrics):
+            self._get_time_aligned_hypothesis_segments()
+
+    def calculate_statistics(self, metric: str, num_workers: int = 1) -> Dict[str, Any]:
+        """
+        Returns the sufficient statistics for the given metric, see 'suber.metrics.metric_statistics'. For SubER, they
+        include the edit operation counts if 'suber_statistics' is set. 'num_workers' > 1 allows parallel computation
+        within the metric, currently used for WER and the internal TER backend.
+        """
+        if metric == "length_ratio":
+            from suber.metrics.length_ratio import calculate_length_statistics
 
-    for metric in args.metrics:
-        if metric in results:
-            continue  # specified multiple times by the user
+            num_hypothesis_tokens, num_reference_tokens = calculate_length_statistics(
+                hypothesis=self._hypothesis_segments, reference=self._reference_segments, language=self._language)
 
-        if metric == "length_ratio":
-            results[metric] = calculate_length_ratio(
-                hypothesis=hypothesis_segments, reference=reference_segments, language=args.language)
-            continue
+            return OrderedDict([
+                ("num_hypothesis_tokens", num_hypothesis_tokens), ("num_reference_tokens", num_reference_tokens)])
 
         # When using existing parallel segments there will always be a <eob> word match in the end, don't count it.
         # On the other hand, if hypothesis gets aligned to reference a match is not guaranteed, so count it.
         score_break_at_segment_end = False
 
-        full_metric_name = metric
-        hypothesis_segments_to_use = hypothesis_segments
+        hypothesis_segments_to_use = self._hypothesis_segments
+        reference_segments = self._reference_segments
 
         if metric.startswith("AS-"):
             # "AS" stands for automatic segmentation, in particular re-segmentation of the hypothesis using
             # the Levenshtein alignment to the reference.
             # AS-WER and AS-BLEU were introduced by Matusov et al. https://aclanthology.org/2005.iwslt-1.19.pdf
-            if levenshtein_aligned_hypothesis_segments is None:
-                levenshtein_aligned_hypothesis_segments = levenshtein_align_hypothesis_to_reference(
-                    hypothesis=hypothesis_segments, reference=reference_segments, language=args.language)
-
-            hypothesis_segments_to_use = levenshtein_aligned_hypothesis_segments
+            hypothesis_segments_to_use = self._get_levenshtein_aligned_hypothesis_segments()
             metric = metric[len("AS-"):]
             score_break_at_segment_end = True
 
@@ -102,50 +276,100 @@ def main():
             # "t" stands for timed. Subtitle timings will be used to re-segment the hypothesis to match the reference
             # segments. t-BLEU was introduced by Cherry et al.
             # https://www.isca-archive.org/interspeech_2021/cherry21_interspeech.pdf
-            if time_aligned_hypothesis_segments is None:
-                time_aligned_hypothesis_segments = time_align_hypothesis_to_reference(
-                    hypothesis=hypothesis_segments, reference=reference_segments, language=args.language)
-
-            hypothesis_segments_to_use = time_aligned_hypothesis_segments
+            hypothesis_segments_to_use = self._get_time_aligned_hypothesis_segments()
             metric = metric[len("t-"):]
             score_break_at_segment_end = True
 
         elif not metric.startswith("SubER") and len(hypothesis_segments_to_use) != len(reference_segments):
             raise ValueError(f"Metric '{metric}' assumes same number of segments in hypothesis and reference, but got "
-                             f"{len(hypothesis_segments)} hypothesis and {len(reference_segments)} "
+                             f"{len(hypothesis_segments_to_use)} hypothesis and {len(reference_segments)} "
                              f"reference segments.")
 
         if metric.startswith("SubER"):
-            statistics_collector = SubERStatisticsCollector() if args.suber_statistics else None
+            from suber.metrics.suber import calculate_SubER_statistics
+
+            statistics_collector = SubERStatisticsCollector() if self._suber_statistics else None
 
-            metric_score = calculate_SubER(
+            num_edits, reference_length = calculate_SubER_statistics(
                 hypothesis=hypothesis_segments_to_use, reference=reference_segments, metric=metric,
-                statistics_collector=statistics_collector, language=args.language)
+                statistics_collector=statistics_collector, language=self._language,
+                checkpoint_file=self._checkpoint_file, progress_reporter=self._create_progress_reporter(metric),
+                tracing_hooks=self._tracing_hooks)
 
+            statistics = OrderedDict([("num_edits", num_edits), ("reference_length", reference_length)])
             if statistics_collector:
-                additional_outputs[full_metric_name] = statistics_collector.get_statistics()
+                statistics["edit_operations"] = statistics_collector.get_statistics()
+
+            return statistics
 
         elif metric.startswith("WER"):
-            metric_score = calculate_word_error_rate(
+            from suber.metrics.jiwer_interface import calculate_word_error_counts
+
+            word_error_counts = calculate_word_error_counts(
                 hypothesis=hypothesis_segments_to_use, reference=reference_segments, metric=metric,
-                score_break_at_segment_end=score_break_at_segment_end, language=args.language)
+                score_break_at_segment_end=score_break_at_segment_end, language=self._language,
+                cache=self._metric_input_cache, num_workers=num_workers)
+
+            return OrderedDict(dataclasses.asdict(word_error_counts))
 
         elif metric.startswith("CER"):
-            metric_score = calculate_character_error_rate(
+            from suber.metrics.cer import calculate_character_edit_statistics
+
+            num_edits, num_reference_characters = calculate_character_edit_statistics(
                 hypothesis=hypothesis_segments_to_use, reference=reference_segments, metric=metric)
 
+            return OrderedDict([("num_edits", num_edits), ("num_reference_characters", num_reference_characters)])
+
         else:
-            metric_score = calculate_sacrebleu_metric(
+            from suber.metrics.sacrebleu_interface import calculate_sacrebleu_statistics
+
+            corpus_statistics = calculate_sacrebleu_statistics(
                 hypothesis=hypothesis_segments_to_use, reference=reference_segments, metric=metric,
-                score_break_at_segment_end=score_break_at_segment_end, language=args.language)
+                score_break_at_segment_end=score_break_at_segment_end, language=self._language,
+                cache=self._metric_input_cache, ter_backend=self._ter_backend, num_workers=num_workers)
 
-        results[full_metric_name] = metric_score
+            return OrderedDict([("corpus_statistics", corpus_statistics)])
 
-    if additional_outputs:
-        results["#info"] = additional_outputs
+    def disable_progress(self):
+        self._progress = False
 
-    json_results = json.dumps(results, indent=4)
-    print(json_results)
+    def _create_progress_reporter(self, description: str) -> Optional[ProgressReporter]:
+        return ProgressReporter(description) if self._progress else None
+
+    def _get_levenshtein_aligned_hypothesis_segments(self) -> List[Segment]:
+        if self._levenshtein_aligned_hypothesis_segments is None:
+            from suber.hyp_to_ref_alignment import levenshtein_align_hypothesis_to_reference
+
+            self._levenshtein_aligned_hypothesis_segments = levenshtein_align_hypothesis_to_reference(
+                hypothesis=self._hypothesis_segments, reference=self._reference_segments, language=self._language,
+                progress_reporter=self._create_progress_reporter("Levenshtein alignment"),
+                tracing_hooks=self._tracing_hooks)
+
+        return self._levenshtein_aligned_hypothesis_segments
+
+    def _get_time_aligned_hypothesis_segments(self) -> List[Segment]:
+        if self._time_aligned_hypothesis_segments is None:
+            from suber.hyp_to_ref_alignment import time_align_hypothesis_to_reference
+
+            self._time_aligned_hypothesis_segments = time_align_hypothesis_to_reference(
+                hypothesis=self._hypothesis_segments, reference=self._reference_segments, language=self._language,
+                tracing_hooks=self._tracing_hooks)
+
+        return self._time_aligned_hypothesis_segments
+
+
+_worker_metric_calculator: Optional[MetricCalculator] = None
+
+
+def _initialize_worker(metric_calculator: MetricCalculator):
+    global _worker_metric_calculator
+    _worker_metric_calculator = metric_calculator
+    # Reports of several processes would overwrite each other on a terminal.
+    _worker_metric_calculator.disable_progress()
+
+
+def _calculate_metric_statistics_in_worker(metric: str) -> Dict[str, Any]:
+    return _worker_metric_calculator.calculate_statistics(metric)
 
 
 def check_metrics(metrics):
@@ -1,11 +1,16 @@
-from typing import List, Tuple
+import concurrent.futures
+import dataclasses
+import functools
+from typing import List, Optional, Tuple
 
 from suber.file_readers import read_input_file
 from suber.data_types import Segment, Subtitle
+from suber.utilities import paused_garbage_collection
 
 
 def create_concatenated_segments(hypothesis_files: List[str], reference_files: List[str], hypothesis_format="SRT",
-                                 reference_format="SRT") -> Tuple[List[Segment], List[Segment]]:
+                                 reference_format="SRT", cache_directory: Optional[str] = None,
+                                 num_workers: int = 1) -> Tuple[List[Segment], List[Segment]]:
     """
     Reads all pairs of hypothesis and reference files and creates two concatenated lists containing all hypothesis
     segments and all reference segments, respectively. This can be used to score test corpora available in form of many
@@ -13,6 +18,8 @@ def create_concatenated_segments(hypothesis_files: List[str], reference_files: L
     In case of SRT input the segments are subtitles with timing information. We adjust the subtitle timings such that
     all files are placed one after the other on the time axis, which corresponds to concatenating the corresponding
     audio / video files.
+    'cache_directory' is passed on to read_input_file(). If 'num_workers' > 1, files are read and parsed in parallel
+    using that many processes. The results are identical to sequential reading.
     """
     if len(hypothesis_files) != len(reference_files):
         raise ValueError("Number of hypothesis and reference files must match.")
@@ -24,14 +31,25 @@ def create_concatenated_segments(hypothesis_files: List[str], reference_files: L
     total_hypothesis_duration = 0.0
     total_reference_duration = 0.0
 
-    for hypothesis_file, reference_file in zip(hypothesis_files, reference_files):
-        hypothesis_segments = read_input_file(hypothesis_file, file_format=hypothesis_format)
-        reference_segments = read_input_file(reference_file, file_format=reference_format)
+    read_file_pair = functools.partial(
+        _read_file_pair, hypothesis_format=hypothesis_format, reference_format=reference_format,
+        cache_directory=cache_directory)
 
+    if num_workers > 1 and len(hypothesis_files) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor, \
+                paused_garbage_collection():
+            all_file_segments = list(executor.map(read_file_pair, hypothesis_files, reference_files))
+    else:
+        all_file_segments = map(read_file_pair, hypothesis_files, reference_files)
+
+    # Shifting depends on the durations of all previous files, so it is done sequentially in the original order.
+    for hypothesis_segments, reference_segments in all_file_segments:
         if hypothesis_segments and isinstance(hypothesis_segments[0], Subtitle):
-            total_hypothesis_duration = _shift_subtitles_in_time(hypothesis_segments, seconds_to_shift)
+            hypothesis_segments, total_hypothesis_duration = _shift_subtitles_in_time(
+                hypothesis_segments, seconds_to_shift)
         if reference_segments and isinstance(reference_segments[0], Subtitle):
-            total_reference_duration = _shift_subtitles_in_time(reference_segments, seconds_to_shift)
+            reference_segments, total_reference_duration = _shift_subtitles_in_time(
+                reference_segments, seconds_to_shift)
 
         seconds_to_shift = max(total_hypothesis_duration, total_reference_duration)
 
@@ -41,22 +59,33 @@ def create_concatenated_segments(hypothesis_files: List[str], reference_files: L
     return all_hypothesis_segments, all_reference_segments
 
 
-def _shift_subtitles_in_time(subtitles: List[Subtitle], seconds) -> float:
+def _read_file_pair(hypothesis_file: str, reference_file: str, hypothesis_format: str, reference_format: str,
+                    cache_directory: Optional[str]) -> Tuple[List[Segment], List[Segment]]:
+    hypothesis_segments = read_input_file(
+        hypothesis_file, file_format=hypothesis_format, cache_directory=cache_directory)
+    reference_segments = read_input_file(
+        reference_file, file_format=reference_format, cache_directory=cache_directory)
+
+    return hypothesis_segments, reference_segments
+
+
+def _shift_subtitles_in_time(subtitles: List[Subtitle], seconds) -> Tuple[List[Subtitle], float]:
     """
-    Returns new total duration after shift.
+    Returns shifted copies of the subtitles and the new total duration after shift.
     """
 
-    for subtitle in subtitles:
-        _shift_subtitle_in_time(subtitle, seconds)
+    shifted_subtitles = [_shift_subtitle_in_time(subtitle, seconds) for subtitle in subtitles]
 
     # There might be audio / video left after the last subtitle end time, but taking this into account is not necessary
     # for metric calculation.
     # We add an epsilon to make sure that subtitles from different files are not counted as overlapping.
-    return subtitles[-1].end_time + 1e-8
+    return shifted_subtitles, shifted_subtitles[-1].end_time + 1e-8
+
 
+def _shift_subtitle_in_time(subtitle: Subtitle, seconds) -> Subtitle:
+    word_list = [
+        dataclasses.replace(word, approximate_word_time=word.approximate_word_time + seconds)
+        for word in subtitle.word_list]
 
-def _shift_subtitle_in_time(subtitle: Subtitle, seconds):
-    subtitle.start_time += seconds
-    subtitle.end_time += seconds
-    for word in subtitle.word_list:
-        word.approximate_word_time += seconds
+    return Subtitle(word_list=word_list, index=subtitle.index, start_time=subtitle.start_time + seconds,
+                    end_time=subtitle.end_time + seconds)
@@ -1,5 +1,5 @@
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 
@@ -9,28 +9,50 @@ class LineBreak(Enum):
     END_OF_BLOCK = 2  # represented as '<eob>' in plain text files
 
 
-@dataclass
+# Words and segments are immutable and must be fully constructed in one step. Words are hashed very often, e.g. for the
+# cached edit distance in lib_ter.py, so they cache their hash. Slots save the per-instance dict, which matters for the
+# millions of words of large input files.
+
+@dataclass(frozen=True, slots=True)
 class Word:
     string: str
     line_break: LineBreak = LineBreak.NONE  # the line break after the word, if any
+    _hash: int = field(init=False, repr=False, compare=False)  # unset until first call of __hash__()
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            object.__setattr__(self, "_hash", hash(self._field_values()))
+            return self._hash
+
+    def __reduce__(self):
+        # Don't pickle the cached hash, string hashes differ between processes.
+        return self.__class__, self._field_values()
 
+    def _field_values(self) -> tuple:
+        return self.string, self.line_break
 
-@dataclass(unsafe_hash=True)
-# Needs to be hashable for cached edit distance in lib_ter.py, but 'approximate_word_time' is currently set after
-# creation within SRTFileReader, so cannot set frozen=True.
-# TODO: find clean solution
+
+@dataclass(frozen=True, slots=True)
 class TimedWord(Word):
     subtitle_start_time: float = None
     subtitle_end_time: float = None
     approximate_word_time: float = None  # usually interpolated from subtitle start and end time; for t-BLEU calculation
 
+    __hash__ = Word.__hash__  # otherwise replaced by the uncached dataclass default
+
+    def _field_values(self) -> tuple:
+        return (self.string, self.line_break, self.subtitle_start_time, self.subtitle_end_time,
+                self.approximate_word_time)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Segment:
     word_list: List[Word]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Subtitle(Segment):
     index: int
     start_time: float
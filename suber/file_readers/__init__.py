@@ -1,3 +1,3 @@
-from .file_reader_base import read_input_file
+from .file_reader_base import read_input_file, iterate_input_file
 from .plain_file_reader import PlainFileReader
 from .srt_file_reader import SRTFileReader
@@ -1,23 +1,39 @@
 import gzip
+import os
+import time
 
-from typing import List
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 from io import TextIOWrapper
 
 from suber.data_types import Segment
+from suber.tracing import TracingHooks
+from suber.utilities import paused_garbage_collection
 
 
 class FileReaderBase:
     """
     Derived classes must implement self._parse_lines().
     """
+    # Must be increased by derived classes whenever a change in parsing alters the output, invalidates cached segments.
+    version = 1
+
     def __init__(self, file_name):
         self._file_name = file_name
 
     def read(self) -> List[Segment]:
+        with paused_garbage_collection():
+            return list(self.iterate())
+
+    def iterate(self) -> Iterator[Segment]:
+        """
+        Yields the segments one by one while reading the file, such that the full file content never has to be held in
+        memory.
+        """
         with self._open_file() as file_object:
-            return list(self._parse_lines(file_object))
+            yield from self._parse_lines(file_object)
 
-    def _parse_lines(self, file_object: TextIOWrapper) -> List[Segment]:
+    def _parse_lines(self, file_object: TextIOWrapper) -> Iterator[Segment]:
         raise NotImplementedError
 
     def _open_file(self):
@@ -27,21 +43,77 @@ class FileReaderBase:
             return open(self._file_name, "r", encoding="utf-8")
 
 
-def read_input_file(file_name, file_format) -> List[Segment]:
-    from suber.file_readers import PlainFileReader, SRTFileReader  # here to avoid circular import
-    from suber.file_readers.srt_file_reader import SRTFormatError
+def read_input_file(file_name, file_format, cache_directory: Optional[str] = None, num_workers: int = 1,
+                    tracing_hooks: Optional[TracingHooks] = None) -> List[Segment]:
+    """
+    Reads all segments from the file. If 'cache_directory' is set, parsed segments are stored there in a binary format
+    and loaded from there instead of parsing the file again in later calls, see 'suber.file_readers.parsed_file_cache'.
+    If 'num_workers' > 1, SRT files are parsed in parallel, see SRTFileReader.read_in_parallel().
+    If 'tracing_hooks' are set, they are notified of the file size on disk and the number of segments read.
+    """
+    if tracing_hooks is None:
+        return _read_segments(file_name, file_format, cache_directory, num_workers)
 
-    if file_format == "SRT":
-        file_reader = SRTFileReader(file_name)
-    elif file_format == "plain":
-        file_reader = PlainFileReader(file_name)
-    else:
-        raise ValueError(f"Unknown file format: {file_format}")
+    start_time = time.perf_counter()
+    segments = _read_segments(file_name, file_format, cache_directory, num_workers)
+    tracing_hooks.file_read(
+        file_name, file_format, os.path.getsize(file_name), len(segments), time.perf_counter() - start_time)
+
+    return segments
+
+
+def _read_segments(file_name, file_format, cache_directory: Optional[str], num_workers: int) -> List[Segment]:
+    file_reader_class = _get_file_reader_class(file_format)
+
+    with paused_garbage_collection():
+        if cache_directory is not None:
+            from suber.file_readers.parsed_file_cache import load_cached_segments, store_segments_in_cache
+
+            segments = load_cached_segments(file_name, file_format, file_reader_class.version, cache_directory)
+            if segments is not None:
+                return segments
+
+        if num_workers > 1 and file_format == "SRT":
+            with _wrapped_reading_errors(file_name, file_format):
+                segments = file_reader_class(file_name).read_in_parallel(num_workers)
+        else:
+            segments = list(iterate_input_file(file_name, file_format))
+
+        if cache_directory is not None:
+            store_segments_in_cache(segments, file_name, file_format, file_reader_class.version, cache_directory)
+
+    return segments
+
+
+def iterate_input_file(file_name, file_format) -> Iterator[Segment]:
+    """
+    Same as read_input_file(), but reads the file lazily. Note, that format errors will only be raised when the
+    corresponding part of the file is reached.
+    """
+    file_reader = _get_file_reader_class(file_format)(file_name)
+
+    with _wrapped_reading_errors(file_name, file_format):
+        yield from file_reader.iterate()
+
+
+@contextmanager
+def _wrapped_reading_errors(file_name, file_format):
+    from suber.file_readers.srt_file_reader import SRTFormatError  # here to avoid circular import
 
     try:
-        segments = file_reader.read()
+        yield
     except Exception as e:
         extra_message = " (Forgot '-f/-F plain'?)" if (file_format == "SRT" and isinstance(e, SRTFormatError)) else ""
         raise Exception(f"Error reading file '{file_name}'.{extra_message}") from e
 
-    return segments
+
+def _get_file_reader_class(file_format):
+    from suber.file_readers import PlainFileReader, SRTFileReader  # here to avoid circular import
+
+    if file_format == "SRT":
+        return SRTFileReader
+    elif file_format == "plain":
+        return PlainFileReader
+    else:
+        raise ValueError(f"Unknown file format: {file_format}")
+
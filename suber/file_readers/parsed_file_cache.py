@@ -0,0 +1,137 @@
+import hashlib
+import os
+import tempfile
+from typing import List, Optional
+
+import numpy
+
+from suber.data_types import LineBreak, Word, TimedWord, Segment, Subtitle
+
+
+# Increase if the layout of the cache files changes.
+_CACHE_FORMAT_VERSION = 1
+
+_LINE_BREAKS_BY_CODE = sorted(LineBreak, key=lambda line_break: line_break.value)
+
+
+def load_cached_segments(file_name: str, file_format: str, reader_version: int,
+                         cache_directory: str) -> Optional[List[Segment]]:
+    """
+    Returns the segments stored for 'file_name' by store_segments_in_cache(), or None if there is no valid cache entry.
+    A cache entry is only valid if size, modification time and content hash of the file, as well as the version of the
+    file reader, are the same as when the entry was created.
+    """
+    cache_file_name = _get_cache_file_name(file_name, file_format, cache_directory)
+    if not os.path.isfile(cache_file_name):
+        return None
+
+    try:
+        with numpy.load(cache_file_name) as cache_entry:
+            arrays = {key: cache_entry[key] for key in cache_entry.files}
+    except Exception:
+        return None  # e.g. incomplete file, treat as cache miss
+
+    try:
+        expected_fingerprint = _get_fingerprint(file_name, file_format, reader_version)
+    except OSError:
+        return None  # let the file reader report the error
+
+    fingerprint = arrays.get("fingerprint")
+    if fingerprint is None or fingerprint.tobytes().decode("utf-8") != expected_fingerprint:
+        return None
+
+    return _segments_from_arrays(arrays, timed=(file_format == "SRT"))
+
+
+def store_segments_in_cache(segments: List[Segment], file_name: str, file_format: str, reader_version: int,
+                            cache_directory: str):
+    """
+    Serializes the parsed 'segments' of 'file_name' into a binary cache file in 'cache_directory'. The file is written
+    atomically, such that concurrent processes never see partially written entries.
+    """
+    arrays = _segments_to_arrays(segments, timed=(file_format == "SRT"))
+    fingerprint = _get_fingerprint(file_name, file_format, reader_version)
+    arrays["fingerprint"] = numpy.frombuffer(fingerprint.encode("utf-8"), dtype=numpy.uint8)
+
+    os.makedirs(cache_directory, exist_ok=True)
+    cache_file_name = _get_cache_file_name(file_name, file_format, cache_directory)
+
+    temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(dir=cache_directory, suffix=".tmp")
+    try:
+        with os.fdopen(temporary_file_descriptor, "wb") as temporary_file:
+            numpy.savez(temporary_file, **arrays)
+        os.replace(temporary_file_name, cache_file_name)
+    except BaseException:
+        os.remove(temporary_file_name)
+        raise
+
+
+def _get_cache_file_name(file_name: str, file_format: str, cache_directory: str) -> str:
+    key = f"{os.path.abspath(file_name)}\n{file_format}"
+    return os.path.join(cache_directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".npz")
+
+
+def _get_fingerprint(file_name: str, file_format: str, reader_version: int) -> str:
+    file_status = os.stat(file_name)
+
+    content_hash = hashlib.sha256()
+    with open(file_name, "rb") as file_object:
+        for block in iter(lambda: file_object.read(1 << 20), b""):
+            content_hash.update(block)
+
+    return (f"{_CACHE_FORMAT_VERSION} {file_format} {reader_version} {os.path.abspath(file_name)} "
+            f"{file_status.st_size} {file_status.st_mtime_ns} {content_hash.hexdigest()}")
+
+
+def _segments_to_arrays(segments: List[Segment], timed: bool):
+    all_words = [word for segment in segments for word in segment.word_list]
+
+    # Words never contain whitespace, so we can store all distinct strings as one newline-separated string.
+    vocabulary = {}
+    word_ids = [vocabulary.setdefault(word.string, len(vocabulary)) for word in all_words]
+    string_table = "\n".join(vocabulary).encode("utf-8")
+
+    arrays = {
+        "string_table": numpy.frombuffer(string_table, dtype=numpy.uint8),
+        "word_ids": numpy.array(word_ids, dtype=numpy.int32),
+        "line_breaks": numpy.array([word.line_break.value for word in all_words], dtype=numpy.int8),
+        "segment_lengths": numpy.array([len(segment.word_list) for segment in segments], dtype=numpy.int64),
+    }
+
+    if timed:
+        arrays["subtitle_indices"] = numpy.array([subtitle.index for subtitle in segments], dtype=numpy.int64)
+        arrays["start_times"] = numpy.array([subtitle.start_time for subtitle in segments], dtype=numpy.float64)
+        arrays["end_times"] = numpy.array([subtitle.end_time for subtitle in segments], dtype=numpy.float64)
+        arrays["approximate_word_times"] = numpy.array(
+            [word.approximate_word_time for word in all_words], dtype=numpy.float64)
+
+    return arrays
+
+
+def _segments_from_arrays(arrays, timed: bool) -> List[Segment]:
+    string_table = arrays["string_table"].tobytes().decode("utf-8").split("\n")
+    word_strings = [string_table[word_id] for word_id in arrays["word_ids"].tolist()]
+    line_breaks = [_LINE_BREAKS_BY_CODE[code] for code in arrays["line_breaks"].tolist()]
+    segment_lengths = arrays["segment_lengths"]
+
+    # Construct all words in one pass over per-word columns, then slice them into segments. Much faster than per-word
+    # indexing, almost all of the remaining time is spent in the dataclass constructors.
+    if timed:
+        all_words = list(map(
+            TimedWord, word_strings, line_breaks, numpy.repeat(arrays["start_times"], segment_lengths).tolist(),
+            numpy.repeat(arrays["end_times"], segment_lengths).tolist(), arrays["approximate_word_times"].tolist()))
+    else:
+        all_words = list(map(Word, word_strings, line_breaks))
+
+    segment_ends = numpy.cumsum(segment_lengths).tolist()
+    segment_starts = [0] + segment_ends[:-1]
+
+    if not timed:
+        return [Segment(word_list=all_words[segment_start:segment_end])
+                for segment_start, segment_end in zip(segment_starts, segment_ends)]
+
+    return [Subtitle(word_list=all_words[segment_start:segment_end], index=index, start_time=start_time,
+                     end_time=end_time)
+            for segment_start, segment_end, index, start_time, end_time in zip(
+                segment_starts, segment_ends, arrays["subtitle_indices"].tolist(), arrays["start_times"].tolist(),
+                arrays["end_times"].tolist())]
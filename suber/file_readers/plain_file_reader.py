@@ -5,8 +5,6 @@ from suber.constants import END_OF_LINE_SYMBOL, END_OF_BLOCK_SYMBOL
 
 class PlainFileReader(FileReaderBase):
     def _parse_lines(self, file_object):
-        segments = []
-
         is_first_line = True
         for line in file_object:
             if is_first_line:
@@ -15,17 +13,21 @@ class PlainFileReader(FileReaderBase):
                 is_first_line = False
             words = line.split()
 
-            word_list = []
+            word_strings = []
+            line_breaks = []
             for word in words:
                 if word in (END_OF_LINE_SYMBOL, END_OF_BLOCK_SYMBOL):
-                    if not word_list:
+                    if not word_strings:
                         continue  # ignore line break symbol at the start of the line
                     else:
-                        word_list[-1].line_break = (
+                        line_breaks[-1] = (
                             LineBreak.END_OF_BLOCK if word == END_OF_BLOCK_SYMBOL else LineBreak.END_OF_LINE)
                 else:
-                    word_list.append(Word(string=word))
+                    word_strings.append(word)
+                    line_breaks.append(LineBreak.NONE)
 
-            segments.append(Segment(word_list=word_list))
+            word_list = [
+                Word(string=word_string, line_break=line_break)
+                for word_string, line_break in zip(word_strings, line_breaks)]
 
-        return segments
+            yield Segment(word_list=word_list)
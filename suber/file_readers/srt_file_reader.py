@@ -1,9 +1,11 @@
+import io
+import os
 import re
-import datetime
+from typing import List, Tuple
 
 from suber.file_readers.file_reader_base import FileReaderBase
 from suber.data_types import LineBreak, TimedWord, Subtitle
-from suber.utilities import set_approximate_word_times
+from suber.utilities import get_approximate_word_times, paused_garbage_collection
 
 
 class SRTFormatError(Exception):
@@ -12,17 +14,118 @@ class SRTFormatError(Exception):
 
 class SRTFileReader(FileReaderBase):
     allowed_time_formats = {
-        "iso": r"\d+:\d+:\d+\.\d+",
-        "iso_with_comma": r"\d+:\d+:\d+,\d+",
-        "seconds": r"^\d+(\.\d+)?$",
+        "iso": re.compile(r"\d+:\d+:\d+\.\d+"),
+        "iso_with_comma": re.compile(r"\d+:\d+:\d+,\d+"),
+        "seconds": re.compile(r"^\d+(\.\d+)?$"),
     }
 
-    def _parse_lines(self, file_object):
+    # Accepts exactly what datetime.datetime.strptime() accepts for "%H:%M:%S.%f" and "%H:%M:%S,%f", such that we can
+    # convert time codes arithmetically, which is a lot faster.
+    _iso_time_code_regexes = {
+        "iso": re.compile(r"(2[0-3]|[0-1]\d|\d):([0-5]\d|\d):([0-5]\d|\d)\.([0-9]{1,6})"),
+        "iso_with_comma": re.compile(r"(2[0-3]|[0-1]\d|\d):([0-5]\d|\d):([0-5]\d|\d),([0-9]{1,6})"),
+    }
+
+    _formatting_tag_regex = re.compile("</?[^>]>")
+
+    # Words are created for this many subtitles at once, such that approximate word times can be computed efficiently.
+    _subtitle_batch_size = 1024
+
+    def read_in_parallel(self, num_workers: int) -> List[Subtitle]:
+        """
+        Same result as read(), but splits the file into chunks at empty lines and parses them in 'num_workers'
+        processes. Meant for very large files. Compressed files are read sequentially.
+        """
+        chunk_byte_ranges = self._find_chunk_byte_ranges(num_chunks=num_workers)
+        if len(chunk_byte_ranges) < 2:
+            return self.read()
+
+        import concurrent.futures
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor, \
+                    paused_garbage_collection():
+                chunk_file_names = [self._file_name] * len(chunk_byte_ranges)
+                is_last_chunk = [False] * (len(chunk_byte_ranges) - 1) + [True]
+                all_chunk_subtitles = list(
+                    executor.map(_parse_byte_range, chunk_file_names, chunk_byte_ranges, is_last_chunk))
+        except Exception:
+            # Either the file is invalid or we did split within a subtitle, which is possible because empty lines are
+            # allowed between subtitle index and time stamp. Parse sequentially to get the correct result or error.
+            return self.read()
+
         subtitles = []
+        for chunk_subtitles in all_chunk_subtitles:
+            if (subtitles and chunk_subtitles and not self._is_correctly_ordered(
+                    subtitles[-1].start_time, subtitles[-1].end_time, chunk_subtitles[0].start_time)):
+                return self.read()  # raises the ordering error exactly as sequential parsing would
+            subtitles += chunk_subtitles
+
+        return subtitles
+
+    def _find_chunk_byte_ranges(self, num_chunks: int) -> List[Tuple[int, int]]:
+        """
+        Returns (start, end) byte positions of chunks of roughly equal size. Chunks end directly after empty lines,
+        which - with the exception mentioned in read_in_parallel() - separate subtitles.
+        """
+        if self._file_name.endswith(".gz") or num_chunks < 2:
+            return []
+
+        file_size = os.path.getsize(self._file_name)
+        chunk_boundaries = [0]
+
+        with open(self._file_name, "rb") as file_object:
+            for chunk_index in range(1, num_chunks):
+                file_object.seek(max(chunk_boundaries[-1], chunk_index * file_size // num_chunks))
+                file_object.readline()  # skip to the start of the next line
+
+                for line in iter(file_object.readline, b""):
+                    if not line.strip():
+                        break
+
+                boundary = file_object.tell()
+                if boundary >= file_size:
+                    break
+                chunk_boundaries.append(boundary)
+
+        chunk_boundaries.append(file_size)
+
+        return list(zip(chunk_boundaries[:-1], chunk_boundaries[1:]))
+
+    @staticmethod
+    def _is_correctly_ordered(previous_start_time: float, previous_end_time: float, start_time: float) -> bool:
+        """
+        Subtitles must be ordered by start time. (Overlapping subtitles are only possible because of this check, for
+        non-overlapping subtitles ordering is implied.)
+        """
+        return previous_end_time <= start_time or start_time >= previous_start_time
+
+    def _parse_lines(self, file_object, is_end_of_file=True):
+        subtitle_fields_batch = []
+
+        try:
+            for subtitle_fields in self._parse_subtitle_fields(file_object, is_end_of_file):
+                subtitle_fields_batch.append(subtitle_fields)
+
+                if len(subtitle_fields_batch) == self._subtitle_batch_size:
+                    yield from self._create_subtitles(subtitle_fields_batch)
+                    subtitle_fields_batch = []
+        except Exception:
+            # Yield all subtitles before the error first, as it would happen without batching.
+            yield from self._create_subtitles(subtitle_fields_batch)
+            raise
+
+        yield from self._create_subtitles(subtitle_fields_batch)
+
+    def _parse_subtitle_fields(self, file_object, is_end_of_file: bool):
+        """
+        Yields (index, start time, end time, word strings, line breaks) for each subtitle.
+        """
+        previous_start_time, previous_end_time = None, None
 
         subtitle_index = None
         start_time, end_time = None, None
-        word_list = None
+        word_strings, line_breaks = None, None
 
         for line in file_object:
             line = line.strip()
@@ -42,14 +145,14 @@ class SRTFileReader(FileReaderBase):
                     if end_time < start_time:
                         raise SRTFormatError(f"End time {end_time} is before start time {start_time}.")
 
-                    if subtitles and subtitles[-1].end_time > start_time:
+                    if previous_start_time is not None and not self._is_correctly_ordered(
+                            previous_start_time, previous_end_time, start_time):
                         start_time_string = line.split()[0]
-                        if start_time < subtitles[-1].start_time:
-                            raise SRTFormatError("Subtitles must appear ordered according to their start time, "
-                                                 f"violated by subtitle at '{start_time_string}'.")
+                        raise SRTFormatError("Subtitles must appear ordered according to their start time, "
+                                             f"violated by subtitle at '{start_time_string}'.")
 
-                    assert word_list is None
-                    word_list = []  # start collecting words
+                    assert word_strings is None
+                    word_strings, line_breaks = [], []  # start collecting words
 
             elif line:
                 # We expect this line to contain subtitle text.
@@ -59,48 +162,63 @@ class SRTFileReader(FileReaderBase):
 
                 # We don't consider formatting tags <i>, <b>, etc. in the evaluation.
                 # TODO: maybe we want this regex to cover more cases
-                line = re.sub('</?[^>]>', '', line)
-
-                word_list.extend([
-                    TimedWord(
-                        string=word,
-                        subtitle_start_time=start_time,
-                        subtitle_end_time=end_time)
-                    for word in line.split()])
+                line = self._formatting_tag_regex.sub('', line)
 
-                if word_list:
-                    word_list[-1].line_break = LineBreak.END_OF_LINE
+                line_words = line.split()
+                if line_words:
+                    word_strings += line_words
+                    line_breaks += [LineBreak.NONE] * (len(line_words) - 1) + [LineBreak.END_OF_LINE]
 
             else:
                 # This is an empty line after lines of subtitle text which ends the current subtitle.
-                assert word_list is not None
+                assert word_strings is not None
                 assert start_time is not None
                 assert end_time is not None
 
-                if word_list:  # might be an empty subtitle
-                    word_list[-1].line_break = LineBreak.END_OF_BLOCK
-
-                    set_approximate_word_times(word_list, start_time, end_time)
-
-                subtitles.append(
-                    Subtitle(word_list=word_list, index=subtitle_index, start_time=start_time, end_time=end_time))
+                yield subtitle_index, start_time, end_time, word_strings, line_breaks
+                previous_start_time, previous_end_time = start_time, end_time
 
                 subtitle_index = None
                 start_time, end_time = None, None
-                word_list = None
+                word_strings, line_breaks = None, None
 
-        if word_list is not None:
+        if word_strings is not None:
             # handle last subtitle
             assert subtitle_index is not None
             assert start_time is not None and end_time is not None
 
-            if word_list:  # might be an empty subtitle
-                word_list[-1].line_break = LineBreak.END_OF_BLOCK
+            yield subtitle_index, start_time, end_time, word_strings, line_breaks
 
-                set_approximate_word_times(word_list, start_time, end_time)
+        elif subtitle_index is not None and not is_end_of_file:
+            raise SRTFormatError(f"Subtitle {subtitle_index} is incomplete.")
 
-            subtitles.append(
-                Subtitle(word_list=word_list, index=subtitle_index, start_time=start_time, end_time=end_time))
+    @staticmethod
+    def _create_subtitles(subtitle_fields_batch: List[tuple]) -> List[Subtitle]:
+        approximate_word_times = get_approximate_word_times(
+            [start_time for _, start_time, _, _, _ in subtitle_fields_batch],
+            [end_time for _, _, end_time, _, _ in subtitle_fields_batch],
+            [len(word_strings) for _, _, _, word_strings, _ in subtitle_fields_batch])
+
+        subtitles = []
+        word_position = 0
+
+        for subtitle_index, start_time, end_time, word_strings, line_breaks in subtitle_fields_batch:
+            if line_breaks:  # might be an empty subtitle
+                line_breaks[-1] = LineBreak.END_OF_BLOCK
+
+            word_list = [
+                TimedWord(
+                    string=word_string,
+                    line_break=line_break,
+                    subtitle_start_time=start_time,
+                    subtitle_end_time=end_time,
+                    approximate_word_time=approximate_word_time)
+                for word_string, line_break, approximate_word_time in zip(
+                    word_strings, line_breaks, approximate_word_times[word_position:word_position + len(word_strings)])]
+            word_position += len(word_strings)
+
+            subtitles.append(Subtitle(word_list=word_list, index=subtitle_index, start_time=start_time,
+                                      end_time=end_time))
 
         return subtitles
 
@@ -119,7 +237,7 @@ class SRTFileReader(FileReaderBase):
     def _seconds_from_time_code(cls, time_code):
         detected_time_format = None
         for time_format_name, time_format_regex in cls.allowed_time_formats.items():
-            if re.match(time_format_regex, time_code):
+            if time_format_regex.match(time_code):
                 detected_time_format = time_format_name
                 break
 
@@ -131,15 +249,32 @@ class SRTFileReader(FileReaderBase):
                 seconds = float(time_code)
             else:
                 assert detected_time_format in ["iso", "iso_with_comma"]
-                datetime_format_string = "%H:%M:%S,%f" if detected_time_format == "iso_with_comma" else "%H:%M:%S.%f"
-
-                datetime_object = datetime.datetime.strptime(time_code, datetime_format_string)
-                # Set year to 1 (default is 1900) to set this time in relation to datetime.datetime.min.
-                datetime_object = datetime_object.replace(year=1)
-
-                seconds = (datetime_object - datetime.datetime.min).total_seconds()
+                match = cls._iso_time_code_regexes[detected_time_format].fullmatch(time_code)
+                if not match:
+                    raise ValueError(f"Time code '{time_code}' is not a valid time of day.")
+
+                hours, minutes, whole_seconds, fraction = match.groups()
+                microseconds = int(fraction.ljust(6, "0"))
+                # Same arithmetic as datetime.timedelta.total_seconds() to get bit-identical results.
+                seconds = ((int(hours) * 3600 + int(minutes) * 60 + int(whole_seconds)) * 10**6 + microseconds) / 10**6
         except Exception as e:
             raise SRTFormatError(f"Could not convert '{time_code}' to seconds. "
                                  f"Tried to read it as format '{detected_time_format}'.") from e
 
         return seconds
+
+
+def _parse_byte_range(file_name: str, byte_range: Tuple[int, int], is_last_chunk: bool) -> List[Subtitle]:
+    """
+    Worker function for SRTFileReader.read_in_parallel(). Parses a chunk of an uncompressed SRT file.
+    """
+    start, end = byte_range
+    with open(file_name, "rb") as file_object:
+        file_object.seek(start)
+        chunk = file_object.read(end - start).decode("utf-8")
+
+    # Same newline handling as for the text mode file object used by FileReaderBase.
+    lines = io.StringIO(chunk, newline=None)
+
+    with paused_garbage_collection():
+        return list(SRTFileReader(file_name)._parse_lines(lines, is_end_of_file=is_last_chunk))
@@ -1,28 +1,47 @@
 import numpy
 import regex
 import string
+import time
 from itertools import zip_longest
 from typing import List, Optional, Tuple
 
 from suber import lib_levenshtein
-from suber.constants import EAST_ASIAN_LANGUAGE_CODES, SPACE_ESCAPE
+from suber.constants import EAST_ASIAN_LANGUAGE_CODES
 from suber.data_types import Segment
-from suber.tokenizers import reversibly_tokenize_segments, detokenize_segments
+from suber.progress import ProgressReporter
+from suber.tokenizers import regroup_tokens_into_words, tokenize_segment_words
+from suber.tracing import TracingHooks
 
 
 def levenshtein_align_hypothesis_to_reference(
-        hypothesis: List[Segment], reference: List[Segment], language: Optional[str] = None) -> List[Segment]:
+        hypothesis: List[Segment], reference: List[Segment], language: Optional[str] = None,
+        progress_reporter: Optional[ProgressReporter] = None,
+        tracing_hooks: Optional[TracingHooks] = None) -> List[Segment]:
     """
     Runs the Levenshtein algorithm to get the minimal set of edit operations to convert the full list of hypothesis
     words into the full list of reference words. The edit operations implicitly define an alignment between hypothesis
     and reference words. Using this alignment, the hypotheses are re-segmented to match the reference segmentation.
+    If 'progress_reporter' is set, it is updated while computing the Levenshtein distance matrix, the cost being the
+    number of matrix rows. If 'tracing_hooks' are set, they are notified of start and end of the alignment.
     """
+    if tracing_hooks is not None:
+        start_time = time.perf_counter()
+        tracing_hooks.alignment_started("levenshtein", len(hypothesis), len(reference))
+
+    all_hypothesis_words = [word for segment in hypothesis for word in segment.word_list]
 
     if language in EAST_ASIAN_LANGUAGE_CODES:
-        # Punctuation kept attached because we want to remove it below to normalize the tokens before alignment, but
-        # there we cannot change the number of tokens (and must not create empty tokens).
-        hypothesis = reversibly_tokenize_segments(hypothesis, language, keep_punctuation_attached=True)
-        reference = reversibly_tokenize_segments(reference, language, keep_punctuation_attached=True)
+        # Alignment is done on token level. Punctuation kept attached because we want to remove it below to normalize
+        # the tokens before alignment, but there we cannot change the number of tokens (and must not create empty
+        # tokens).
+        reference_tokens, _, reference_segment_lengths = tokenize_segment_words(
+            reference, language, keep_punctuation_attached=True)
+        hypothesis_tokens, hypothesis_word_indices, _ = tokenize_segment_words(
+            hypothesis, language, keep_punctuation_attached=True)
+    else:
+        reference_tokens = [word.string for segment in reference for word in segment.word_list]
+        reference_segment_lengths = [len(segment.word_list) for segment in reference]
+        hypothesis_tokens = [word.string for word in all_hypothesis_words]
 
     remove_punctuation_table = str.maketrans('', '', string.punctuation)
 
@@ -33,10 +52,6 @@ def levenshtein_align_hypothesis_to_reference(
         word = word.lower()
 
         if language in EAST_ASIAN_LANGUAGE_CODES:
-            # Space escape needed for detokenization, but we don't want it to influence the alignment.
-            if word.startswith(SPACE_ESCAPE):
-                word = word[1:]
-                assert word, "Word should not be only space escape character."
             word_without_punctuation = regex.sub(r"\p{P}", "", word)
         else:
             # Backwards compatibility: keep old behavior for other languages, even though removing non-ASCII punctuation
@@ -48,20 +63,25 @@ def levenshtein_align_hypothesis_to_reference(
 
         return word_without_punctuation
 
-    all_reference_word_strings = [normalize_word(word.string) for segment in reference for word in segment.word_list]
-    all_hypothesis_word_strings = [normalize_word(word.string) for segment in hypothesis for word in segment.word_list]
-
-    all_hypothesis_words = [word for segment in hypothesis for word in segment.word_list]
+    all_reference_word_strings = [normalize_word(token) for token in reference_tokens]
+    all_hypothesis_word_strings = [normalize_word(token) for token in hypothesis_tokens]
 
     reference_string, hypothesis_string = _map_words_to_characters(
         all_reference_word_strings, all_hypothesis_word_strings)
 
-    opcodes = lib_levenshtein.opcodes(reference_string, hypothesis_string)
+    progress_callback = None
+    if progress_reporter is not None:
+        def progress_callback(num_rows, total_num_rows):
+            progress_reporter.update(num_rows, total_cost=total_num_rows)
+
+    opcodes = lib_levenshtein.opcodes(reference_string, hypothesis_string, progress_callback)
+
+    if progress_reporter is not None:
+        progress_reporter.finish()
 
-    reference_segment_lengths = [len(segment.word_list) for segment in reference]
     reference_segment_boundary_indices = numpy.cumsum(reference_segment_lengths)
     current_segment_index = 0
-    aligned_hypothesis_word_lists = [[] for _ in reference]
+    aligned_hypothesis_positions = [[] for _ in reference]
 
     for opcode_tuple in opcodes:
         edit_operation = opcode_tuple[0]
@@ -100,13 +120,21 @@ def levenshtein_align_hypothesis_to_reference(
 
             # Add hypothesis word to current segment in case of 'equal', 'replace' or 'insert' operation.
             if hypothesis_position is not None:
-                word = all_hypothesis_words[hypothesis_position]
-                aligned_hypothesis_word_lists[current_segment_index].append(word)
-
-    aligned_hypothesis = [Segment(word_list=word_list) for word_list in aligned_hypothesis_word_lists]
+                aligned_hypothesis_positions[current_segment_index].append(hypothesis_position)
 
     if language in EAST_ASIAN_LANGUAGE_CODES:
-        aligned_hypothesis = detokenize_segments(aligned_hypothesis)
+        # Map tokens back to the original hypothesis words, only words split between segments are re-created.
+        aligned_hypothesis = [
+            Segment(word_list=regroup_tokens_into_words(
+                positions, hypothesis_tokens, hypothesis_word_indices, all_hypothesis_words))
+            for positions in aligned_hypothesis_positions]
+    else:
+        aligned_hypothesis = [
+            Segment(word_list=[all_hypothesis_words[position] for position in positions])
+            for positions in aligned_hypothesis_positions]
+
+    if tracing_hooks is not None:
+        tracing_hooks.alignment_finished("levenshtein", len(aligned_hypothesis), time.perf_counter() - start_time)
 
     return aligned_hypothesis
 
@@ -1,39 +1,105 @@
 import numpy
+import time
 from typing import List, Optional
 
 from suber.constants import EAST_ASIAN_LANGUAGE_CODES
 from suber.data_types import Segment, Subtitle
-from suber.tokenizers import reversibly_tokenize_segments, detokenize_segments
+from suber.tokenizers import regroup_tokens_into_words, tokenize_segment_words
+from suber.tracing import TracingHooks
+from suber.utilities import get_approximate_word_times
 
 
 def time_align_hypothesis_to_reference(
-        hypothesis: List[Segment], reference: List[Subtitle], language: Optional[str] = None) -> List[Subtitle]:
+        hypothesis: List[Segment], reference: List[Subtitle], language: Optional[str] = None,
+        tracing_hooks: Optional[TracingHooks] = None) -> List[Subtitle]:
     """
     Re-segments the hypothesis segments according to the reference subtitle timings. The output hypothesis subtitles
     will have the same time stamps as the reference, and each will contain the words whose approximate times falls into
     these intervals, i.e. reference_subtitle.start_time < word.approximate_word_time < reference_subtitle.end_time.
-    Hypothesis words that do not fall into any subtitle will be dropped.
+    Hypothesis words that do not fall into any subtitle will be dropped. If reference subtitles overlap in time (e.g.
+    two speakers), a word is assigned to the last subtitle starting before it if that one contains it. Otherwise, e.g.
+    for a word after the end of a short subtitle nested in a longer one, it is assigned to the earliest starting
+    subtitle containing it; in case of identical start times, to the one appearing first in the reference.
+    If 'tracing_hooks' are set, they are notified of start and end of the alignment.
     """
+    if tracing_hooks is not None:
+        start_time = time.perf_counter()
+        tracing_hooks.alignment_started("time", len(hypothesis), len(reference))
+
+    all_hypothesis_words = [word for segment in hypothesis for word in segment.word_list]
+    assert all(word.approximate_word_time is not None for word in all_hypothesis_words), (
+        "Should have been set by SRTFileReader. Is plain file used?")
 
     if language in EAST_ASIAN_LANGUAGE_CODES:
-        hypothesis = reversibly_tokenize_segments(hypothesis, language)
+        # Alignment is done on token level, token times are distributed evenly over the hypothesis subtitles the same
+        # way as approximate word times are.
+        hypothesis_tokens, hypothesis_word_indices, num_tokens_per_subtitle = tokenize_segment_words(
+            hypothesis, language)
+        word_times = numpy.array(get_approximate_word_times(
+            [subtitle.start_time for subtitle in hypothesis], [subtitle.end_time for subtitle in hypothesis],
+            num_tokens_per_subtitle), dtype=float)
+    else:
+        word_times = numpy.array([word.approximate_word_time for word in all_hypothesis_words], dtype=float)
+    reference_start_times = numpy.array([subtitle.start_time for subtitle in reference], dtype=float)
+    reference_end_times = numpy.array([subtitle.end_time for subtitle in reference], dtype=float)
+
+    reference_order = numpy.argsort(reference_start_times, kind="stable")
+    sorted_start_times = reference_start_times[reference_order]
+    sorted_end_times = reference_end_times[reference_order]
+
+    # For each word, the last reference subtitle starting before the word. The word is aligned to it if it does not
+    # end before the word.
+    sorted_reference_subtitle_indices = numpy.searchsorted(sorted_start_times, word_times) - 1
+    is_after_first_start = sorted_reference_subtitle_indices >= 0
+    sorted_reference_subtitle_indices[~is_after_first_start] = 0
+    is_aligned = is_after_first_start
+    if len(reference):
+        is_aligned &= word_times < sorted_end_times[sorted_reference_subtitle_indices]
+
+        # Remaining words may still fall into an earlier, longer subtitle. Interval index: in start time order, the
+        # running maximum of end times is non-decreasing. Thus, the first subtitle in this order whose end time lies
+        # after the word time can be found via binary search. It contains the word if and only if it also starts before
+        # the word time, and it is by construction the earliest starting of all subtitles containing the word.
+        unaligned_word_indices = numpy.flatnonzero(~is_aligned)
+        unaligned_word_times = word_times[unaligned_word_indices]
+        max_end_times = numpy.maximum.accumulate(sorted_end_times)
+        containing_indices = numpy.searchsorted(max_end_times, unaligned_word_times, side="right")
 
-    aligned_hypothesis_word_lists = [[] for _ in reference]
+        is_contained = containing_indices < len(reference)
+        containing_indices[~is_contained] = 0
+        is_contained &= sorted_start_times[containing_indices] < unaligned_word_times
 
-    reference_start_times = numpy.array([subtitle.start_time for subtitle in reference])
-    reference_end_times = numpy.array([subtitle.end_time for subtitle in reference])
+        sorted_reference_subtitle_indices[unaligned_word_indices[is_contained]] = containing_indices[is_contained]
+        is_aligned[unaligned_word_indices[is_contained]] = True
 
-    for segment in hypothesis:
-        for word in segment.word_list:
-            assert word.approximate_word_time is not None, "Should have been set by SRTFileReader. Is plain file used?"
-            reference_subtitle_index = numpy.searchsorted(reference_start_times, word.approximate_word_time) - 1
+        reference_subtitle_indices = reference_order[sorted_reference_subtitle_indices]
+    else:
+        reference_subtitle_indices = sorted_reference_subtitle_indices
 
-            if reference_subtitle_index < 0:
-                # Word is before first subtitle, drop it.
-                continue
+    aligned_word_indices = numpy.flatnonzero(is_aligned)
+    aligned_reference_subtitle_indices = reference_subtitle_indices[aligned_word_indices]
 
-            if word.approximate_word_time < reference_end_times[reference_subtitle_index]:
-                aligned_hypothesis_word_lists[reference_subtitle_index].append(word)
+    # Group words by reference subtitle. Stable sort keeps the original word order within each subtitle.
+    sort_order = numpy.argsort(aligned_reference_subtitle_indices, kind="stable")
+    aligned_word_indices = aligned_word_indices[sort_order].tolist()
+    num_words_per_subtitle = numpy.bincount(aligned_reference_subtitle_indices, minlength=len(reference))
+    subtitle_boundaries = numpy.cumsum(num_words_per_subtitle).tolist()
+
+    aligned_hypothesis_word_lists = []
+    word_list_start = 0
+    for word_list_end in subtitle_boundaries:
+        if language in EAST_ASIAN_LANGUAGE_CODES:
+            # Aligned indices refer to tokens. Map them back to the original hypothesis words, only words split between
+            # subtitles are re-created.
+            token_indices = aligned_word_indices[word_list_start:word_list_end]
+            word_list = regroup_tokens_into_words(
+                token_indices, hypothesis_tokens, hypothesis_word_indices, all_hypothesis_words)
+        else:
+            word_indices = aligned_word_indices[word_list_start:word_list_end]
+            word_list = [all_hypothesis_words[word_index] for word_index in word_indices]
+
+        aligned_hypothesis_word_lists.append(word_list)
+        word_list_start = word_list_end
 
     aligned_hypothesis = []
 
@@ -47,7 +113,7 @@ def time_align_hypothesis_to_reference(
 
         aligned_hypothesis.append(subtitle)
 
-    if language in EAST_ASIAN_LANGUAGE_CODES:
-        aligned_hypothesis = detokenize_segments(aligned_hypothesis)
+    if tracing_hooks is not None:
+        tracing_hooks.alignment_finished("time", len(aligned_hypothesis), time.perf_counter() - start_time)
 
     return aligned_hypothesis
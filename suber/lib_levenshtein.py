@@ -10,9 +10,21 @@
 # rapidfuzz implementation in v0.18.0. Upgrading python-Levenshtein would therefore result in slightly different scores
 # for the "AS-" metrics on our end. For now, we want perfect backwards compatibility and therefore integrate our own
 # version of the Levenshtein code here.
+# Note, that this only concerns the edit ops. The distance itself is unique, so for 'distance()' we use the (much
+# faster) C++ implementation of rapidfuzz if it is installed.
 
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:
+    _rapidfuzz_levenshtein = None
 
-def _matrix(s1, s2):
+_DISTANCE_BACKENDS = ("rapidfuzz", "python")
+
+# Number of matrix rows computed between two calls of the progress callback.
+_PROGRESS_CHUNK_SIZE = 1024
+
+
+def _matrix(s1, s2, progress_callback=None):
     if not s1:
         return (len(s2), [], [])
 
@@ -30,30 +42,51 @@ def _matrix(s1, s2):
 
     matrix_VP = []
     matrix_VN = []
-    for ch2 in s2:
-        # Step 1: Computing D0
-        PM_j = block_get(ch2, 0)
-        X = PM_j
-        D0 = (((X & VP) + VP) ^ VP) | X | VN
-        # Step 2: Computing HP and HN
-        HP = VN | ~(D0 | VP)
-        HN = D0 & VP
-        # Step 3: Computing the value D[m,j]
-        currDist += (HP & mask) != 0
-        currDist -= (HN & mask) != 0
-        # Step 4: Computing Vp and VN
-        HP = (HP << 1) | 1
-        HN = HN << 1
-        VP = HN | ~(D0 | HP)
-        VN = HP & D0
-
-        matrix_VP.append(VP)
-        matrix_VN.append(VN)
+
+    # Rows are processed in chunks to report progress in between, without adding overhead to the inner loop.
+    chunk_size = _PROGRESS_CHUNK_SIZE if progress_callback is not None else max(len(s2), 1)
+
+    for chunk_start in range(0, len(s2), chunk_size):
+        for ch2 in s2[chunk_start:chunk_start + chunk_size]:
+            # Step 1: Computing D0
+            PM_j = block_get(ch2, 0)
+            X = PM_j
+            D0 = (((X & VP) + VP) ^ VP) | X | VN
+            # Step 2: Computing HP and HN
+            HP = VN | ~(D0 | VP)
+            HN = D0 & VP
+            # Step 3: Computing the value D[m,j]
+            currDist += (HP & mask) != 0
+            currDist -= (HN & mask) != 0
+            # Step 4: Computing Vp and VN
+            HP = (HP << 1) | 1
+            HN = HN << 1
+            VP = HN | ~(D0 | HP)
+            VN = HP & D0
+
+            matrix_VP.append(VP)
+            matrix_VN.append(VN)
+
+        if progress_callback is not None:
+            progress_callback(len(matrix_VP), len(s2))
 
     return (currDist, matrix_VP, matrix_VN)
 
 
-def distance(s1, s2):
+def distance(s1, s2, backend=None):
+    """
+    Returns the Levenshtein distance between 's1' and 's2'. 'backend' can be set to "rapidfuzz" or "python" to force
+    a specific implementation, by default rapidfuzz is used if available.
+    """
+    if backend is not None and backend not in _DISTANCE_BACKENDS:
+        raise ValueError(f"Unknown Levenshtein backend '{backend}', choose from {', '.join(_DISTANCE_BACKENDS)}.")
+
+    if backend == "rapidfuzz" and _rapidfuzz_levenshtein is None:
+        raise ImportError("Levenshtein backend 'rapidfuzz' requested, but rapidfuzz is not installed.")
+
+    if backend != "python" and _rapidfuzz_levenshtein is not None:
+        return _rapidfuzz_levenshtein.distance(s1, s2)
+
     prefix_len, suffix_len = common_affix(s1, s2)
     s1 = s1[prefix_len : len(s1) - suffix_len]
     s2 = s2[prefix_len : len(s2) - suffix_len]
@@ -61,7 +94,7 @@ def distance(s1, s2):
     return dist
 
 
-def editops(s1, s2):
+def editops(s1, s2, progress_callback=None):
     """
     Creates editops from the output of the bit-parallel rapidfuzz implementation above (edit distance matrix expressed
     as delta vectors), but makes the exact choices in case of ties as the original python-Levenshtein code:
@@ -72,11 +105,13 @@ def editops(s1, s2):
     To prefer "replace" (among other differences) we need to re-calculate the actual elements of the distance matrix
     from the delta vectors, which kind of defeats the purpose as it makes the algorithm less efficient. But here we care
     more about backwards compatibility than efficiency.
+    If given, 'progress_callback' is called with the number of completed and the total number of matrix rows while
+    computing the matrix, which takes most of the time for long inputs.
     """
     prefix_len, suffix_len = common_affix(s1, s2)
     s1 = s1[prefix_len : len(s1) - suffix_len]
     s2 = s2[prefix_len : len(s2) - suffix_len]
-    dist, VP, VN = _matrix(s1, s2)
+    dist, VP, VN = _matrix(s1, s2, progress_callback)
 
     if dist == 0:
         return []
@@ -163,8 +198,8 @@ def editops(s1, s2):
     return editop_list
 
 
-def opcodes(s1, s2):
-    editops_ = editops(s1, s2)
+def opcodes(s1, s2, progress_callback=None):
+    editops_ = editops(s1, s2, progress_callback)
 
     src_len = len(s1)
     dest_len = len(s2)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 import regex
 
@@ -8,6 +8,16 @@ from suber.utilities import segment_to_string
 
 
 def calculate_character_error_rate(hypothesis: List[Segment], reference: List[Segment], metric="CER") -> float:
+    num_edits, num_reference_characters = calculate_character_edit_statistics(hypothesis, reference, metric=metric)
+
+    return get_character_error_rate(num_edits, num_reference_characters)
+
+
+def calculate_character_edit_statistics(hypothesis: List[Segment], reference: List[Segment],
+                                        metric="CER") -> Tuple[int, int]:
+    """
+    Returns the number of character edits and the number of reference characters.
+    """
     assert len(hypothesis) == len(reference), (
         "Number of hypothesis segments does not match reference, alignment step missing?")
 
@@ -29,6 +39,10 @@ def calculate_character_error_rate(hypothesis: List[Segment], reference: List[Se
         num_edits += lib_levenshtein.distance(hypothesis_string, reference_string)
         num_reference_characters += len(reference_string)
 
+    return num_edits, num_reference_characters
+
+
+def get_character_error_rate(num_edits: int, num_reference_characters: int) -> float:
     if num_reference_characters:
         cer_score = num_edits / num_reference_characters
     else:
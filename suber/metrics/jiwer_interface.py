@@ -1,20 +1,48 @@
 import jiwer
 import functools
-from typing import List
+from typing import List, Optional
 
 from suber.data_types import Segment
 from suber.constants import EAST_ASIAN_LANGUAGE_CODES
+from suber.metrics.lib_wer import TokenVocabulary, WordErrorCounts, count_word_errors
+from suber.metrics.metric_input_cache import MetricInputCache
 from suber.tokenizers import get_sacrebleu_tokenizer
-from suber.utilities import segment_to_string, get_segment_to_string_opts_from_metric
+from suber.utilities import get_segment_to_string_opts_from_metric
 
 
 def calculate_word_error_rate(hypothesis: List[Segment], reference: List[Segment], metric="WER",
-                              score_break_at_segment_end=True, language: str = None) -> float:
+                              score_break_at_segment_end=True, language: str = None,
+                              cache: Optional[MetricInputCache] = None, num_workers: int = 1) -> float:
+    """
+    If several metrics are computed for the same segments, passing the same 'cache' avoids repeatedly converting the
+    segments to strings and transforming the references.
+    """
+    word_error_counts = calculate_word_error_counts(
+        hypothesis, reference, metric=metric, score_break_at_segment_end=score_break_at_segment_end,
+        language=language, cache=cache, num_workers=num_workers)
+
+    return get_word_error_rate(word_error_counts)
+
+
+def get_word_error_rate(word_error_counts: WordErrorCounts) -> float:
+    return round(word_error_counts.word_error_rate() * 100, 3)
+
+
+def calculate_word_error_counts(hypothesis: List[Segment], reference: List[Segment], metric="WER",
+                                score_break_at_segment_end=True, language: str = None,
+                                cache: Optional[MetricInputCache] = None, num_workers: int = 1) -> WordErrorCounts:
+    """
+    Returns the number of hits, substitutions, deletions and insertions underlying the word error rate. Text
+    normalization uses jiwer transformations, the edit operations are counted using 'lib_wer', see count_word_errors()
+    for 'num_workers'.
+    """
 
     assert len(hypothesis) == len(reference), (
         "Number of hypothesis segments does not match reference, alignment step missing?")
 
-    if metric == "WER-cased":
+    is_cased = metric == "WER-cased"
+
+    if is_cased:
         transformations = jiwer.Compose([
             # Note: the original release used no tokenization here. We find this change to have a minor positive effect
             # on correlation with post-edit effort (-0.657 vs. -0.650 in Table 1, row 2, "Combined" in our paper.)
@@ -41,20 +69,24 @@ def calculate_word_error_rate(hypothesis: List[Segment], reference: List[Segment
     include_breaks, mask_words, metric = get_segment_to_string_opts_from_metric(metric)
     assert metric == "WER"
 
-    segment_to_string_ = functools.partial(
-        segment_to_string, include_line_breaks=include_breaks, mask_all_words=mask_words,
+    if cache is None:
+        cache = MetricInputCache()
+
+    get_segment_strings = functools.partial(
+        cache.get_segment_strings, include_line_breaks=include_breaks, mask_all_words=mask_words,
         include_last_break=score_break_at_segment_end)
 
-    hypothesis_strings = [segment_to_string_(segment) for segment in hypothesis]
-    reference_strings = [segment_to_string_(segment) for segment in reference]
+    # Token ids of hypothesis and reference have to come from the same vocabulary. We store it alongside the
+    # references, which are usually shared by all metrics.
+    vocabulary = cache.get_or_compute(("wer_vocabulary",), reference, TokenVocabulary)
+
+    reference_sequences = cache.get_or_compute(
+        ("wer_reference", is_cased, language, include_breaks, mask_words, score_break_at_segment_end), reference,
+        lambda: vocabulary.encode_all(transformations(get_segment_strings(reference))))
 
-    wer_score = jiwer.wer(
-        reference_strings,
-        hypothesis_strings,
-        reference_transform=transformations,
-        hypothesis_transform=transformations)
+    hypothesis_sequences = vocabulary.encode_all(transformations(get_segment_strings(hypothesis)))
 
-    return round(wer_score * 100, 3)
+    return count_word_errors(reference_sequences, hypothesis_sequences, num_workers=num_workers)
 
 
 class Tokenize(jiwer.AbstractTransform):
@@ -1,10 +1,20 @@
-from typing import List
+from typing import List, Tuple
 
 from suber.data_types import Segment
 from suber.tokenizers import get_sacrebleu_tokenizer
 
 
 def calculate_length_ratio(hypothesis: List[Segment], reference: List[Segment], language: str = None) -> float:
+    num_tokens_hypothesis, num_tokens_reference = calculate_length_statistics(hypothesis, reference, language=language)
+
+    return get_length_ratio(num_tokens_hypothesis, num_tokens_reference)
+
+
+def calculate_length_statistics(hypothesis: List[Segment], reference: List[Segment],
+                                language: str = None) -> Tuple[int, int]:
+    """
+    Returns the number of hypothesis and reference tokens.
+    """
     all_hypothesis_words = [word.string for segment in hypothesis for word in segment.word_list]
     all_reference_words = [word.string for segment in reference for word in segment.word_list]
 
@@ -18,6 +28,10 @@ def calculate_length_ratio(hypothesis: List[Segment], reference: List[Segment],
     num_tokens_hypothesis = len(tokenizer(full_hypothesis_string).split())
     num_tokens_reference = len(tokenizer(full_reference_string).split())
 
+    return num_tokens_hypothesis, num_tokens_reference
+
+
+def get_length_ratio(num_tokens_hypothesis: int, num_tokens_reference: int) -> float:
     length_ratio = num_tokens_hypothesis / num_tokens_reference if num_tokens_reference else 0.0
 
     return round(length_ratio * 100, 3)
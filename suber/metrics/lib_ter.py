@@ -19,11 +19,13 @@
 
 
 import math
-from typing import List, Tuple, Dict
+import operator
+from typing import Callable, List, Optional, Tuple, Dict
 
 from suber.data_types import TimedWord
 from suber.constants import END_OF_LINE_SYMBOL, END_OF_BLOCK_SYMBOL
 from suber.metrics.suber_statistics import SubERStatisticsCollector
+from suber.tracing import TracingHooks
 
 
 _COST_INS = 1
@@ -34,6 +36,7 @@ _COST_SUB = 1
 _MAX_SHIFT_SIZE = 10
 _MAX_SHIFT_DIST = 50
 _BEAM_WIDTH = 100
+SACREBLEU_BEAM_WIDTH = 25  # used by sacrebleu, gives different results for segments that are long or differ in length
 
 # Our own limits
 _MAX_CACHE_SIZE = 10000
@@ -50,11 +53,24 @@ _FLIP_OPS = str.maketrans(_OP_INS + _OP_DEL, _OP_DEL + _OP_INS)
 
 
 def translation_edit_rate(words_hyp: List[TimedWord], words_ref: List[TimedWord],
-                          statistics_collector: SubERStatisticsCollector = None) -> Tuple[int, int]:
+                          statistics_collector: SubERStatisticsCollector = None, apply_suber_constraints: bool = True,
+                          beam_width: int = _BEAM_WIDTH,
+                          progress_callback: Optional[Callable[[int], None]] = None,
+                          tracing_hooks: Optional[TracingHooks] = None) -> Tuple[int, int]:
     """Calculate the translation edit rate.
 
     :param words_hyp: Tokenized translation hypothesis.
     :param words_ref: Tokenized reference translation.
+    :param statistics_collector: Optional collector of SubER edit operation statistics.
+    :param apply_suber_constraints: If False, words are compared by equality
+        only, without time and break token constraints. This is plain TER and
+        allows to pass strings instead of TimedWords.
+    :param beam_width: Beam width of the edit distance computation, set to
+        `SACREBLEU_BEAM_WIDTH` to get exactly the results of sacrebleu.
+    :param progress_callback: Optional function called with the number of
+        shifts done so far after each shift iteration.
+    :param tracing_hooks: Optional hooks notified of each shift iteration and
+        edit distance computation, see `suber.tracing`.
     :return: tuple (number of edits, length)
     """
     n_words_ref = len(words_ref)
@@ -68,7 +84,9 @@ def translation_edit_rate(words_hyp: List[TimedWord], words_ref: List[TimedWord]
         # special treatment of empty refs
         return n_words_hyp, 0
 
-    cached_ed = BeamEditDistance(words_ref)
+    is_word_match = _is_word_match if apply_suber_constraints else operator.eq
+    cached_ed = BeamEditDistance(words_ref, apply_suber_constraints=apply_suber_constraints, beam_width=beam_width,
+                                 tracing_hooks=tracing_hooks)
     shifts = 0
 
     input_words = words_hyp
@@ -76,7 +94,7 @@ def translation_edit_rate(words_hyp: List[TimedWord], words_ref: List[TimedWord]
     while True:
         # do shifts until they stop reducing the edit distance
         delta, new_input_words, checked_candidates = _shift(
-            input_words, words_ref, cached_ed, checked_candidates)
+            input_words, words_ref, cached_ed, checked_candidates, is_word_match)
 
         if checked_candidates >= _MAX_SHIFT_CANDIDATES:
             break
@@ -86,6 +104,11 @@ def translation_edit_rate(words_hyp: List[TimedWord], words_ref: List[TimedWord]
         shifts += 1
         input_words = new_input_words
 
+        if progress_callback is not None:
+            progress_callback(shifts)
+        if tracing_hooks is not None:
+            tracing_hooks.shift_iteration(shifts, checked_candidates)
+
     edit_distance, trace = cached_ed(input_words)
     total_edits = shifts + edit_distance
 
@@ -102,6 +125,15 @@ def translation_edit_rate(words_hyp: List[TimedWord], words_ref: List[TimedWord]
     return total_edits, n_words_ref
 
 
+def estimate_edit_distance_cost(n_words_hyp: int, n_words_ref: int, beam_width: int = _BEAM_WIDTH) -> int:
+    """Estimate the cost of one edit distance computation.
+
+    :return: Number of matrix cells computed by `BeamEditDistance` without
+        caching, which is limited by the beam.
+    """
+    return n_words_hyp * min(n_words_ref + 1, 2 * beam_width)
+
+
 def _is_allowed_word_alignment(word1: TimedWord, word2: TimedWord) -> bool:
     """
     Returns whether SubER definition allows to align the two words. This is the case when they are part of subtitles
@@ -115,6 +147,10 @@ def _is_allowed_word_alignment(word1: TimedWord, word2: TimedWord) -> bool:
             == (word2.subtitle_start_time < word1.subtitle_end_time))
 
 
+def _is_any_word_alignment_allowed(word1, word2) -> bool:
+    return True
+
+
 def _is_word_match(word1: TimedWord, word2: TimedWord) -> bool:
     """
     Returns whether SubER counts the two words as a match, meaning no edit operation needed.
@@ -126,7 +162,7 @@ def _is_word_match(word1: TimedWord, word2: TimedWord) -> bool:
 
 
 def _shift(words_h: List[TimedWord], words_r: List[TimedWord], cached_ed,
-           checked_candidates: int) -> Tuple[int, List[TimedWord], int]:
+           checked_candidates: int, is_word_match=_is_word_match) -> Tuple[int, List[TimedWord], int]:
     """Attempt to shift words in hypothesis to match reference.
 
     Returns the shift that reduces the edit distance the most.
@@ -141,6 +177,7 @@ def _shift(words_h: List[TimedWord], words_r: List[TimedWord], cached_ed,
     :param cached_ed: Cached edit distance.
     :param checked_candidates: Number of shift candidates that were already
                                evaluated.
+    :param is_word_match: Function deciding whether two words match.
     :return: (score, shifted_words, checked_candidates). Best shift and updated
              number of evaluated shift candidates.
     """
@@ -153,7 +190,7 @@ def _shift(words_h: List[TimedWord], words_r: List[TimedWord], cached_ed,
 
     best = None
 
-    for start_h, start_r, length in _find_shifted_pairs(words_h, words_r):
+    for start_h, start_r, length in _find_shifted_pairs(words_h, words_r, is_word_match):
         # don't do the shift unless both the hypothesis was wrong and the
         # reference doesn't match hypothesis at the target position
         if sum(hyp_err[start_h: start_h + length]) == 0:
@@ -233,13 +270,14 @@ def _perform_shift(words: List[TimedWord], start: int, length: int, target: int)
             + words[start: start + length] + words[length + target:]
 
 
-def _find_shifted_pairs(words_h: List[TimedWord], words_r: List[TimedWord]):
+def _find_shifted_pairs(words_h: List[TimedWord], words_r: List[TimedWord], is_word_match=_is_word_match):
     """Find matching word sub-sequences in two lists of words.
 
     Ignores sub-sequences starting at the same position.
 
     :param words_h: First word list.
     :param words_r: Second word list.
+    :param is_word_match: Function deciding whether two words match.
     :return: Yields tuples of (h_start, r_start, length) such that:
          words_h[h_start:h_start+length] = words_r[r_start:r_start+length]
     """
@@ -253,7 +291,7 @@ def _find_shifted_pairs(words_h: List[TimedWord], words_r: List[TimedWord]):
                 continue
 
             length = 0
-            while _is_word_match(words_h[start_h + length], words_r[start_r + length]) and length < _MAX_SHIFT_SIZE:
+            while is_word_match(words_h[start_h + length], words_r[start_r + length]) and length < _MAX_SHIFT_SIZE:
                 length += 1
 
                 yield start_h, start_r, length
@@ -337,11 +375,18 @@ class BeamEditDistance:
     Tracking allows to reconstruct the optimal sequence of edit operations.
 
     :param words_ref: A list of reference tokens.
+    :param apply_suber_constraints: See `translation_edit_rate()`.
+    :param beam_width: See `translation_edit_rate()`.
+    :param tracing_hooks: See `translation_edit_rate()`.
     """
-    def __init__(self, words_ref: List[TimedWord]):
+    def __init__(self, words_ref: List[TimedWord], apply_suber_constraints: bool = True,
+                 beam_width: int = _BEAM_WIDTH, tracing_hooks: Optional[TracingHooks] = None):
         """`BeamEditDistance` initializer."""
         self._words_ref = words_ref
         self._n_words_ref = len(self._words_ref)
+        self._apply_suber_constraints = apply_suber_constraints
+        self._beam_width = beam_width
+        self._tracing_hooks = tracing_hooks
 
         # first row corresponds to insertion operations of the reference,
         # so we do 1 edit operation per reference word
@@ -375,6 +420,10 @@ class BeamEditDistance:
         # update our cache with the newly calculated rows
         self._add_cache(words_hyp, newly_created_matrix)
 
+        if self._tracing_hooks is not None:
+            self._tracing_hooks.dp_pass(
+                self._count_computed_cells(len(words_hyp), start_position), start_position, len(words_hyp))
+
         return edit_distance, trace
 
     def _edit_distance(self, words_h: List[TimedWord], start_h: int,
@@ -403,16 +452,17 @@ class BeamEditDistance:
 
         assert len(dist) == n_words_h + 1
 
-        length_ratio = self._n_words_ref / n_words_h if words_h else 1
+        length_ratio, beam_width = self._get_beam(n_words_h)
 
-        # in some crazy sentences, the difference in length is so large that
-        # we may end up with zero overlap with previous row
-        if _BEAM_WIDTH < length_ratio / 2:
-            beam_width = math.ceil(length_ratio / 2 + _BEAM_WIDTH)
+        if self._apply_suber_constraints:
+            is_word_match = _is_word_match
+            is_allowed_word_alignment = _is_allowed_word_alignment
         else:
-            beam_width = _BEAM_WIDTH
+            is_word_match = operator.eq
+            is_allowed_word_alignment = _is_any_word_alignment_allowed
 
         # calculate the Levenshtein distance
+        words_ref = self._words_ref
         for i in range(start_h + 1, n_words_h + 1):
             pseudo_diag = math.floor(i * length_ratio)
             min_j = max(0, pseudo_diag - beam_width)
@@ -421,15 +471,19 @@ class BeamEditDistance:
             if i == n_words_h:
                 max_j = self._n_words_ref + 1
 
+            word_h = words_h[i - 1]
+            previous_row = dist[i - 1]
+            row = dist[i]
+
             for j in range(min_j, max_j):
                 if j == 0:
-                    dist[i][j] = (dist[i - 1][j][0] + _COST_DEL, _OP_DEL)
+                    row[j] = (previous_row[j][0] + _COST_DEL, _OP_DEL)
                 else:
-                    if _is_word_match(words_h[i - 1], self._words_ref[j - 1]):
+                    if is_word_match(word_h, words_ref[j - 1]):
                         cost_sub = 0
                         op_sub = _OP_NOP
                     else:
-                        if _is_allowed_word_alignment(words_h[i - 1], self._words_ref[j - 1]):
+                        if is_allowed_word_alignment(word_h, words_ref[j - 1]):
                             cost_sub = _COST_SUB
                         else:
                             # No substitution allowed if words are not time-aligned.
@@ -440,15 +494,23 @@ class BeamEditDistance:
                     # But since we flip the trace and compute the alignment from
                     # the inverse, we need to swap order of insertion and
                     # deletion in the preference.
-                    ops = (
-                        (dist[i - 1][j - 1][0] + cost_sub, op_sub),
-                        (dist[i - 1][j][0] + _COST_DEL, _OP_DEL),
-                        (dist[i][j - 1][0] + _COST_INS, _OP_INS),
-                    )
+                    # Written out instead of looping over the operations, this
+                    # is the innermost loop.
+                    best_cost, best_op = row[j]
+
+                    op_cost = previous_row[j - 1][0] + cost_sub
+                    if best_cost > op_cost:
+                        best_cost, best_op = op_cost, op_sub
+
+                    op_cost = previous_row[j][0] + _COST_DEL
+                    if best_cost > op_cost:
+                        best_cost, best_op = op_cost, _OP_DEL
+
+                    op_cost = row[j - 1][0] + _COST_INS
+                    if best_cost > op_cost:
+                        best_cost, best_op = op_cost, _OP_INS
 
-                    for op_cost, op_name in ops:
-                        if dist[i][j][0] > op_cost:
-                            dist[i][j] = op_cost, op_name
+                    row[j] = best_cost, best_op
 
         # get the trace
         trace = ""
@@ -504,6 +566,47 @@ class BeamEditDistance:
             value = node[word]
             node = value[0]
 
+    def _get_beam(self, n_words_h: int) -> Tuple[float, int]:
+        """Get the beam of the edit distance matrix.
+
+        :param n_words_h: Number of words in the hypothesis.
+        :return: Tuple (slope of the pseudo-diagonal, beam width).
+        """
+        length_ratio = self._n_words_ref / n_words_h if n_words_h else 1
+
+        # in some crazy sentences, the difference in length is so large that
+        # we may end up with zero overlap with previous row
+        if self._beam_width < length_ratio / 2:
+            beam_width = math.ceil(length_ratio / 2 + self._beam_width)
+        else:
+            beam_width = self._beam_width
+
+        return length_ratio, beam_width
+
+    def _count_computed_cells(self, n_words_h: int, start_h: int) -> int:
+        """Count the matrix cells computed by `_edit_distance()`.
+
+        Only used for tracing, repeats the beam limits of the computation.
+
+        :param n_words_h: Number of words in the hypothesis.
+        :param start_h: Position from which the calculation started.
+        :return: Number of cells within the beam in the computed rows.
+        """
+        length_ratio, beam_width = self._get_beam(n_words_h)
+
+        num_cells = 0
+        for i in range(start_h + 1, n_words_h + 1):
+            pseudo_diag = math.floor(i * length_ratio)
+            min_j = max(0, pseudo_diag - beam_width)
+            max_j = min(self._n_words_ref + 1, pseudo_diag + beam_width)
+
+            if i == n_words_h:
+                max_j = self._n_words_ref + 1
+
+            num_cells += max(0, max_j - min_j)
+
+        return num_cells
+
     def _find_cache(self, words_hyp: List[TimedWord]) -> Tuple[int, List[List]]:
         """Find the already computed rows of the edit distance matrix in cache.
 
@@ -0,0 +1,119 @@
+"""
+Word error rate computation on integer token sequences. Gives the same scores as jiwer.wer(), but token strings are
+interned only once per run and the per-segment edit operations are counted directly, without creating alignment objects.
+"""
+
+import collections
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:
+    _rapidfuzz_levenshtein = None
+
+
+@dataclass
+class WordErrorCounts:
+    hits: int = 0
+    substitutions: int = 0
+    deletions: int = 0
+    insertions: int = 0
+
+    def __add__(self, other: "WordErrorCounts") -> "WordErrorCounts":
+        return WordErrorCounts(
+            hits=self.hits + other.hits,
+            substitutions=self.substitutions + other.substitutions,
+            deletions=self.deletions + other.deletions,
+            insertions=self.insertions + other.insertions)
+
+    @property
+    def num_reference_words(self) -> int:
+        return self.hits + self.substitutions + self.deletions
+
+    @property
+    def num_errors(self) -> int:
+        return self.substitutions + self.deletions + self.insertions
+
+    def word_error_rate(self) -> float:
+        """
+        Returns the WER as a fraction, not in percent. Same as jiwer, the number of insertions is returned for an empty
+        reference.
+        """
+        if not self.num_reference_words:
+            return self.insertions
+
+        return float(self.num_errors) / float(self.num_reference_words)
+
+
+class TokenVocabulary:
+    """
+    Maps token strings to integer ids. Sequences to be compared must be encoded with the same vocabulary.
+    """
+
+    def __init__(self):
+        self._token_ids: Dict[str, int] = {}
+
+    def encode(self, tokens: Iterable[str]) -> List[int]:
+        token_ids = self._token_ids
+        return [token_ids.setdefault(token, len(token_ids)) for token in tokens]
+
+    def encode_all(self, token_lists: Iterable[Iterable[str]]) -> List[List[int]]:
+        return [self.encode(tokens) for tokens in token_lists]
+
+
+def count_word_errors(reference_sequences: Sequence[List[int]], hypothesis_sequences: Sequence[List[int]],
+                      num_workers: int = 1) -> WordErrorCounts:
+    """
+    Sums up the edit operations needed to convert each hypothesis sequence into the corresponding reference sequence.
+    If 'num_workers' > 1, the sequence pairs are split into chunks which are processed in parallel worker processes.
+    """
+    assert len(reference_sequences) == len(hypothesis_sequences), "Number of sequences does not match."
+
+    if num_workers <= 1 or len(reference_sequences) < 2:
+        return _count_word_errors(reference_sequences, hypothesis_sequences)
+
+    import concurrent.futures
+
+    chunk_size = -(-len(reference_sequences) // num_workers)  # ceil
+    chunk_starts = range(0, len(reference_sequences), chunk_size)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        chunk_counts = executor.map(
+            _count_word_errors,
+            [reference_sequences[start:start + chunk_size] for start in chunk_starts],
+            [hypothesis_sequences[start:start + chunk_size] for start in chunk_starts])
+
+        return sum(chunk_counts, WordErrorCounts())
+
+
+def _count_word_errors(reference_sequences: Sequence[List[int]],
+                       hypothesis_sequences: Sequence[List[int]]) -> WordErrorCounts:
+    if _rapidfuzz_levenshtein is not None:
+        # Same implementation as used by jiwer, so also the split into substitutions, deletions and insertions, which
+        # is not unique in general, is the same.
+        def get_edit_operations(reference_sequence, hypothesis_sequence):
+            return _rapidfuzz_levenshtein.editops(reference_sequence, hypothesis_sequence).as_list()
+    else:
+        from suber import lib_levenshtein
+
+        get_edit_operations = lib_levenshtein.editops
+
+    num_reference_words = 0
+    operation_counts = collections.Counter()
+
+    for reference_sequence, hypothesis_sequence in zip(reference_sequences, hypothesis_sequences):
+        num_reference_words += len(reference_sequence)
+
+        if reference_sequence != hypothesis_sequence:
+            operation_counts.update(
+                operation for operation, _, _ in get_edit_operations(reference_sequence, hypothesis_sequence))
+
+    substitutions = operation_counts["replace"]
+    deletions = operation_counts["delete"]
+
+    return WordErrorCounts(
+        hits=num_reference_words - substitutions - deletions,
+        substitutions=substitutions,
+        deletions=deletions,
+        insertions=operation_counts["insert"])
@@ -0,0 +1,57 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from suber.data_types import Segment
+from suber.utilities import segment_to_string
+
+
+class MetricInputCache:
+    """
+    Stores intermediate results which several metrics computed on the same segments have in common, such that they are
+    computed only once per run. This is the segments rendered as strings, as well as e.g. the pre-processed references of
+    sacrebleu metrics. Segment lists are identified by object identity, they must not be modified while the cache is in
+    use.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple[Any, List[Segment]]] = {}
+
+    def get_segment_strings(self, segments: List[Segment], include_line_breaks=False, include_last_break=True,
+                            mask_all_words=False, escape_break_symbols=False) -> List[str]:
+        """
+        Returns segment_to_string() applied to all 'segments' with the given options. If 'escape_break_symbols' is set,
+        "<eol>" and "<eob>" are replaced by "eol" and "eob", such that tokenizers do not split them.
+        """
+        def render_segments():
+            strings = [
+                segment_to_string(segment, include_line_breaks=include_line_breaks,
+                                  include_last_break=include_last_break, mask_all_words=mask_all_words)
+                for segment in segments]
+
+            if escape_break_symbols:
+                strings = [string.replace("<eol>", "eol").replace("<eob>", "eob") for string in strings]
+
+            return strings
+
+        options = (include_line_breaks, include_last_break, mask_all_words, escape_break_symbols)
+
+        return self.get_or_compute(("segment_strings", options), segments, render_segments)
+
+    def get_or_compute(self, key: Tuple, segments: List[Segment], compute_function: Callable[[], Any]) -> Any:
+        """
+        Returns the cached result for 'key' and 'segments', calls 'compute_function' to create it if not available.
+        """
+        full_key = (id(segments),) + key
+
+        if full_key not in self._entries:
+            # Keep a reference to the segments, otherwise their id might be reused by another object.
+            self._entries[full_key] = (compute_function(), segments)
+
+        return self._entries[full_key][0]
+
+    def clear(self, keep_segments: Optional[List[Segment]] = None):
+        """
+        Removes all entries, except those computed from 'keep_segments', if given.
+        """
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if keep_segments is not None and entry[1] is keep_segments}
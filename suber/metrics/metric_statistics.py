@@ -0,0 +1,150 @@
+"""
+Sufficient statistics of the metrics, i.e. the numbers from which the corpus-level scores are computed, for example the
+number of edits and the reference length for SubER. Unlike scores, statistics can be summed up over different sets of
+files. This allows to score a large test set in shards, possibly on different machines, using 'suber --emit-stats', and
+to merge the shard results with 'suber-merge' into exactly the scores that scoring all files at once would give.
+"""
+
+import functools
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from suber.constants import EAST_ASIAN_LANGUAGE_CODES
+
+STATISTICS_FORMAT_VERSION = 1
+
+
+def check_metrics_are_mergeable(metrics: List[str], language: Optional[str] = None):
+    """
+    Raises a ValueError for metrics whose statistics do not add up over files.
+    """
+    for metric in metrics:
+        if metric.startswith("AS-"):
+            raise ValueError(
+                f"Statistics of metric '{metric}' cannot be merged: the Levenshtein alignment of all files at once may "
+                f"move words across file boundaries, which is not the case when aligning each shard separately.")
+
+        if metric == "length_ratio" and language in EAST_ASIAN_LANGUAGE_CODES and language != "zh":
+            raise ValueError(
+                f"Statistics of metric '{metric}' cannot be merged for language '{language}': the MeCab tokenization "
+                f"of the full text depends on the context across file boundaries.")
+
+
+def compute_score_from_statistics(metric: str, statistics: Dict[str, Any], language: Optional[str] = None) -> float:
+    """
+    Returns the score of 'metric' given its (possibly merged) statistics as returned by
+    'suber.__main__.MetricCalculator.calculate_statistics()'.
+    """
+    # Imports only here, same as for metric calculation, to not import unneeded dependencies.
+    if metric.startswith("AS-") or metric.startswith("t-"):
+        metric = metric.split("-", maxsplit=1)[1]
+
+    if metric == "length_ratio":
+        from suber.metrics.length_ratio import get_length_ratio
+
+        return get_length_ratio(statistics["num_hypothesis_tokens"], statistics["num_reference_tokens"])
+
+    elif metric.startswith("SubER"):
+        from suber.metrics.suber import get_SubER_score
+
+        return get_SubER_score(statistics["num_edits"], statistics["reference_length"])
+
+    elif metric.startswith("WER"):
+        from suber.metrics.lib_wer import WordErrorCounts
+        from suber.metrics.jiwer_interface import get_word_error_rate
+
+        word_error_counts = WordErrorCounts(
+            hits=statistics["hits"], substitutions=statistics["substitutions"], deletions=statistics["deletions"],
+            insertions=statistics["insertions"])
+
+        return get_word_error_rate(word_error_counts)
+
+    elif metric.startswith("CER"):
+        from suber.metrics.cer import get_character_error_rate
+
+        return get_character_error_rate(statistics["num_edits"], statistics["num_reference_characters"])
+
+    else:
+        from suber.metrics.sacrebleu_interface import get_sacrebleu_score
+
+        return get_sacrebleu_score(statistics["corpus_statistics"], metric=metric, language=language)
+
+
+def get_results_from_statistics(metric_statistics: Dict[str, Dict[str, Any]],
+                                language: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Creates the output of the 'suber' command, i.e. the scores of all metrics, followed by an '#info' field containing
+    SubER edit operation counts, if available.
+    """
+    results = OrderedDict()
+    additional_outputs = OrderedDict()
+
+    for metric, statistics in metric_statistics.items():
+        results[metric] = compute_score_from_statistics(metric, statistics, language=language)
+        if "edit_operations" in statistics:
+            additional_outputs[metric] = statistics["edit_operations"]
+
+    if additional_outputs:
+        results["#info"] = additional_outputs
+
+    return results
+
+
+def create_statistics_output(metric_statistics: Dict[str, Dict[str, Any]],
+                             language: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Creates the output of 'suber --emit-stats'.
+    """
+    return OrderedDict([
+        ("statistics_format_version", STATISTICS_FORMAT_VERSION),
+        ("language", language),
+        ("metrics", metric_statistics),
+    ])
+
+
+def merge_statistics_outputs(statistics_outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sums up the statistics in several outputs of create_statistics_output(), which must contain the same metrics and
+    language.
+    """
+    if not statistics_outputs:
+        raise ValueError("No statistics to merge.")
+
+    first_output = statistics_outputs[0]
+
+    for statistics_output in statistics_outputs:
+        if statistics_output.get("statistics_format_version") != STATISTICS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported statistics format version "
+                             f"'{statistics_output.get('statistics_format_version')}', expected "
+                             f"{STATISTICS_FORMAT_VERSION}.")
+        if statistics_output["language"] != first_output["language"]:
+            raise ValueError(f"Cannot merge statistics computed for different languages: "
+                             f"'{first_output['language']}' and '{statistics_output['language']}'.")
+        if list(statistics_output["metrics"]) != list(first_output["metrics"]):
+            raise ValueError(f"Cannot merge statistics of different metrics: "
+                             f"{' '.join(first_output['metrics'])} and {' '.join(statistics_output['metrics'])}.")
+
+    merged_metric_statistics = OrderedDict(
+        (metric, functools.reduce(_add_statistics, [output["metrics"][metric] for output in statistics_outputs]))
+        for metric in first_output["metrics"])
+
+    return create_statistics_output(merged_metric_statistics, language=first_output["language"])
+
+
+def _add_statistics(statistics1: Any, statistics2: Any) -> Any:
+    """
+    Adds numbers, lists of numbers element-wise and dictionaries key-wise. Empty lists, which sacrebleu metrics return
+    if there is no reference segment, are treated as zero.
+    """
+    if isinstance(statistics1, dict):
+        assert statistics1.keys() == statistics2.keys(), "Statistics have different fields."
+        return OrderedDict((key, _add_statistics(value, statistics2[key])) for key, value in statistics1.items())
+
+    if isinstance(statistics1, list):
+        if not statistics1 or not statistics2:
+            return statistics1 or statistics2
+
+        assert len(statistics1) == len(statistics2), "Statistics have different lengths."
+        return [value1 + value2 for value1, value2 in zip(statistics1, statistics2)]
+
+    return statistics1 + statistics2
@@ -1,62 +1,188 @@
 import functools
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
 from sacrebleu.metrics import BLEU, TER, CHRF
+from sacrebleu.metrics.base import Metric
+from sacrebleu.tokenizers.tokenizer_ter import TercomTokenizer
 
 from suber.data_types import Segment
 from suber.constants import EAST_ASIAN_LANGUAGE_CODES
-from suber.utilities import segment_to_string, get_segment_to_string_opts_from_metric
+from suber.metrics import lib_ter
+from suber.metrics.metric_input_cache import MetricInputCache
+from suber.utilities import get_segment_to_string_opts_from_metric
 
 
 def calculate_sacrebleu_metric(hypothesis: List[Segment], reference: List[Segment],
-                               metric="BLEU", score_break_at_segment_end=True, language: str = None) -> float:
+                               metric="BLEU", score_break_at_segment_end=True, language: str = None,
+                               cache: Optional[MetricInputCache] = None, ter_backend: str = "sacrebleu",
+                               num_workers: int = 1) -> float:
+    """
+    If several metrics are computed for the same segments, passing the same 'cache' avoids repeatedly converting the
+    segments to strings and pre-processing the references.
+    For TER, 'ter_backend' can be set to "internal" to use 'lib_ter' without the SubER constraints instead of sacrebleu's
+    implementation. It gives identical scores and computes the segments in 'num_workers' parallel processes.
+    """
+    statistics = calculate_sacrebleu_statistics(
+        hypothesis, reference, metric=metric, score_break_at_segment_end=score_break_at_segment_end,
+        language=language, cache=cache, ter_backend=ter_backend, num_workers=num_workers)
+
+    return get_sacrebleu_score(statistics, metric=metric, language=language)
+
+
+def calculate_sacrebleu_statistics(hypothesis: List[Segment], reference: List[Segment],
+                                   metric="BLEU", score_break_at_segment_end=True, language: str = None,
+                                   cache: Optional[MetricInputCache] = None, ter_backend: str = "sacrebleu",
+                                   num_workers: int = 1) -> List[float]:
+    """
+    Returns sacrebleu's corpus statistics for the metric, i.e. the segment-level statistics (n-gram matches, edits and
+    reference lengths etc.) summed up over all segments. They can also be summed up over different files. Use
+    get_sacrebleu_score() to compute the score. See calculate_sacrebleu_metric() for the arguments.
+    """
+    if ter_backend not in ("sacrebleu", "internal"):
+        raise ValueError(f"Unknown TER backend '{ter_backend}', choose from sacrebleu, internal.")
 
     assert len(hypothesis) == len(reference), (
         "Number of hypothesis segments does not match reference, alignment step missing?")
 
     include_breaks, mask_words, metric = get_segment_to_string_opts_from_metric(metric)
 
+    if cache is None:
+        cache = MetricInputCache()
+
+    get_segment_strings = functools.partial(
+        cache.get_segment_strings, include_line_breaks=include_breaks, mask_all_words=mask_words,
+        include_last_break=score_break_at_segment_end,
+        # BLEU tokenizer would split "<eol>" into "< eol >".
+        escape_break_symbols=include_breaks)
+
+    hypothesis_strings = get_segment_strings(hypothesis)
+
+    # Sacrebleu currently does not allow empty references, just skip empty reference segments as a workaround.
+    if not all(segment.word_list for segment in reference):
+        hypothesis_strings = [
+            string for string, reference_segment in zip(hypothesis_strings, reference) if reference_segment.word_list]
+
+    def get_non_empty_reference_strings():
+        return [string for string, segment in zip(get_segment_strings(reference), reference) if segment.word_list]
+
+    cache_key = (metric, language, include_breaks, mask_words, score_break_at_segment_end)
+
+    if metric == "TER" and ter_backend == "internal":
+        tokenizer = _create_ter_tokenizer(language, mask_words)
+
+        reference_word_lists = cache.get_or_compute(
+            ("ter_reference_words",) + cache_key, reference,
+            lambda: [tokenizer(string.rstrip()).split() for string in get_non_empty_reference_strings()])
+        hypothesis_word_lists = [tokenizer(string.rstrip()).split() for string in hypothesis_strings]
+
+        return _calculate_translation_edit_rate_statistics(hypothesis_word_lists, reference_word_lists, num_workers)
+
+    def create_sacrebleu_metric():
+        reference_strings = get_non_empty_reference_strings()
+
+        # sacrebleu expects nested list
+        return _create_sacrebleu_metric(metric, language, mask_words, references=[reference_strings])
+
+    # Pre-processed references are stored within the metric object and will be reused by later calls.
+    sacrebleu_metric = cache.get_or_compute(("sacrebleu_metric",) + cache_key, reference, create_sacrebleu_metric)
+
+    # Same as done in sacrebleu's corpus_score().
+    segment_statistics = sacrebleu_metric._extract_corpus_statistics(hypothesis_strings, references=None)
+
+    return _sum_statistics(segment_statistics)
+
+
+def get_sacrebleu_score(statistics: List[float], metric="BLEU", language: str = None) -> float:
+    """
+    Computes the corpus-level score from the output of calculate_sacrebleu_statistics().
+    """
+    _, mask_words, metric = get_segment_to_string_opts_from_metric(metric)
+
+    sacrebleu_metric = _create_sacrebleu_metric(metric, language, mask_words, references=None)
+    sacrebleu_score = sacrebleu_metric._compute_score_from_stats(statistics)
+
+    return round(sacrebleu_score.score, 3)
+
+
+def _sum_statistics(segment_statistics: Sequence[List[float]]) -> List[float]:
+    return [sum(values) for values in zip(*segment_statistics)]
+
+
+def _create_sacrebleu_metric(metric: str, language: Optional[str], mask_words: bool,
+                             references: Optional[List[List[str]]]) -> Metric:
     if metric == "BLEU":
-        sacrebleu_metric = BLEU(trg_lang=language or "")
+        return BLEU(trg_lang=language or "", references=references)
     elif metric == "TER":
-        # Setting 'asian_support' only has an effect if 'normalized' is set as well.
-        # TODO: using TER with default options was probably a bad idea in the first place, 'normalized' should always be
-        # set (unless input would already be tokenized). Probably also 'case_sensitive'. The original TER paper mentions
-        # case sensitivity and punctuation as separate tokens already. But until someone really cares let's not break
-        # current behavior or add new command line options. For languages that use spaces, the default behavior is not
-        # completely unreasonable.
-        asian_support = language in EAST_ASIAN_LANGUAGE_CODES
-        sacrebleu_metric = TER(asian_support=asian_support, normalized=asian_support)
-
-        if asian_support and mask_words:
-            raise NotImplementedError(
-                f"TER-br not implemented for language '{language}'. Would require doing the TER tokenization "
-                "separately before replacing with mask tokens and then calling sacrebleu's TER.")
-
+        asian_support = _get_ter_asian_support(language, mask_words)
+        return TER(asian_support=asian_support, normalized=asian_support, references=references)
     elif metric == "chrF":
-        sacrebleu_metric = CHRF()
+        return CHRF(references=references)
     else:
         raise ValueError(f"Unsupported sacrebleu metric '{metric}'.")
 
-    # Sacrebleu currently does not allow empty references, just skip empty reference segments as a workaround.
-    if not all(segment.word_list for segment in reference):
-        empty_reference_indices = [index for index, segment in enumerate(reference) if not segment.word_list]
-        reference = [segment for index, segment in enumerate(reference) if index not in empty_reference_indices]
-        hypothesis = [segment for index, segment in enumerate(hypothesis) if index not in empty_reference_indices]
 
-    segment_to_string_ = functools.partial(
-        segment_to_string, include_line_breaks=include_breaks, mask_all_words=mask_words,
-        include_last_break=score_break_at_segment_end)
+def _get_ter_asian_support(language: Optional[str], mask_words: bool) -> bool:
+    # Setting 'asian_support' only has an effect if 'normalized' is set as well.
+    # TODO: using TER with default options was probably a bad idea in the first place, 'normalized' should always be
+    # set (unless input would already be tokenized). Probably also 'case_sensitive'. The original TER paper mentions
+    # case sensitivity and punctuation as separate tokens already. But until someone really cares let's not break
+    # current behavior or add new command line options. For languages that use spaces, the default behavior is not
+    # completely unreasonable.
+    asian_support = language in EAST_ASIAN_LANGUAGE_CODES
 
-    hypothesis_strings = [segment_to_string_(segment) for segment in hypothesis]
-    reference_strings = [[segment_to_string_(segment) for segment in reference]]  # sacrebleu expects nested list
+    if asian_support and mask_words:
+        raise NotImplementedError(
+            f"TER-br not implemented for language '{language}'. Would require doing the TER tokenization "
+            "separately before replacing with mask tokens and then calling sacrebleu's TER.")
 
-    if include_breaks:
-        # BLEU tokenizer would split "<eol>" into "< eol >".
-        hypothesis_strings = [string.replace("<eol>", "eol").replace("<eob>", "eob") for string in hypothesis_strings]
-        reference_strings[0] = [
-            string.replace("<eol>", "eol").replace("<eob>", "eob") for string in reference_strings[0]]
+    return asian_support
 
-    sacrebleu_score = sacrebleu_metric.corpus_score(hypotheses=hypothesis_strings, references=reference_strings)
 
-    return round(sacrebleu_score.score, 3)
+def _create_ter_tokenizer(language: Optional[str], mask_words: bool) -> TercomTokenizer:
+    """
+    Same tokenizer as used by sacrebleu's TER metric created in _create_sacrebleu_metric().
+    """
+    asian_support = _get_ter_asian_support(language, mask_words)
+    return TercomTokenizer(normalized=asian_support, no_punct=False, asian_support=asian_support, case_sensitive=False)
+
+
+def _calculate_translation_edit_rate_statistics(hypothesis_word_lists: List[List[str]],
+                                                reference_word_lists: List[List[str]], num_workers: int) -> List[float]:
+    """
+    Computes the same statistics as sacrebleu's TER metric, i.e. number of edits and reference length, but using
+    'lib_ter', optionally in parallel.
+    """
+    if num_workers > 1 and len(reference_word_lists) > 1:
+        import concurrent.futures
+
+        chunk_size = -(-len(reference_word_lists) // num_workers)  # ceil
+        chunk_starts = range(0, len(reference_word_lists), chunk_size)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            chunk_statistics = list(executor.map(
+                _get_translation_edit_rate_statistics,
+                [hypothesis_word_lists[start:start + chunk_size] for start in chunk_starts],
+                [reference_word_lists[start:start + chunk_size] for start in chunk_starts]))
+    else:
+        chunk_statistics = [_get_translation_edit_rate_statistics(hypothesis_word_lists, reference_word_lists)]
+
+    return _sum_statistics(chunk_statistics)
+
+
+def _get_translation_edit_rate_statistics(hypothesis_word_lists: Sequence[List[str]],
+                                          reference_word_lists: Sequence[List[str]]) -> Tuple[int, int]:
+    """
+    Returns the total number of edits and the total reference length.
+    """
+    num_edits = 0
+    reference_length = 0
+
+    for hypothesis_words, reference_words in zip(hypothesis_word_lists, reference_word_lists):
+        segment_num_edits, segment_reference_length = lib_ter.translation_edit_rate(
+            hypothesis_words, reference_words, apply_suber_constraints=False,
+            beam_width=lib_ter.SACREBLEU_BEAM_WIDTH)
+
+        num_edits += segment_num_edits
+        reference_length += segment_reference_length
+
+    return num_edits, reference_length
@@ -1,17 +1,21 @@
 import string
-from typing import List
-
-import regex
+from typing import Callable, Iterable, List, Optional, Tuple
 
 from suber.data_types import Subtitle, TimedWord, LineBreak
 from suber.constants import END_OF_BLOCK_SYMBOL, END_OF_LINE_SYMBOL, EAST_ASIAN_LANGUAGE_CODES
 from suber.metrics import lib_ter
+from suber.metrics.suber_checkpoint import PartResult, SubERCheckpoint, get_part_fingerprint
 from suber.metrics.suber_statistics import SubERStatisticsCollector
-from suber.tokenizers import get_sacrebleu_tokenizer
+from suber.progress import ProgressReporter
+from suber.tokenizers import get_word_tokenizer
+from suber.tracing import TracingHooks
 
 
-def calculate_SubER(hypothesis: List[Subtitle], reference: List[Subtitle], metric="SubER",
-                    statistics_collector: SubERStatisticsCollector = None, language: str = None) -> float:
+def calculate_SubER(hypothesis: Iterable[Subtitle], reference: Iterable[Subtitle], metric="SubER",
+                    statistics_collector: SubERStatisticsCollector = None, language: str = None,
+                    checkpoint_file: Optional[str] = None,
+                    progress_reporter: Optional[ProgressReporter] = None,
+                    tracing_hooks: Optional[TracingHooks] = None) -> float:
     """
     Main function to calculate the SubER score. It is computed on normalized text, which means case-insensitive and
     without taking punctuation into account, as we observed higher correlation with human judgements and post-edit
@@ -20,6 +24,31 @@ def calculate_SubER(hypothesis: List[Subtitle], reference: List[Subtitle], metri
     We use a modified version of 'lib_ter.py' from sacrebleu for the underlying TER implementation. We altered the
     algorithm by adding a time-overlap condition for word alignments and by disallowing word alignments between real
     words and break tokens.
+    Hypothesis and reference can also be given as iterators over subtitles ordered by start time, e.g. from
+    'suber.file_readers.iterate_input_file()'. They are consumed part by part, such that only the subtitles of the
+    current part (see '_get_independent_parts()') are held in memory.
+    If 'checkpoint_file' is set, the results of all completed parts are stored there, and parts already stored by a
+    previous, interrupted computation on the same input are not computed again, see 'suber.metrics.suber_checkpoint'.
+    If 'progress_reporter' is set, it is updated after each part and shift iteration. The estimated cost of a part is
+    the size of the edit distance matrix within the beam.
+    If 'tracing_hooks' are set, they are notified of parts, shift iterations and edit distance computations, see
+    'suber.tracing'.
+    """
+    num_edits, reference_length = calculate_SubER_statistics(
+        hypothesis, reference, metric=metric, statistics_collector=statistics_collector, language=language,
+        checkpoint_file=checkpoint_file, progress_reporter=progress_reporter, tracing_hooks=tracing_hooks)
+
+    return get_SubER_score(num_edits, reference_length)
+
+
+def calculate_SubER_statistics(hypothesis: Iterable[Subtitle], reference: Iterable[Subtitle], metric="SubER",
+                               statistics_collector: SubERStatisticsCollector = None, language: str = None,
+                               checkpoint_file: Optional[str] = None,
+                               progress_reporter: Optional[ProgressReporter] = None,
+                               tracing_hooks: Optional[TracingHooks] = None) -> Tuple[int, int]:
+    """
+    Returns the total number of edits and the total reference length (words + breaks) which the SubER score is
+    computed from, see calculate_SubER(). Both can be summed up over different files.
     """
     assert metric in ["SubER", "SubER-cased"]
     normalize = (metric == "SubER")
@@ -27,20 +56,59 @@ def calculate_SubER(hypothesis: List[Subtitle], reference: List[Subtitle], metri
     total_num_edits = 0
     total_reference_length = 0
 
-    for part in _get_independent_parts(hypothesis, reference):
+    checkpoint = SubERCheckpoint(checkpoint_file) if checkpoint_file is not None else None
+
+    progress_callback = None
+    num_parts = None
+    if progress_reporter is not None:
+        if isinstance(hypothesis, list) and isinstance(reference, list):
+            # Iterating over the parts is cheap compared to SubER computation. Not possible for iterators.
+            part_costs = [_estimate_part_cost(*part) for part in _get_independent_parts(hypothesis, reference)]
+            num_parts = len(part_costs)
+            progress_reporter.update(0, total_cost=sum(part_costs))
+
+    for part_index, part in enumerate(_get_independent_parts(hypothesis, reference)):
         hypothesis_part, reference_part = part
 
-        num_edits, reference_length = _calculate_num_edits_for_part(
-            hypothesis_part, reference_part, normalize=normalize, statistics_collector=statistics_collector,
-            language=language)
+        if progress_reporter is not None:
+            part_description = f"part {part_index + 1}" + (f"/{num_parts}" if num_parts is not None else "")
+            progress_reporter.set_status(part_description)
+
+            def progress_callback(num_shifts):
+                progress_reporter.set_status(f"{part_description}, {num_shifts} shifts")
+
+        if tracing_hooks is not None:
+            tracing_hooks.part_started(part_index, len(hypothesis_part), len(reference_part))
+
+        if checkpoint is not None:
+            num_edits, reference_length = _calculate_num_edits_for_part_with_checkpoint(
+                hypothesis_part, reference_part, checkpoint, metric=metric, statistics_collector=statistics_collector,
+                language=language, progress_callback=progress_callback, tracing_hooks=tracing_hooks)
+        else:
+            num_edits, reference_length = _calculate_num_edits_for_part(
+                hypothesis_part, reference_part, normalize=normalize, statistics_collector=statistics_collector,
+                language=language, progress_callback=progress_callback, tracing_hooks=tracing_hooks)
+
+        if tracing_hooks is not None:
+            tracing_hooks.part_finished(part_index, num_edits, reference_length)
 
         total_num_edits += num_edits
         total_reference_length += reference_length
 
-    if total_reference_length:
-        SubER_score = (total_num_edits / total_reference_length) * 100
+        if progress_reporter is not None:
+            progress_reporter.advance(_estimate_part_cost(hypothesis_part, reference_part))
 
-    elif not total_num_edits:
+    if progress_reporter is not None:
+        progress_reporter.finish()
+
+    return total_num_edits, total_reference_length
+
+
+def get_SubER_score(num_edits: int, reference_length: int) -> float:
+    if reference_length:
+        SubER_score = (num_edits / reference_length) * 100
+
+    elif not num_edits:
         SubER_score = 0.0
     else:
         SubER_score = 100.0
@@ -48,8 +116,43 @@ def calculate_SubER(hypothesis: List[Subtitle], reference: List[Subtitle], metri
     return round(SubER_score, 3)
 
 
+def _calculate_num_edits_for_part_with_checkpoint(hypothesis_part: List[Subtitle], reference_part: List[Subtitle],
+                                                  checkpoint: SubERCheckpoint, metric="SubER",
+                                                  statistics_collector: SubERStatisticsCollector = None,
+                                                  language: str = None,
+                                                  progress_callback: Optional[Callable[[int], None]] = None,
+                                                  tracing_hooks: Optional[TracingHooks] = None) -> Tuple[int, int]:
+    """
+    Same as _calculate_num_edits_for_part(), but takes the result from 'checkpoint' if available and adds it otherwise.
+    """
+    fingerprint = get_part_fingerprint(hypothesis_part, reference_part, {"metric": metric, "language": language})
+
+    part_result = checkpoint.get_part_result(fingerprint, need_statistics=(statistics_collector is not None))
+
+    if part_result is None:
+        # Statistics of this part only, to be stored in the checkpoint.
+        part_statistics_collector = SubERStatisticsCollector() if statistics_collector is not None else None
+
+        num_edits, reference_length = _calculate_num_edits_for_part(
+            hypothesis_part, reference_part, normalize=(metric == "SubER"),
+            statistics_collector=part_statistics_collector, language=language, progress_callback=progress_callback,
+            tracing_hooks=tracing_hooks)
+
+        part_result = PartResult(
+            num_edits=num_edits, reference_length=reference_length,
+            statistics=part_statistics_collector.get_statistics() if part_statistics_collector else None)
+        checkpoint.add_part_result(fingerprint, part_result)
+
+    if statistics_collector is not None:
+        statistics_collector.add_statistics(part_result.statistics)
+
+    return part_result.num_edits, part_result.reference_length
+
+
 def _calculate_num_edits_for_part(hypothesis_part: List[Subtitle], reference_part: List[Subtitle], normalize=True,
-                                  statistics_collector: SubERStatisticsCollector = None, language: str = None):
+                                  statistics_collector: SubERStatisticsCollector = None, language: str = None,
+                                  progress_callback: Optional[Callable[[int], None]] = None,
+                                  tracing_hooks: Optional[TracingHooks] = None):
     """
     Returns number of edits (word or break edits and shifts) and the total number of reference tokens (words + breaks)
     for the current part.
@@ -73,13 +176,25 @@ def _calculate_num_edits_for_part(hypothesis_part: List[Subtitle], reference_par
     all_reference_words = _add_breaks_as_words(all_reference_words)
 
     num_edits, reference_length = lib_ter.translation_edit_rate(
-        all_hypothesis_words, all_reference_words, statistics_collector)
+        all_hypothesis_words, all_reference_words, statistics_collector, progress_callback=progress_callback,
+        tracing_hooks=tracing_hooks)
 
     assert reference_length == len(all_reference_words)
 
     return num_edits, reference_length
 
 
+def _estimate_part_cost(hypothesis_part: List[Subtitle], reference_part: List[Subtitle]) -> int:
+    """
+    Estimated cost of one edit distance pass over the part, used for progress reporting. Breaks are approximated by
+    one per subtitle.
+    """
+    num_hypothesis_words = sum(len(subtitle.word_list) + 1 for subtitle in hypothesis_part)
+    num_reference_words = sum(len(subtitle.word_list) + 1 for subtitle in reference_part)
+
+    return lib_ter.estimate_edit_distance_cost(num_hypothesis_words, num_reference_words)
+
+
 def _add_breaks_as_words(words: List[TimedWord]) -> List[TimedWord]:
     """
     Converts breaks from being an attribute of the previous Word to being a separate Word in the list. Needed because
@@ -87,15 +202,17 @@ def _add_breaks_as_words(words: List[TimedWord]) -> List[TimedWord]:
     """
     output_words = []
     for word in words:
-        output_words.append(
-            TimedWord(
-                string=word.string,
-                line_break=LineBreak.NONE,
-                subtitle_start_time=word.subtitle_start_time,
-                subtitle_end_time=word.subtitle_end_time,
-                approximate_word_time=word.approximate_word_time))
+        if word.line_break is LineBreak.NONE:
+            output_words.append(word)  # words are immutable, no need to copy
+        else:
+            output_words.append(
+                TimedWord(
+                    string=word.string,
+                    line_break=LineBreak.NONE,
+                    subtitle_start_time=word.subtitle_start_time,
+                    subtitle_end_time=word.subtitle_end_time,
+                    approximate_word_time=word.approximate_word_time))
 
-        if word.line_break is not LineBreak.NONE:
             output_words.append(
                 TimedWord(
                     string=END_OF_LINE_SYMBOL if word.line_break is LineBreak.END_OF_LINE else END_OF_BLOCK_SYMBOL,
@@ -114,6 +231,9 @@ def _normalize_words(words: List[TimedWord], language: str = None) -> List[Timed
     """
     Lower-cases Words and removes punctuation.
     """
+    if language in EAST_ASIAN_LANGUAGE_CODES:
+        import regex  # only here, not needed for most languages
+
     output_words = []
     for word in words:
         normalized_string = word.string.lower()
@@ -132,6 +252,10 @@ def _normalize_words(words: List[TimedWord], language: str = None) -> List[Timed
         if normalized_string_without_punctuation:
             normalized_string = normalized_string_without_punctuation
 
+        if normalized_string == word.string:
+            output_words.append(word)  # words are immutable, no need to copy
+            continue
+
         output_words.append(
             TimedWord(
                 string=normalized_string,
@@ -143,30 +267,21 @@ def _normalize_words(words: List[TimedWord], language: str = None) -> List[Timed
     return output_words
 
 
-_tokenizers = {}  # language -> callable
-
-
 def _tokenize_words(words: List[TimedWord], language: str = None) -> List[TimedWord]:
     """
     Not used for the main SubER metric, only for the "SubER-cased" variant. Applies sacrebleu's TercomTokenizer to all
     words in the input, which will create a new list of words containing punctuation symbols as separate elements.
     """
-    global _tokenizers
-
-    if language not in _tokenizers:
-        # For all languages except "ja", "ko", "zh" we use TercomTokenizer to stay close to the reference TER
-        # implementation.
-        _tokenizers[language] = get_sacrebleu_tokenizer(language, default_to_tercom=True)
-
-    tokenizer = _tokenizers[language]
+    # For all languages except "ja", "ko", "zh" we use TercomTokenizer to stay close to the reference TER
+    # implementation.
+    word_tokenizer = get_word_tokenizer(language, default_to_tercom=True)
 
     output_words = []
     for word in words:
-        tokenized_word_string = tokenizer(word.string)
-        tokens = tokenized_word_string.split()
+        tokens = word_tokenizer(word.string)
 
         if len(tokens) == 1:
-            assert tokenized_word_string == word.string
+            assert tokens[0] == word.string
             output_words.append(word)
             continue
 
@@ -183,7 +298,7 @@ def _tokenize_words(words: List[TimedWord], language: str = None) -> List[TimedW
     return output_words
 
 
-def _get_independent_parts(hypothesis: List[Subtitle], reference: List[Subtitle]):
+def _get_independent_parts(hypothesis: Iterable[Subtitle], reference: Iterable[Subtitle]):
     """
     SubER by definition does not require parallel hypothesis-reference segments. We nevertheless split the subtitle file
     content into parts at positions in time where there is no subtitle in both hypothesis and reference. This makes
@@ -193,46 +308,51 @@ def _get_independent_parts(hypothesis: List[Subtitle], reference: List[Subtitle]
     Note, that in the worst case there are no such split points. In practice, this is unrealistic and subtitle files
     are usually limited to a few hours of speech, such that the current SubER calculation should be efficient enough.
 
+    Hypothesis and reference subtitles must be ordered by start time. They are consumed lazily, so iterators can be
+    passed to avoid holding all subtitles in memory.
+
     This function yields Tuple[List[Subtitle],List[Subtitle]] containing the hypothesis and reference subtitles for each
     part.
     """
     hypothesis_part = []
     reference_part = []
 
+    hypothesis_iterator = iter(hypothesis)
+    reference_iterator = iter(reference)
+
     # We sweep the time axis from low to high and handle hypothesis and reference subtitles as soon as we reach them.
-    hypothesis_subtitle_index = 0  # index of hypothesis subtitle to handle next
-    reference_subtitle_index = 0  # index of reference subtitle to handle next
+    next_hypothesis_subtitle = next(hypothesis_iterator, None)  # hypothesis subtitle to handle next
+    next_reference_subtitle = next(reference_iterator, None)  # reference subtitle to handle next
     latest_observed_time = - float('inf')  # highest time observed so far (end time of a previously handled subtitle)
 
-    while hypothesis_subtitle_index < len(hypothesis) or reference_subtitle_index < len(reference):
-        if (hypothesis_subtitle_index < len(hypothesis) and (
-                reference_subtitle_index == len(reference) or
-                hypothesis[hypothesis_subtitle_index].start_time < reference[reference_subtitle_index].start_time)):
+    while next_hypothesis_subtitle is not None or next_reference_subtitle is not None:
+        if (next_hypothesis_subtitle is not None and (
+                next_reference_subtitle is None or
+                next_hypothesis_subtitle.start_time < next_reference_subtitle.start_time)):
             # We found the next subtitle on the time axis, it is from the hypothesis.
 
             if ((hypothesis_part or reference_part)
-                    and hypothesis[hypothesis_subtitle_index].start_time >= latest_observed_time):
+                    and next_hypothesis_subtitle.start_time >= latest_observed_time):
                 # The subtitle starts after the latest observed time, meaning there is a gap where no subtitle exists.
                 # This concludes the current part, yield it.
                 yield (hypothesis_part, reference_part)
                 hypothesis_part, reference_part = [], []
 
-            hypothesis_part.append(hypothesis[hypothesis_subtitle_index])
-            latest_observed_time = max(latest_observed_time, hypothesis[hypothesis_subtitle_index].end_time)
-            hypothesis_subtitle_index += 1
+            hypothesis_part.append(next_hypothesis_subtitle)
+            latest_observed_time = max(latest_observed_time, next_hypothesis_subtitle.end_time)
+            next_hypothesis_subtitle = next(hypothesis_iterator, None)
 
         else:  # Next subtitle to handle is from the reference.
             if ((hypothesis_part or reference_part)
-                    and reference[reference_subtitle_index].start_time >= latest_observed_time):
+                    and next_reference_subtitle.start_time >= latest_observed_time):
                 # The subtitle starts after the latest observed time, meaning there is a gap where no subtitle exists.
                 # This concludes the current part, yield it.
                 yield (hypothesis_part, reference_part)
                 hypothesis_part, reference_part = [], []
 
-            reference_part.append(reference[reference_subtitle_index])
-            latest_observed_time = max(latest_observed_time, reference[reference_subtitle_index].end_time)
-            reference_subtitle_index += 1
+            reference_part.append(next_reference_subtitle)
+            latest_observed_time = max(latest_observed_time, next_reference_subtitle.end_time)
+            next_reference_subtitle = next(reference_iterator, None)
 
-    assert hypothesis_subtitle_index == len(hypothesis) and reference_subtitle_index == len(reference)
     if hypothesis_part or reference_part:
         yield (hypothesis_part, reference_part)
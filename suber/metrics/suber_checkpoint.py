@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from suber.data_types import Subtitle
+
+# Increase if SubER computation changes in a way that alters the results of single parts.
+_CHECKPOINT_FORMAT_VERSION = 1
+
+
+class PartResult(NamedTuple):
+    num_edits: int
+    reference_length: int
+    statistics: Optional[Dict[str, int]]  # from SubERStatisticsCollector.get_statistics(), if collected
+
+
+class SubERCheckpoint:
+    """
+    Persists the results of the independent parts of a SubER computation (see 'suber.metrics.suber'), such that an
+    interrupted computation can be resumed. Each result is appended to the checkpoint file as a JSON line as soon as
+    the part is completed. Results are identified by a fingerprint of the part's hypothesis and reference subtitles and
+    of the metric settings. So results for changed input files are never reused, and a checkpoint file can be shared
+    by several computations, e.g. SubER and SubER-cased.
+    Lines that cannot be decoded, e.g. an incomplete last line of an interrupted computation, are ignored. They are
+    not removed from the file, because another computation sharing the file may still be appending to it.
+    """
+
+    def __init__(self, file_name: str):
+        self._file_name = file_name
+        self._ends_with_incomplete_line = False
+        self._results: Dict[str, PartResult] = self._load()
+
+    def get_part_result(self, fingerprint: str, need_statistics=False) -> Optional[PartResult]:
+        result = self._results.get(fingerprint)
+        if result is None or (need_statistics and result.statistics is None):
+            return None
+
+        return result
+
+    def add_part_result(self, fingerprint: str, part_result: PartResult):
+        self._results[fingerprint] = part_result
+
+        line = json.dumps({"fingerprint": fingerprint, **part_result._asdict()}) + "\n"
+        if self._ends_with_incomplete_line:
+            # Start on a new line, otherwise our record would be appended to the undecodable one. If another
+            # computation completed that line in the meantime, this only adds an empty line.
+            line = "\n" + line
+            self._ends_with_incomplete_line = False
+
+        # A single write per record, such that records of computations sharing the file do not interleave.
+        with open(self._file_name, "a", encoding="utf-8") as checkpoint_file:
+            checkpoint_file.write(line)
+
+    def _load(self) -> Dict[str, PartResult]:
+        if not os.path.exists(self._file_name):
+            return {}
+
+        with open(self._file_name, "rb") as checkpoint_file:
+            content = checkpoint_file.read()
+
+        self._ends_with_incomplete_line = bool(content) and not content.endswith(b"\n")
+
+        results = {}
+        for line in content.split(b"\n"):
+            try:
+                record = json.loads(line)
+                results[record["fingerprint"]] = PartResult(
+                    num_edits=record["num_edits"], reference_length=record["reference_length"],
+                    statistics=record["statistics"])
+            except (ValueError, KeyError, TypeError):
+                continue  # empty, incomplete or corrupted line, or not a complete record
+
+        return results
+
+
+def get_part_fingerprint(hypothesis_part: List[Subtitle], reference_part: List[Subtitle],
+                         settings: Dict[str, Any]) -> str:
+    """
+    Returns a hash over all subtitle contents and timings of a part, and the 'settings' it is scored with.
+    """
+    fingerprint = hashlib.sha256(repr((_CHECKPOINT_FORMAT_VERSION, sorted(settings.items()))).encode("utf-8"))
+
+    for subtitles in (hypothesis_part, reference_part):
+        for subtitle in subtitles:
+            fingerprint.update(repr((
+                subtitle.start_time, subtitle.end_time,
+                [(word.string, word.line_break.value, word.approximate_word_time) for word in subtitle.word_list]
+            )).encode("utf-8"))
+        fingerprint.update(b"\n")  # separates hypothesis from reference
+
+    return fingerprint.hexdigest()
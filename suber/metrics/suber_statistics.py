@@ -80,3 +80,11 @@ class SubERStatisticsCollector:
             num_word_substitutions=self._num_word_substitutions,
             num_break_substitutions=self._num_break_substitutions,
         )
+
+    def add_statistics(self, statistics: Dict[str, int]):
+        """
+        Adds counts in the format returned by get_statistics(), e.g. collected by another instance.
+        """
+        for name, count in statistics.items():
+            attribute_name = "_" + name
+            setattr(self, attribute_name, getattr(self, attribute_name) + count)
@@ -0,0 +1,101 @@
+import sys
+import time
+from typing import Optional, TextIO
+
+
+class ProgressReporter:
+    """
+    Reports the progress of a long computation on stderr. Progress is measured in an abstract cost, e.g. the estimated
+    number of edit distance matrix cells to compute, which is assumed to be proportional to run time. The remaining
+    time is estimated from the cost completed so far and the time that took. Output is written at most every
+    'interval' seconds, so frequent updates add negligible overhead.
+    """
+
+    def __init__(self, description: str, total_cost: Optional[float] = None, stream: Optional[TextIO] = None,
+                 interval: float = 1.0):
+        self._description = description
+        self._total_cost = total_cost
+        self._stream = stream if stream is not None else sys.stderr
+        self._interval = interval
+        # On a terminal, each report overwrites the previous one.
+        self._is_terminal = self._stream.isatty()
+
+        self._start_time = time.monotonic()
+        self._last_report_time = self._start_time
+        self._completed_cost = 0.0
+        self._status = None
+
+    def update(self, completed_cost: float, total_cost: Optional[float] = None, status: Optional[str] = None):
+        """
+        Sets the absolute progress. 'status' is an additional, human-readable description of the current state, it is
+        kept if not given.
+        """
+        self._completed_cost = completed_cost
+        if total_cost is not None:
+            self._total_cost = total_cost
+        if status is not None:
+            self._status = status
+
+        self._report_if_due()
+
+    def advance(self, cost: float, status: Optional[str] = None):
+        """
+        Adds 'cost' to the completed cost.
+        """
+        self.update(self._completed_cost + cost, status=status)
+
+    def set_status(self, status: str):
+        self._status = status
+
+        self._report_if_due()
+
+    def finish(self):
+        """
+        Reports the total run time. Nothing is written if the computation finished within the first interval.
+        """
+        current_time = time.monotonic()
+        if self._last_report_time == self._start_time:
+            return
+
+        self._write(f"{self._description}: done in {_format_duration(current_time - self._start_time)}", end="\n")
+
+    def _report_if_due(self):
+        current_time = time.monotonic()
+        if current_time - self._last_report_time >= self._interval:
+            self._last_report_time = current_time
+            self._write(self._format_progress(current_time), end="" if self._is_terminal else "\n")
+
+    def _format_progress(self, current_time: float) -> str:
+        message = f"{self._description}:"
+
+        if self._total_cost:
+            fraction_completed = min(self._completed_cost / self._total_cost, 1.0)
+            message += f" {fraction_completed * 100:.1f}%"
+
+            if fraction_completed > 0:
+                elapsed_time = current_time - self._start_time
+                remaining_time = elapsed_time * (1 - fraction_completed) / fraction_completed
+                message += f", ETA {_format_duration(remaining_time)}"
+
+        if self._status:
+            message += f" ({self._status})"
+
+        return message
+
+    def _write(self, message: str, end: str):
+        if self._is_terminal:
+            message = "\r\033[K" + message  # clear the previous report
+
+        self._stream.write(message + end)
+        self._stream.flush()
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours:
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
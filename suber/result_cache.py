@@ -0,0 +1,124 @@
+"""
+On-disk cache of complete 'suber' outputs. Repeated runs on identical input files with identical options return the
+stored JSON output without reading the files into segments or computing any metric. Entries are identified by the
+content hashes of the input files, not by their names, together with all options that affect the output, the
+package version and the modification times of the package source files.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+# Increase if the output of an unchanged package version could change, e.g. when changing the cache key.
+_CACHE_FORMAT_VERSION = 1
+
+_ENTRY_SUFFIX = ".json"
+
+
+def get_result_cache_key(hypothesis_files: List[str], reference_files: List[str], options: Dict[str, Any]) -> str:
+    """
+    Returns the key of the cache entry for scoring 'hypothesis_files' against 'reference_files'. 'options' must contain
+    everything else the output depends on, e.g. metrics, language and file formats, and must be JSON serializable.
+    """
+    key_content = json.dumps({
+        "cache_format_version": _CACHE_FORMAT_VERSION,
+        "package_version": _get_package_version(),
+        "hypothesis_files": [_hash_file_content(file_name) for file_name in hypothesis_files],
+        "reference_files": [_hash_file_content(file_name) for file_name in reference_files],
+        "options": options,
+    }, sort_keys=True)
+
+    return hashlib.sha256(key_content.encode("utf-8")).hexdigest()
+
+
+def load_cached_result(key: str, cache_directory: str) -> Optional[str]:
+    """
+    Returns the output stored for 'key' by store_result_in_cache(), or None if there is no such entry.
+    """
+    entry_file_name = os.path.join(cache_directory, key + _ENTRY_SUFFIX)
+
+    try:
+        with open(entry_file_name, encoding="utf-8") as entry_file:
+            result = entry_file.read()
+    except OSError:
+        return None  # includes the entry being evicted by another process in the meantime
+
+    try:
+        # Marks the entry as recently used, see _evict_entries().
+        os.utime(entry_file_name)
+    except OSError:
+        pass
+
+    return result
+
+
+def store_result_in_cache(result: str, key: str, cache_directory: str, max_size_bytes: int):
+    """
+    Stores the output 'result' for 'key'. The file is written atomically, such that concurrent processes never see
+    partially written entries. Afterwards, least recently used entries are removed until the total size of all entries
+    is at most 'max_size_bytes'.
+    """
+    os.makedirs(cache_directory, exist_ok=True)
+    entry_file_name = os.path.join(cache_directory, key + _ENTRY_SUFFIX)
+
+    temporary_file_descriptor, temporary_file_name = tempfile.mkstemp(dir=cache_directory, suffix=".tmp")
+    try:
+        with os.fdopen(temporary_file_descriptor, "w", encoding="utf-8") as temporary_file:
+            temporary_file.write(result)
+        os.replace(temporary_file_name, entry_file_name)
+    except BaseException:
+        os.remove(temporary_file_name)
+        raise
+
+    _evict_entries(cache_directory, max_size_bytes)
+
+
+def _evict_entries(cache_directory: str, max_size_bytes: int):
+    entries = []
+    for directory_entry in os.scandir(cache_directory):
+        if not directory_entry.name.endswith(_ENTRY_SUFFIX):
+            continue
+        try:
+            file_status = directory_entry.stat()
+        except OSError:
+            continue  # removed by another process
+        entries.append((file_status.st_mtime_ns, file_status.st_size, directory_entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+
+    for _, size, entry_file_name in sorted(entries):
+        if total_size <= max_size_bytes:
+            break
+        try:
+            os.remove(entry_file_name)
+        except OSError:
+            pass  # already removed by another process
+        total_size -= size
+
+
+def _hash_file_content(file_name: str) -> str:
+    content_hash = hashlib.sha256()
+    with open(file_name, "rb") as file_object:
+        for block in iter(lambda: file_object.read(1 << 20), b""):
+            content_hash.update(block)
+
+    return content_hash.hexdigest()
+
+
+def _get_package_version() -> str:
+    # Modification times of the source files are included too, such that changes to the code of an editable install
+    # or source checkout, where the version stays the same, invalidate the cache.
+    package_directory = os.path.dirname(os.path.abspath(__file__))
+    source_modification_times = [
+        os.stat(os.path.join(directory, file_name)).st_mtime_ns
+        for directory, _, file_names in os.walk(package_directory)
+        for file_name in file_names if file_name.endswith(".py")]
+    source_version = f"source-{max(source_modification_times)}"
+
+    try:
+        return f"{importlib.metadata.version('subtitle-edit-rate')}-{source_version}"
+    except importlib.metadata.PackageNotFoundError:
+        return source_version  # running from a source checkout
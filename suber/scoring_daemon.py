@@ -0,0 +1,174 @@
+"""
+Long-running scoring process. It avoids paying interpreter startup, library imports, tokenizer initialization (e.g. of
+MeCab) and reference parsing for every single 'suber' call, which dominates run time when scoring many hypotheses
+against the same references, e.g. in hyperparameter sweeps. The daemon is started with 'suber-server' and listens on a
+Unix socket, 'suber-client' takes the same arguments as 'suber' and sends them to the daemon.
+
+Protocol: the client sends a single line containing a JSON object with all 'suber' command line arguments. The daemon
+answers with a single line containing either {"results": <output of 'suber'>} or {"error": <message>}.
+"""
+
+import argparse
+import getpass
+import json
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from suber.__main__ import calculate_results, calculate_results_for_segments, create_output
+from suber.data_types import Segment
+from suber.file_readers import read_input_file
+from suber.metrics.metric_input_cache import MetricInputCache
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"suber-{getpass.getuser()}.sock")
+
+
+class ScoringService:
+    """
+    Creates 'suber' outputs, keeping the 'max_cached_references' most recently used reference files in memory, parsed
+    and pre-processed for the metrics. Tokenizers stay initialized anyway, see get_sacrebleu_tokenizer().
+    """
+
+    def __init__(self, max_cached_references: int = 16):
+        self._max_cached_references = max_cached_references
+        # Maps file name and format to file size and modification time, the segments and their MetricInputCache.
+        self._cached_references: Dict[Tuple[str, str], Tuple[Tuple[int, int], List[Segment], MetricInputCache]] = \
+            OrderedDict()
+
+    def score(self, arguments: Dict[str, Any]) -> str:
+        """
+        Returns the JSON output of 'suber' for the given command line arguments, as in vars() of the parsed arguments.
+        """
+        return create_output(argparse.Namespace(**arguments), calculate_results_function=self._calculate_results)
+
+    def _calculate_results(self, args: argparse.Namespace, metrics: List[str]) -> Dict[str, Any]:
+        if len(args.hypothesis) != 1 or len(args.reference) != 1:
+            # Timings of concatenated references depend on the hypothesis files, nothing to reuse in later requests.
+            return calculate_results(args, metrics)
+
+        hypothesis_segments = read_input_file(
+            args.hypothesis[0], file_format=args.hypothesis_format, cache_directory=args.input_cache_dir,
+            num_workers=args.jobs)
+        reference_segments, metric_input_cache = self._get_reference(
+            args.reference[0], args.reference_format, cache_directory=args.input_cache_dir, num_workers=args.jobs)
+
+        try:
+            return calculate_results_for_segments(
+                args, metrics, hypothesis_segments, reference_segments, metric_input_cache=metric_input_cache)
+        finally:
+            # Entries for the (aligned) hypothesis segments will not be used again.
+            metric_input_cache.clear(keep_segments=reference_segments)
+
+    def _get_reference(self, file_name: str, file_format: str, cache_directory: Optional[str],
+                       num_workers: int) -> Tuple[List[Segment], MetricInputCache]:
+        file_status = os.stat(file_name)
+        file_version = (file_status.st_size, file_status.st_mtime_ns)
+        key = (os.path.abspath(file_name), file_format)
+
+        cached_reference = self._cached_references.get(key)
+
+        if cached_reference is None or cached_reference[0] != file_version:
+            segments = read_input_file(
+                file_name, file_format=file_format, cache_directory=cache_directory, num_workers=num_workers)
+            cached_reference = (file_version, segments, MetricInputCache())
+            self._cached_references[key] = cached_reference
+
+        self._cached_references.move_to_end(key)
+        while len(self._cached_references) > self._max_cached_references:
+            self._cached_references.popitem(last=False)
+
+        _, segments, metric_input_cache = cached_reference
+
+        return segments, metric_input_cache
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            arguments = json.loads(self.rfile.readline())
+            output = self.server.scoring_service.score(arguments)
+            response = {"results": json.loads(output, object_pairs_hook=OrderedDict)}
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def create_server(socket_path: str = DEFAULT_SOCKET_PATH, max_cached_references: int = 16) -> socketserver.BaseServer:
+    """
+    Creates the daemon's server, listening on 'socket_path'. Requests are handled one after the other. Raises a
+    RuntimeError if another daemon is already listening on 'socket_path'.
+    """
+    if os.path.exists(socket_path):
+        connection = _connect(socket_path)
+        if connection is not None:
+            connection.close()
+            raise RuntimeError(f"A scoring daemon is already running on '{socket_path}'.")
+        os.remove(socket_path)  # left over from a daemon that was killed
+
+    server = socketserver.UnixStreamServer(socket_path, _RequestHandler)
+    server.scoring_service = ScoringService(max_cached_references=max_cached_references)
+
+    return server
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH, max_cached_references: int = 16):
+    """
+    Runs the daemon until interrupted or terminated.
+    """
+    def exit_on_signal(signal_number, _):
+        raise SystemExit(128 + signal_number)
+
+    signal.signal(signal.SIGTERM, exit_on_signal)
+
+    with create_server(socket_path, max_cached_references) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+def request_scoring(arguments: Dict[str, Any], socket_path: str = DEFAULT_SOCKET_PATH) -> Optional[str]:
+    """
+    Sends 'suber' command line arguments to the daemon and returns the JSON output, same as printed by 'suber'. Returns
+    None if no daemon is running, or if it closed the connection without a response, e.g. because it was terminated.
+    File names in 'arguments' must be absolute, the daemon has its own working directory.
+    """
+    connection = _connect(socket_path)
+    if connection is None:
+        return None
+
+    with connection, connection.makefile("rb") as response_file:
+        try:
+            connection.sendall(json.dumps(arguments).encode("utf-8") + b"\n")
+            response_line = response_file.readline()
+        except (BrokenPipeError, ConnectionResetError):
+            return None
+
+    if not response_line:
+        return None
+
+    response = json.loads(response_line, object_pairs_hook=OrderedDict)
+
+    if "error" in response:
+        raise RuntimeError(f"Scoring daemon failed: {response['error']}")
+
+    return json.dumps(response["results"], indent=4)
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        connection.close()
+        return None
+
+    return connection
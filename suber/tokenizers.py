@@ -1,14 +1,14 @@
-import regex
-from typing import Callable, List, Optional
+import dataclasses
+import functools
+from typing import Callable, List, Optional, Tuple
 
-from sacrebleu.tokenizers.tokenizer_13a import Tokenizer13a
-from sacrebleu.tokenizers.tokenizer_ja_mecab import TokenizerJaMecab
-from sacrebleu.tokenizers.tokenizer_ter import TercomTokenizer
-from sacrebleu.tokenizers.tokenizer_zh import TokenizerZh
-
-from suber.constants import SPACE_ESCAPE
+from suber.constants import EAST_ASIAN_LANGUAGE_CODES, SPACE_ESCAPE
 from suber.data_types import LineBreak, Segment, Subtitle, Word, TimedWord
-from suber.utilities import set_approximate_word_times
+from suber.utilities import get_approximate_word_times
+
+# Number of distinct word strings for which WordTokenizer keeps the tokens. Enough for the vocabulary of typical test
+# sets, while bounding the memory of long-running processes like the scoring daemon.
+_MAX_CACHED_WORDS = 100000
 
 
 def get_sacrebleu_tokenizer(language: str, default_to_tercom: bool = False) -> Callable[[str], str]:
@@ -19,8 +19,21 @@ def get_sacrebleu_tokenizer(language: str, default_to_tercom: bool = False) -> C
     implementation which always used TercomTokenizer. But the "asian_support" of TercomTokenizer is questionable,
     especially that for Japanese sequences of Hiragana and Katakana characters are never split. So for those languages
     we switch to the dedicated default BLEU tokenizers.
+    The same tokenizer instance is returned for repeated calls, such that e.g. the MeCab model is loaded only once and
+    sacrebleu's cache of tokenized strings is shared.
     """
+    if language in EAST_ASIAN_LANGUAGE_CODES:
+        default_to_tercom = False  # no effect
+
+    return _create_sacrebleu_tokenizer(language, default_to_tercom)
+
+
+@functools.lru_cache(maxsize=None)
+def _create_sacrebleu_tokenizer(language: str, default_to_tercom: bool) -> Callable[[str], str]:
+    # Tokenizers are imported only here, sacrebleu takes long to import and is not needed for the default SubER metric.
     if language == "ja":
+        from sacrebleu.tokenizers.tokenizer_ja_mecab import TokenizerJaMecab
+
         tokenizer = TokenizerJaMecab()
     elif language == "ko":
         # Import only here to keep compatible with sacrebleu versions < 2.2 for all other languages.
@@ -28,15 +41,142 @@ def get_sacrebleu_tokenizer(language: str, default_to_tercom: bool = False) -> C
 
         tokenizer = TokenizerKoMecab()
     elif language == "zh":
+        from sacrebleu.tokenizers.tokenizer_zh import TokenizerZh
+
         tokenizer = TokenizerZh()
     elif not default_to_tercom:
+        from sacrebleu.tokenizers.tokenizer_13a import Tokenizer13a
+
         tokenizer = Tokenizer13a()
     else:
+        from sacrebleu.tokenizers.tokenizer_ter import TercomTokenizer
+
         tokenizer = TercomTokenizer(normalized=True, no_punct=False, case_sensitive=True)
 
     return tokenizer
 
 
+class WordTokenizer:
+    """
+    Splits single words into tokens using get_sacrebleu_tokenizer(). The tokens of the 'max_cached_words' most recently
+    used word strings are kept, for East Asian languages this avoids repeated MeCab / Chinese segmentation passes over
+    the same text by the different metrics and alignment steps. Use get_word_tokenizer() to share instances within a
+    run. To tokenize the words of whole segments, see tokenize_segment_words().
+    If 'keep_punctuation_attached' is set, tokens consisting of only punctuation are attached to a neighboring token,
+    see reversibly_tokenize_segments().
+    """
+
+    def __init__(self, language: str, default_to_tercom: bool = False, keep_punctuation_attached: bool = False,
+                 max_cached_words: int = _MAX_CACHED_WORDS):
+        self._tokenizer = get_sacrebleu_tokenizer(language, default_to_tercom=default_to_tercom)
+        self._keep_punctuation_attached = keep_punctuation_attached
+        self._cached_tokenize = functools.lru_cache(maxsize=max_cached_words)(self._tokenize)
+
+    def __call__(self, word: str) -> Tuple[str, ...]:
+        return self._cached_tokenize(word)
+
+    def _tokenize(self, word: str) -> Tuple[str, ...]:
+        tokenized_word = self._tokenizer(word)
+        if self._keep_punctuation_attached:
+            tokenized_word = _reattach_punctuation(tokenized_word)
+
+        return tuple(tokenized_word.split())
+
+
+def get_word_tokenizer(language: str, default_to_tercom: bool = False,
+                       keep_punctuation_attached: bool = False) -> WordTokenizer:
+    """
+    Returns a WordTokenizer shared by all callers with the same arguments.
+    """
+    if language in EAST_ASIAN_LANGUAGE_CODES:
+        default_to_tercom = False  # no effect
+
+    return _create_word_tokenizer(language, default_to_tercom, keep_punctuation_attached)
+
+
+@functools.lru_cache(maxsize=None)
+def _create_word_tokenizer(language: str, default_to_tercom: bool, keep_punctuation_attached: bool) -> WordTokenizer:
+    return WordTokenizer(
+        language, default_to_tercom=default_to_tercom, keep_punctuation_attached=keep_punctuation_attached)
+
+
+def tokenize_segment_words(segments: List[Segment], language: str,
+                           keep_punctuation_attached: bool = False) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Splits the words of all 'segments' into tokens like reversibly_tokenize_segments(), but without creating new
+    segments. Returns the flat list of all tokens (without space escape characters), for each token the index of the
+    word it originates from in the flat list of all words, and the number of tokens per segment. Use
+    regroup_tokens_into_words() to map tokens back to words.
+    """
+    word_tokenizer = get_word_tokenizer(language, keep_punctuation_attached=keep_punctuation_attached)
+
+    all_tokens = []
+    word_indices = []
+    num_tokens_per_segment = []
+    word_index = 0
+
+    for segment in segments:
+        num_previous_tokens = len(all_tokens)
+
+        for word in segment.word_list:
+            assert word, "Words must not be empty."
+
+            tokens = word_tokenizer(word.string)
+            assert tokens, "Tokenizer deleted word."
+
+            all_tokens += tokens
+            word_indices += [word_index] * len(tokens)
+            word_index += 1
+
+        num_tokens_per_segment.append(len(all_tokens) - num_previous_tokens)
+
+    return all_tokens, word_indices, num_tokens_per_segment
+
+
+def regroup_tokens_into_words(token_positions: List[int], tokens: List[str], word_indices: List[int],
+                              words: List[Word]) -> List[Word]:
+    """
+    Inverse of tokenize_segment_words() for the subset of 'tokens' given by (increasing) 'token_positions'. Tokens are
+    grouped exactly as by detokenize_segments(): a new word starts at each token that is the first token of its source
+    word, all other tokens are appended to the previous token. Note, that this merges tokens of different words if the
+    alignment interleaves them, e.g. for hypothesis subtitles overlapping in time. If a group consists of all tokens of
+    a single word, the original Word object is returned, otherwise a copy of the word of the last token holding the
+    joined token strings. The line break is kept only if the group ends with the last token of a word.
+    """
+    def is_first_token_of_word(position):
+        return position == 0 or word_indices[position - 1] != word_indices[position]
+
+    regrouped_words = []
+    group_start = 0
+
+    for group_end in range(1, len(token_positions) + 1):
+        if group_end < len(token_positions) and not is_first_token_of_word(token_positions[group_end]):
+            continue
+
+        first_position = token_positions[group_start]
+        last_position = token_positions[group_end - 1]
+        word_index = word_indices[last_position]
+        word = words[word_index]
+
+        includes_last_token = last_position == len(tokens) - 1 or word_indices[last_position + 1] != word_index
+        # A contiguous range from the first token of a word to the last token of a word, with no other word starting
+        # within, covers exactly one word.
+        is_complete_word = (is_first_token_of_word(first_position) and includes_last_token
+                            and last_position - first_position == group_end - group_start - 1)
+
+        if is_complete_word:
+            regrouped_words.append(word)
+        else:
+            regrouped_words.append(dataclasses.replace(
+                word,
+                string="".join(tokens[position] for position in token_positions[group_start:group_end]),
+                line_break=word.line_break if includes_last_token else LineBreak.NONE))
+
+        group_start = group_end
+
+    return regrouped_words
+
+
 def reversibly_tokenize_segments(
         segments: List[Segment], language: str, keep_punctuation_attached: bool = False) -> List[Segment]:
     """
@@ -49,23 +189,18 @@ def reversibly_tokenize_segments(
     punctuation tokens.
     """
 
-    tokenizer = get_sacrebleu_tokenizer(language)
+    word_tokenizer = get_word_tokenizer(language, keep_punctuation_attached=keep_punctuation_attached)
 
-    if keep_punctuation_attached:
-        tokenize_function = lambda string: _reattach_punctuation(tokenizer(string))
-    else:
-        tokenize_function = tokenizer
-
-    tokenized_segments = []
+    all_token_attributes = []
     words_are_timed = None
 
     for segment in segments:
-        tokenized_word_list = []
+        token_attributes = []
 
         for word in segment.word_list:
             assert word, "Words must not be empty."
 
-            tokens = tokenize_function(word.string).split()
+            tokens = word_tokenizer(word.string)
             assert tokens, "Tokenizer deleted word."
 
             for token_index, token in enumerate(tokens):
@@ -79,26 +214,18 @@ def reversibly_tokenize_segments(
                 if isinstance(word, TimedWord):
                     assert words_are_timed is None or words_are_timed, "Either all or no words must be timed."
                     words_are_timed = True
-
-                    tokenized_word_list.append(
-                        TimedWord(string=token, line_break=line_break,
-                                  subtitle_start_time=segment.start_time, subtitle_end_time=segment.end_time))
                 else:
                     assert not words_are_timed, "Either all or no words must be timed."
                     words_are_timed = False
-                    tokenized_word_list.append(Word(string=token, line_break=line_break))
 
-        if isinstance(segment, Subtitle):
-            if words_are_timed:
-                set_approximate_word_times(tokenized_word_list, segment.start_time, segment.end_time)
-            tokenized_segment = Subtitle(word_list=tokenized_word_list, index=segment.index,
-                                         start_time=segment.start_time, end_time=segment.end_time)
-        else:
-            tokenized_segment = Segment(word_list=tokenized_word_list)
+                if words_are_timed:
+                    token_attributes.append((token, line_break, segment.start_time, segment.end_time))
+                else:
+                    token_attributes.append((token, line_break, None, None))
 
-        tokenized_segments.append(tokenized_segment)
+        all_token_attributes.append(token_attributes)
 
-    return tokenized_segments
+    return _create_segments(segments, all_token_attributes, words_are_timed)
 
 
 def detokenize_segments(segments: List[Segment]) -> List[Segment]:
@@ -106,31 +233,24 @@ def detokenize_segments(segments: List[Segment]) -> List[Segment]:
     Inverse of 'reversibly_tokenize_segments()'.
     """
 
-    def add_word(current_tokens: List[str], detokenized_word_list: List[Word], words_are_timed: bool,
-                 current_line_break: LineBreak, current_subtitle_start_time: Optional[float],
-                 current_subtitle_end_time: Optional[float]):
+    def add_word(current_tokens: List[str], detokenized_word_attributes: List[tuple], current_line_break: LineBreak,
+                 current_subtitle_start_time: Optional[float], current_subtitle_end_time: Optional[float]):
         """
-        Helper function. Joins 'current_tokens' into a word and appends to 'detokenized_word_list'. Clears
-        'current_tokens' afterwards.
+        Helper function. Joins 'current_tokens' into a word string and appends it together with the other word
+        attributes to 'detokenized_word_attributes'. Clears 'current_tokens' afterwards.
         """
         if not current_tokens:
             return
 
-        detokenized_word_string = "".join(current_tokens)
-        if words_are_timed:
-            detokenized_word = TimedWord(
-                string=detokenized_word_string, line_break=current_line_break,
-                subtitle_start_time=current_subtitle_start_time, subtitle_end_time=current_subtitle_end_time)
-        else:
-            detokenized_word = Word(string=detokenized_word_string, line_break=current_line_break)
-        detokenized_word_list.append(detokenized_word)
+        detokenized_word_attributes.append(
+            ("".join(current_tokens), current_line_break, current_subtitle_start_time, current_subtitle_end_time))
         current_tokens.clear()
 
-    detokenized_segments = []
+    all_detokenized_word_attributes = []
     words_are_timed = None
 
     for segment in segments:
-        detokenized_word_list = []
+        detokenized_word_attributes = []
 
         current_tokens = []
         current_line_break = LineBreak.NONE
@@ -152,8 +272,8 @@ def detokenize_segments(segments: List[Segment]) -> List[Segment]:
                 token_string = token_string[1:]  # strip space escape character
 
                 # Flush the previous word if there is one.
-                add_word(current_tokens, detokenized_word_list, words_are_timed, current_line_break,
-                         current_subtitle_start_time, current_subtitle_end_time)
+                add_word(current_tokens, detokenized_word_attributes, current_line_break, current_subtitle_start_time,
+                         current_subtitle_end_time)
 
             current_tokens.append(token_string)
             current_line_break = token.line_break
@@ -162,20 +282,67 @@ def detokenize_segments(segments: List[Segment]) -> List[Segment]:
                 current_subtitle_end_time = token.subtitle_end_time
 
         # Flush remaining tokens.
-        add_word(current_tokens, detokenized_word_list, words_are_timed, current_line_break,
-                 current_subtitle_start_time, current_subtitle_end_time)
+        add_word(current_tokens, detokenized_word_attributes, current_line_break, current_subtitle_start_time,
+                 current_subtitle_end_time)
+
+        all_detokenized_word_attributes.append(detokenized_word_attributes)
+
+    return _create_segments(segments, all_detokenized_word_attributes, words_are_timed)
 
+
+def _create_segments(segments: List[Segment], all_word_attributes: List[List[tuple]],
+                     words_are_timed: Optional[bool]) -> List[Segment]:
+    """
+    Helper function. Creates new segments of the same type as 'segments' with word lists given by 'all_word_attributes',
+    which contains a list of (string, line_break, subtitle_start_time, subtitle_end_time) tuples for each segment.
+    Approximate times of timed words in Subtitles are computed for all subtitles at once.
+    """
+    if words_are_timed:
+        subtitles_and_word_attributes = [
+            (segment, word_attributes) for segment, word_attributes in zip(segments, all_word_attributes)
+            if isinstance(segment, Subtitle)]
+        approximate_word_times = get_approximate_word_times(
+            [subtitle.start_time for subtitle, _ in subtitles_and_word_attributes],
+            [subtitle.end_time for subtitle, _ in subtitles_and_word_attributes],
+            [len(word_attributes) for _, word_attributes in subtitles_and_word_attributes])
+
+    output_segments = []
+    word_position = 0
+
+    for segment, word_attributes in zip(segments, all_word_attributes):
         if isinstance(segment, Subtitle):
             if words_are_timed:
-                set_approximate_word_times(detokenized_word_list, segment.start_time, segment.end_time)
-            detokenized_segment = Subtitle(word_list=detokenized_word_list, index=segment.index,
-                                           start_time=segment.start_time, end_time=segment.end_time)
+                word_times = approximate_word_times[word_position:word_position + len(word_attributes)]
+                word_position += len(word_attributes)
+                word_list = _create_timed_words(word_attributes, word_times)
+            else:
+                word_list = _create_words(word_attributes)
+
+            output_segment = Subtitle(word_list=word_list, index=segment.index, start_time=segment.start_time,
+                                      end_time=segment.end_time)
         else:
-            detokenized_segment = Segment(word_list=detokenized_word_list)
+            if words_are_timed:
+                word_list = _create_timed_words(word_attributes, [None] * len(word_attributes))
+            else:
+                word_list = _create_words(word_attributes)
+
+            output_segment = Segment(word_list=word_list)
+
+        output_segments.append(output_segment)
 
-        detokenized_segments.append(detokenized_segment)
+    return output_segments
 
-    return detokenized_segments
+
+def _create_timed_words(word_attributes: List[tuple], approximate_word_times: List[Optional[float]]) -> List[TimedWord]:
+    return [
+        TimedWord(string=string, line_break=line_break, subtitle_start_time=subtitle_start_time,
+                  subtitle_end_time=subtitle_end_time, approximate_word_time=approximate_word_time)
+        for (string, line_break, subtitle_start_time, subtitle_end_time), approximate_word_time in zip(
+            word_attributes, approximate_word_times)]
+
+
+def _create_words(word_attributes: List[tuple]) -> List[Word]:
+    return [Word(string=string, line_break=line_break) for string, line_break, _, _ in word_attributes]
 
 
 def _reattach_punctuation(word: str) -> str:
@@ -185,6 +352,8 @@ def _reattach_punctuation(word: str) -> str:
     that tokens consisting of punctuation characters only get attached to the token to their left, except for leading
     punctuation which gets attached right.
     """
+    import regex
+
     word = regex.sub(r" (\p{P}+)(?= |$)", r"\1", word)
     # Now the only possible punctuation token remaining should be at start of the string, remove space after it.
     word = regex.sub(r"^(\p{P}+) ", r"\1", word)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from suber.__main__ import create_argument_parser
+from suber.scoring_daemon import ScoringService
+
+# Manifest fields that contain lists, given as whitespace-separated values in TSV manifests.
+_LIST_FIELDS = {"hypothesis", "reference", "metrics"}
+
+# 'suber' options that contain file or directory names.
+_PATH_FIELDS = ["hypothesis", "reference", "input_cache_dir", "result_cache_dir", "checkpoint_file"]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Scores many independent hypothesis-reference pairs, e.g. different systems or test sets, in a "
+                    "single call. Any additional arguments are passed to 'suber' for all entries, e.g. "
+                    "'--metrics SubER BLEU', and can be overridden per entry in the manifest. Flags are turned off "
+                    "for an entry by setting them to false.")
+    parser.add_argument("-i", "--manifest", required=True,
+                        help="JSONL file with one object per entry, or TSV file with a header row. Fields are 'id', "
+                             "'hypothesis', 'reference' and optionally any other 'suber' option, e.g. 'metrics', "
+                             "'language', 'hypothesis_format', 'reference_format'. In TSV files, multiple files or "
+                             "metrics are separated by whitespace. Relative file names are relative to the manifest, "
+                             "those in additional arguments relative to the current directory.")
+    parser.add_argument("-o", "--output-file", required=True,
+                        help="JSONL output file. Contains one line per entry with the 'id' and the 'results', same as "
+                             "the output of 'suber', or an 'error'. Lines are written as soon as the entry is scored, "
+                             "so not in manifest order. If the file exists, entries already scored successfully are "
+                             "skipped, which allows to resume interrupted jobs.")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes scoring entries in parallel.")
+
+    return parser.parse_known_args()
+
+
+def main():
+    args, suber_arguments = parse_arguments()
+
+    entries = read_manifest(args.manifest, default_arguments=suber_arguments)
+
+    completed_ids = read_completed_ids(args.output_file)
+
+    score_entries([entry for entry in entries if entry[0] not in completed_ids], args.output_file,
+                  num_workers=args.jobs)
+
+
+def read_manifest(manifest_file: str, default_arguments: List[str] = ()) -> List[Tuple[str, argparse.Namespace]]:
+    """
+    Returns the id and the parsed 'suber' arguments of each manifest entry.
+    """
+    manifest_directory = os.path.dirname(os.path.abspath(manifest_file))
+    argument_parser = create_argument_parser()
+
+    entries = []
+    entry_ids = set()
+
+    for entry in _iterate_manifest_entries(manifest_file):
+        entry = {field.replace("-", "_"): value for field, value in entry.items()}
+        entry_id = str(entry.pop("id", ""))
+        if not entry_id:
+            raise ValueError(f"Manifest entry without 'id': {entry}")
+        if entry_id in entry_ids:
+            raise ValueError(f"Duplicate manifest entry id '{entry_id}'.")
+        entry_ids.add(entry_id)
+
+        try:
+            args = argument_parser.parse_args(list(default_arguments) + _entry_to_command_line(entry))
+        except SystemExit as e:  # argparse has already printed the reason
+            raise ValueError(f"Invalid manifest entry '{entry_id}'.") from e
+
+        # Flags cannot be turned off on the command line, so apply false values of the entry afterwards.
+        for field, value in entry.items():
+            if value is False:
+                if not hasattr(args, field):
+                    raise ValueError(f"Invalid manifest entry '{entry_id}': unknown option '{field}'.")
+                setattr(args, field, False)
+
+        # Workers may run in a different working directory.
+        for field in _PATH_FIELDS:
+            base_directory = manifest_directory if field in entry else os.getcwd()
+            value = getattr(args, field)
+            if isinstance(value, list):
+                setattr(args, field, [os.path.join(base_directory, file_name) for file_name in value])
+            elif value is not None:
+                setattr(args, field, os.path.join(base_directory, value))
+
+        entries.append((entry_id, args))
+
+    return entries
+
+
+def read_completed_ids(output_file: str) -> Set[str]:
+    """
+    Returns the ids of the entries with results in an existing output file.
+    """
+    if not os.path.exists(output_file):
+        return set()
+
+    completed_ids = set()
+    with open(output_file, encoding="utf-8") as output_file_object:
+        for line in output_file_object:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # last line of an interrupted job may be incomplete, see score_entries()
+            if "results" in result:
+                completed_ids.add(result["id"])
+
+    return completed_ids
+
+
+def score_entries(entries: List[Tuple[str, argparse.Namespace]], output_file: str, num_workers: int = 1):
+    """
+    Scores all entries and appends one result line per entry to 'output_file' as soon as it is available.
+    """
+    # Remove an incomplete last line written by an interrupted job.
+    if os.path.exists(output_file):
+        with open(output_file, "rb+") as output_file_object:
+            content = output_file_object.read()
+            if content and not content.endswith(b"\n"):
+                output_file_object.truncate(content.rfind(b"\n") + 1)
+
+    with open(output_file, "a", encoding="utf-8") as output_file_object:
+        for entry_id, output, error in _iterate_entry_outputs(entries, num_workers):
+            if error is None:
+                result = OrderedDict([("id", entry_id), ("results", json.loads(output, object_pairs_hook=OrderedDict))])
+            else:
+                result = OrderedDict([("id", entry_id), ("error", error)])
+                print(f"Scoring '{entry_id}' failed: {error}", file=sys.stderr)
+
+            output_file_object.write(json.dumps(result) + "\n")
+            output_file_object.flush()
+
+
+def _iterate_entry_outputs(entries: List[Tuple[str, argparse.Namespace]],
+                           num_workers: int) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    if num_workers <= 1 or len(entries) < 2:
+        _initialize_worker()
+        yield from map(_score_entry, entries)
+        return
+
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, initializer=_initialize_worker) as executor:
+        futures = [executor.submit(_score_entry, entry) for entry in entries]
+
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+_worker_scoring_service: Optional[ScoringService] = None
+
+
+def _initialize_worker():
+    # Keeps imports, tokenizers and references warm across all entries scored in this process.
+    global _worker_scoring_service
+    _worker_scoring_service = ScoringService()
+
+
+def _score_entry(entry: Tuple[str, argparse.Namespace]) -> Tuple[str, Optional[str], Optional[str]]:
+    entry_id, args = entry
+    try:
+        return entry_id, _worker_scoring_service.score(vars(args)), None
+    except Exception as e:
+        return entry_id, None, f"{type(e).__name__}: {e}"
+
+
+def _iterate_manifest_entries(manifest_file: str) -> Iterator[Dict[str, Any]]:
+    with open(manifest_file, encoding="utf-8", newline="") as manifest_file_object:
+        if manifest_file.endswith(".tsv"):
+            for row in csv.DictReader(manifest_file_object, delimiter="\t"):
+                yield {field: _parse_tsv_value(field, value) for field, value in row.items() if value}
+        else:
+            for line in manifest_file_object:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _parse_tsv_value(field: str, value: str) -> Any:
+    if field in _LIST_FIELDS:
+        return value.split()
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"  # flags, e.g. 'suber_statistics'
+    return value
+
+
+def _entry_to_command_line(entry: Dict[str, Any]) -> List[str]:
+    command_line = []
+    for field, value in entry.items():
+        option = "--" + field.replace("_", "-")
+        if value is True:
+            command_line.append(option)
+        elif value is None or value is False:
+            continue
+        elif isinstance(value, list):
+            command_line += [option] + [str(item) for item in value]
+        else:
+            command_line += [option, str(value)]
+
+    return command_line
+
+
+if __name__ == "__main__":
+    main()
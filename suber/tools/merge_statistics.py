@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+
+from suber.metrics.metric_statistics import get_results_from_statistics, merge_statistics_outputs
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Merges metric statistics created with 'suber --emit-stats' for different parts of a test set. "
+                    "Outputs the same scores as running 'suber' on all hypothesis and reference files at once.")
+    parser.add_argument("-i", "--input-files", required=True, nargs="+",
+                        help="The statistics files to merge, i.e. the JSON outputs of 'suber --emit-stats'.")
+    parser.add_argument("--emit-stats", action="store_true",
+                        help="If set, outputs the merged statistics instead of the scores, such that they can be "
+                             "merged again later.")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    statistics_outputs = []
+    for input_file in args.input_files:
+        with open(input_file, encoding="utf-8") as input_file_object:
+            statistics_outputs.append(json.load(input_file_object))
+
+    merged_statistics = merge_statistics_outputs(statistics_outputs)
+
+    if args.emit_stats:
+        results = merged_statistics
+    else:
+        results = get_results_from_statistics(merged_statistics["metrics"], language=merged_statistics["language"])
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
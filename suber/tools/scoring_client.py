@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import os
+
+from suber.__main__ import create_argument_parser, create_output
+from suber.scoring_daemon import DEFAULT_SOCKET_PATH, request_scoring
+
+
+def parse_arguments():
+    parser = create_argument_parser()
+    parser.description = ("Same as 'suber', but lets a running 'suber-server' daemon do the scoring. Falls back to "
+                          "scoring in this process if no daemon is running.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="The Unix socket the daemon listens on.")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    socket_path = args.socket
+    del args.socket
+
+    # The daemon runs in a different working directory.
+    args.hypothesis = [os.path.abspath(file_name) for file_name in args.hypothesis]
+    args.reference = [os.path.abspath(file_name) for file_name in args.reference]
+    for path_argument in ["input_cache_dir", "result_cache_dir", "checkpoint_file"]:
+        if getattr(args, path_argument) is not None:
+            setattr(args, path_argument, os.path.abspath(getattr(args, path_argument)))
+
+    output = request_scoring(vars(args), socket_path)
+    if output is None:
+        output = create_output(args)
+
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
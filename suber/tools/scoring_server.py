@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+import argparse
+
+from suber.scoring_daemon import DEFAULT_SOCKET_PATH, serve
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Runs a scoring daemon which keeps tokenizers and parsed references in memory. Send requests with "
+                    "'suber-client', which takes the same arguments as 'suber'.")
+    parser.add_argument("-s", "--socket", default=DEFAULT_SOCKET_PATH, help="The Unix socket to listen on.")
+    parser.add_argument("--max-cached-references", type=int, default=16,
+                        help="Number of most recently used reference files kept in memory.")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    serve(args.socket, max_cached_references=args.max_cached_references)
+
+
+if __name__ == "__main__":
+    main()
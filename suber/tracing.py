@@ -0,0 +1,51 @@
+"""
+Hooks to observe the internals of a SubER computation, e.g. to forward them to a telemetry system when embedding SubER
+in a service. Derive from TracingHooks, override the events of interest and pass an instance as 'tracing_hooks' to
+read_input_file(), calculate_SubER(), lib_ter.translation_edit_rate(), the hypothesis to reference alignment functions
+or MetricCalculator. All hook calls are guarded by a check for None, so there is no overhead if no hooks are given.
+
+Hooks are called synchronously from the computation, so they should return quickly. If metrics are computed in
+parallel worker processes, the hooks are called on copies of the object in these processes.
+"""
+
+
+class TracingHooks:
+    """
+    Base class of tracing hooks, all events are ignored by default.
+    """
+
+    def file_read(self, file_name: str, file_format: str, num_bytes: int, num_segments: int, duration: float):
+        """
+        An input file was read, or loaded from the parsed file cache, in 'duration' seconds.
+        """
+
+    def part_started(self, part_index: int, num_hypothesis_subtitles: int, num_reference_subtitles: int):
+        """
+        SubER computation of an independent part (see 'suber.metrics.suber') started.
+        """
+
+    def part_finished(self, part_index: int, num_edits: int, reference_length: int):
+        """
+        SubER computation of a part finished, 'reference_length' is the number of reference words including breaks.
+        """
+
+    def shift_iteration(self, num_shifts: int, num_checked_candidates: int):
+        """
+        TER found and applied one more shift, 'num_shifts' is the number of shifts so far.
+        """
+
+    def dp_pass(self, num_computed_cells: int, cache_hit_depth: int, num_hypothesis_words: int):
+        """
+        One edit distance computation of the beam-limited dynamic programming in lib_ter finished. 'cache_hit_depth' is
+        the number of matrix rows reused from the prefix cache, 'num_computed_cells' the number of computed cells.
+        """
+
+    def alignment_started(self, method: str, num_hypothesis_segments: int, num_reference_segments: int):
+        """
+        Hypothesis to reference alignment started, 'method' is "levenshtein" or "time".
+        """
+
+    def alignment_finished(self, method: str, num_aligned_segments: int, duration: float):
+        """
+        Hypothesis to reference alignment finished after 'duration' seconds.
+        """
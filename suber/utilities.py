@@ -1,8 +1,10 @@
+import gc
 import numpy
-from typing import List
+from contextlib import contextmanager
+from typing import List, Sequence
 
 from suber.constants import END_OF_LINE_SYMBOL, END_OF_BLOCK_SYMBOL, MASK_SYMBOL
-from suber.data_types import LineBreak, Segment, TimedWord
+from suber.data_types import LineBreak, Segment
 
 
 def segment_to_string(segment: Segment, include_line_breaks=False, include_last_break=True,
@@ -41,20 +43,55 @@ def get_segment_to_string_opts_from_metric(metric: str):
     return include_breaks, mask_words, metric
 
 
-def set_approximate_word_times(word_list: List[TimedWord], subtitle_start_time: float, subtitle_end_time: float):
+def get_approximate_word_times(subtitle_start_times: Sequence[float], subtitle_end_times: Sequence[float],
+                               num_words_per_subtitle: Sequence[int]) -> List[float]:
     """
     Linearly interpolates word times from the subtitle start and end time as described in
     https://www.isca-archive.org/interspeech_2021/cherry21_interspeech.pdf
+    Computes the times of all words of many subtitles at once and returns them as one flat list. The result is identical
+    to calling numpy.linspace() for each subtitle separately.
     """
+    num_words_per_subtitle = numpy.asarray(num_words_per_subtitle, dtype=numpy.int64)
+    has_words = num_words_per_subtitle > 0
+
     # Remove small margin to guarantee the first and last word will always be counted as within the subtitle.
     epsilon = 1e-8
-    subtitle_start_time = subtitle_start_time + epsilon
-    subtitle_end_time = subtitle_end_time - epsilon
+    subtitle_start_times = numpy.asarray(subtitle_start_times, dtype=float)[has_words] + epsilon
+    subtitle_end_times = numpy.asarray(subtitle_end_times, dtype=float)[has_words] - epsilon
+    num_words_per_subtitle = num_words_per_subtitle[has_words]
+
+    durations = subtitle_end_times - subtitle_start_times
+    assert (durations >= 0).all()
+
+    # Same arithmetic as numpy.linspace(): position * step + start, and the last word exactly at the end. For a single
+    # word the step is irrelevant, it is placed at the start.
+    steps = durations / numpy.maximum(num_words_per_subtitle - 1, 1)
+    subtitle_end_positions = numpy.cumsum(num_words_per_subtitle)
+    subtitle_start_positions = subtitle_end_positions - num_words_per_subtitle
+    word_positions = (numpy.arange(subtitle_end_positions[-1] if len(subtitle_end_positions) else 0)
+                      - numpy.repeat(subtitle_start_positions, num_words_per_subtitle))
+
+    approximate_word_times = (word_positions.astype(float) * numpy.repeat(steps, num_words_per_subtitle)
+                              + numpy.repeat(subtitle_start_times, num_words_per_subtitle))
 
-    num_words = len(word_list)
-    duration = subtitle_end_time - subtitle_start_time
-    assert duration >= 0
+    has_multiple_words = num_words_per_subtitle > 1
+    approximate_word_times[subtitle_end_positions[has_multiple_words] - 1] = subtitle_end_times[has_multiple_words]
 
-    approximate_word_times = numpy.linspace(start=subtitle_start_time, stop=subtitle_end_time, num=num_words)
-    for word_time, word in zip(approximate_word_times, word_list):
-        word.approximate_word_time = word_time
+    # Converted to Python floats, numpy scalars are slow in arithmetic and pickling.
+    return approximate_word_times.tolist()
+
+
+@contextmanager
+def paused_garbage_collection():
+    """
+    Reading files creates millions of small objects for large inputs, none of them part of reference cycles. Python's
+    cyclic garbage collector would nevertheless repeatedly traverse all of them, which makes up the majority of the
+    reading time for big files. We therefore pause it while building (or unpickling) full lists of segments.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
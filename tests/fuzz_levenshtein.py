@@ -21,7 +21,7 @@ for i in range(100000):
     s2 = ''.join(random.choice(string.ascii_uppercase + string.digits) for _ in range(N2))
 
     distance_rapidfuzz = Levenshtein.distance(s1, s2)
-    distance = lib_levenshtein.distance(s1, s2)
+    distance = lib_levenshtein.distance(s1, s2, backend="python")
     assert distance == distance_rapidfuzz, (s1, s2, distance, distance_rapidfuzz, i)
     num_editops = len(lib_levenshtein.editops(s1, s2))
     assert distance == num_editops, (s1, s2, distance, num_editops, i)
@@ -0,0 +1,131 @@
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+import suber
+from suber.__main__ import create_argument_parser, create_output
+from suber.tools.batch_scoring import read_manifest
+from .utilities import HYPOTHESIS_SRT, REFERENCE_SRT, write_temporary_file
+
+
+class BatchScoringTests(unittest.TestCase):
+    def setUp(self):
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temporary_directory.cleanup)
+
+        write_temporary_file(self._temporary_directory.name, REFERENCE_SRT, "reference.srt")
+        write_temporary_file(self._temporary_directory.name, HYPOTHESIS_SRT, "hypothesis1.srt")
+        write_temporary_file(self._temporary_directory.name, """
+            1
+            00:00:00,000 --> 00:00:02,000
+            This is the first frame,
+            another one has two lines.""", "hypothesis2.srt")
+
+    def _get_expected_results(self, hypothesis_file, metrics):
+        args = create_argument_parser().parse_args(
+            ["-H", os.path.join(self._temporary_directory.name, hypothesis_file),
+             "-R", os.path.join(self._temporary_directory.name, "reference.srt"), "--metrics"] + metrics)
+        return json.loads(create_output(args))
+
+    def _run_batch_scoring(self, manifest_file, output_file):
+        subprocess.run(
+            ["python3", "-m", "suber.tools.batch_scoring", "--manifest", manifest_file, "--output-file", output_file,
+             "--jobs", "2", "--metrics", "SubER", "t-BLEU"],
+            check=True, stderr=subprocess.PIPE,
+            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(suber.__file__))))
+
+        with open(output_file, encoding="utf-8") as output_file_object:
+            return [json.loads(line) for line in output_file_object]
+
+    def test_batch_scoring(self):
+        manifest_file = write_temporary_file(
+            self._temporary_directory.name,
+            '{"id": "system1", "hypothesis": "hypothesis1.srt", "reference": "reference.srt"}\n'
+            '{"id": "system2", "hypothesis": ["hypothesis2.srt"], "reference": ["reference.srt"]}\n'
+            '{"id": "system1-t", "hypothesis": "hypothesis1.srt", "reference": "reference.srt", '
+            '"metrics": ["t-WER", "TER"]}\n'
+            # Requires same number of subtitles.
+            '{"id": "system2-WER", "hypothesis": "hypothesis2.srt", "reference": "reference.srt", '
+            '"metrics": ["WER"]}\n',
+            "manifest.jsonl")
+        output_file = os.path.join(self._temporary_directory.name, "results.jsonl")
+
+        expected_results = {
+            "system1": self._get_expected_results("hypothesis1.srt", ["SubER", "t-BLEU"]),
+            "system2": self._get_expected_results("hypothesis2.srt", ["SubER", "t-BLEU"]),
+            "system1-t": self._get_expected_results("hypothesis1.srt", ["t-WER", "TER"]),
+        }
+
+        results = self._run_batch_scoring(manifest_file, output_file)
+
+        self.assertEqual({result["id"]: result["results"] for result in results if "results" in result},
+                         expected_results)
+        self.assertEqual([result["id"] for result in results if "error" in result], ["system2-WER"])
+
+        # Simulate an interrupted job: only the first line was written completely.
+        with open(output_file, encoding="utf-8") as output_file_object:
+            lines = output_file_object.readlines()
+        with open(output_file, "w", encoding="utf-8") as output_file_object:
+            output_file_object.write(lines[0] + lines[1][:10])
+
+        results = self._run_batch_scoring(manifest_file, output_file)
+
+        # First line kept, incomplete line removed, each other entry scored exactly once again.
+        self.assertEqual(json.loads(lines[0]), results[0])
+        self.assertEqual(sorted(result["id"] for result in results[1:]),
+                         sorted({"system1", "system2", "system1-t", "system2-WER"} - {results[0]["id"]}))
+
+    def test_tsv_manifest(self):
+        manifest_file = write_temporary_file(
+            self._temporary_directory.name,
+            "id\thypothesis\treference\tmetrics\tsuber_statistics\n"
+            "system1\thypothesis1.srt\treference.srt\tSubER BLEU\ttrue\n"
+            "system2\thypothesis2.srt\treference.srt\t\tfalse\n",
+            "manifest.tsv")
+
+        entries = read_manifest(manifest_file, default_arguments=["--metrics", "TER"])
+
+        self.assertEqual([entry_id for entry_id, _ in entries], ["system1", "system2"])
+        self.assertEqual(entries[0][1].metrics, ["SubER", "BLEU"])
+        self.assertTrue(entries[0][1].suber_statistics)
+        self.assertEqual(entries[1][1].metrics, ["TER"])
+        self.assertFalse(entries[1][1].suber_statistics)
+        self.assertEqual(entries[1][1].hypothesis, [os.path.join(self._temporary_directory.name, "hypothesis2.srt")])
+
+    def test_manifest_overrides_and_paths(self):
+        manifest_directory = os.path.join(self._temporary_directory.name, "manifests")
+        os.mkdir(manifest_directory)
+        manifest_file = write_temporary_file(
+            manifest_directory,
+            '{"id": "system1", "hypothesis": "hypothesis1.srt", "reference": "reference.srt", '
+            '"checkpoint_file": "checkpoint.jsonl", "input-cache-dir": "cache"}\n'
+            '{"id": "system2", "hypothesis": "hypothesis2.srt", "reference": "reference.srt", '
+            '"suber_statistics": false}\n',
+            "manifest.jsonl")
+
+        entries = read_manifest(
+            manifest_file, default_arguments=["--suber-statistics", "--checkpoint-file", "default_checkpoint.jsonl"])
+
+        # File names in the manifest are relative to it, those in the default arguments to the working directory.
+        self.assertEqual(entries[0][1].checkpoint_file, os.path.join(manifest_directory, "checkpoint.jsonl"))
+        self.assertEqual(entries[0][1].input_cache_dir, os.path.join(manifest_directory, "cache"))
+        self.assertIsNone(entries[0][1].result_cache_dir)
+        self.assertEqual(entries[1][1].checkpoint_file, os.path.join(os.getcwd(), "default_checkpoint.jsonl"))
+        self.assertIsNone(entries[1][1].input_cache_dir)
+
+        # Flag given as default argument, turned off for the second entry.
+        self.assertTrue(entries[0][1].suber_statistics)
+        self.assertFalse(entries[1][1].suber_statistics)
+
+        write_temporary_file(
+            manifest_directory,
+            '{"id": "system1", "hypothesis": "hypothesis1.srt", "reference": "reference.srt", "unknown": false}\n',
+            "manifest.jsonl")
+        with self.assertRaises(ValueError):
+            read_manifest(manifest_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import dataclasses
+import pickle
+import unittest
+
+from suber.data_types import LineBreak, Word, TimedWord, Subtitle
+
+
+class DataTypesTests(unittest.TestCase):
+    def test_immutable(self):
+        word = TimedWord(string="word", subtitle_start_time=0.0, subtitle_end_time=1.0, approximate_word_time=0.5)
+        subtitle = Subtitle(word_list=[word], index=1, start_time=0.0, end_time=1.0)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            word.approximate_word_time = 0.7
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            subtitle.start_time = 0.1
+
+        self.assertFalse(hasattr(word, "__dict__"))
+        self.assertFalse(hasattr(subtitle, "__dict__"))
+
+    def test_hash(self):
+        word = TimedWord(string="word", line_break=LineBreak.END_OF_LINE, subtitle_start_time=0.0,
+                         subtitle_end_time=1.0, approximate_word_time=0.5)
+        same_word = TimedWord(string="word", line_break=LineBreak.END_OF_LINE, subtitle_start_time=0.0,
+                              subtitle_end_time=1.0, approximate_word_time=0.5)
+        other_word = dataclasses.replace(word, approximate_word_time=0.6)
+
+        self.assertEqual(word, same_word)
+        self.assertEqual(hash(word), hash(same_word))
+        self.assertEqual(hash(word), hash(word))  # cached
+        self.assertNotEqual(word, other_word)
+        self.assertEqual(other_word.approximate_word_time, 0.6)
+
+        self.assertEqual(hash(Word(string="word")), hash(Word(string="word")))
+        self.assertNotEqual(Word(string="word"), TimedWord(string="word"))
+
+    def test_pickle(self):
+        word = TimedWord(string="word", subtitle_start_time=0.0, subtitle_end_time=1.0, approximate_word_time=0.5)
+        hash(word)
+
+        unpickled_word = pickle.loads(pickle.dumps(word))
+        self.assertEqual(unpickled_word, word)
+        self.assertEqual(hash(unpickled_word), hash(word))
+
+        subtitle = Subtitle(word_list=[word], index=1, start_time=0.0, end_time=1.0)
+        self.assertEqual(pickle.loads(pickle.dumps(subtitle)), subtitle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import gc
+import tempfile
 import unittest
 
 from suber.data_types import LineBreak
-from suber.file_readers.srt_file_reader import SRTFormatError
+from suber.file_readers import iterate_input_file
+from suber.file_readers.srt_file_reader import SRTFileReader, SRTFormatError
 from .utilities import create_temporary_file_and_read_it
 
 
@@ -29,6 +32,19 @@ class PlainFileReaderTests(unittest.TestCase):
         self.assertEqual(segments[1].word_list[-1].line_break, LineBreak.END_OF_BLOCK)
 
 
+    def test_garbage_collection_restored(self):
+        self.assertTrue(gc.isenabled())
+        create_temporary_file_and_read_it("This is a line.", file_format="plain")
+        self.assertTrue(gc.isenabled())
+
+        gc.disable()
+        try:
+            create_temporary_file_and_read_it("This is a line.", file_format="plain")
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+
 class SRTFileReaderTests(unittest.TestCase):
     def test_empty_file(self):
         subtitles = create_temporary_file_and_read_it("")
@@ -81,6 +97,84 @@ class SRTFileReaderTests(unittest.TestCase):
         with self.assertRaises(SRTFormatError):
             create_temporary_file_and_read_it(file_content)
 
+    def test_iterate_lazily(self):
+        file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame.
+
+            2
+            00:00:01,000 --> 00:00:02,000
+            This is another frame
+            having two lines.
+
+            3
+            This is not a valid subtitle."""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".srt") as temporary_file:
+            temporary_file.write(file_content)
+            temporary_file.flush()
+
+            subtitle_iterator = iterate_input_file(temporary_file.name, file_format="SRT")
+
+            # Subtitles before the format error are yielded, the error is only raised when it is reached.
+            self.assertEqual(next(subtitle_iterator).index, 1)
+            self.assertEqual(next(subtitle_iterator).index, 2)
+            with self.assertRaises(Exception) as context:
+                next(subtitle_iterator)
+            self.assertIsInstance(context.exception.__cause__, SRTFormatError)
+
+    def _read_in_parallel(self, file_content, num_workers=3):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".srt", newline="") as temporary_file:
+            temporary_file.write(file_content)
+            temporary_file.flush()
+
+            file_reader = SRTFileReader(temporary_file.name)
+            self.assertEqual(len(file_reader._find_chunk_byte_ranges(num_workers)), num_workers)
+
+            return file_reader.read(), file_reader.read_in_parallel(num_workers)
+
+    def test_read_in_parallel(self):
+        file_content = "".join(
+            f"{index}\r\n00:00:{index:02d},000 --> 00:00:{index:02d},500\r\nSubtitle number {index}.\r\n\r\n"
+            for index in range(1, 31))
+
+        subtitles, subtitles_read_in_parallel = self._read_in_parallel(file_content)
+        self.assertEqual(len(subtitles), 30)
+        self.assertEqual(subtitles_read_in_parallel, subtitles)
+
+    def test_read_in_parallel_empty_line_after_index(self):
+        # Empty lines between index and time stamp do not separate subtitles, chunks must not be split there.
+        file_content = "".join(
+            f"{index}\n\n00:00:{index:02d},000 --> 00:00:{index:02d},500\nSubtitle number {index}.\n\n"
+            for index in range(1, 31))
+
+        subtitles, subtitles_read_in_parallel = self._read_in_parallel(file_content)
+        self.assertEqual(len(subtitles), 30)
+        self.assertEqual(subtitles_read_in_parallel, subtitles)
+
+    def test_read_in_parallel_overlap_in_time(self):
+        file_content = "".join(
+            f"{index}\n00:00:{30 - index:02d},000 --> 00:00:{31 - index:02d},500\nSubtitle number {index}.\n\n"
+            for index in range(1, 31))
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".srt") as temporary_file:
+            temporary_file.write(file_content)
+            temporary_file.flush()
+
+            with self.assertRaises(SRTFormatError):
+                SRTFileReader(temporary_file.name).read_in_parallel(3)
+
+    def test_time_code_formats(self):
+        self.assertEqual(SRTFileReader._seconds_from_time_code("01:02:03,456"), 3723.456)
+        self.assertEqual(SRTFileReader._seconds_from_time_code("01:02:03.456"), 3723.456)
+        self.assertEqual(SRTFileReader._seconds_from_time_code("1:2:3,4"), 3723.4)
+        self.assertEqual(SRTFileReader._seconds_from_time_code("3723.456"), 3723.456)
+
+        for invalid_time_code in ["00:00:60,000", "24:00:00,000", "00:00:01,1234567", "abc"]:
+            with self.assertRaises(SRTFormatError):
+                SRTFileReader._seconds_from_time_code(invalid_time_code)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from suber.data_types import LineBreak
 from suber.hyp_to_ref_alignment import time_align_hypothesis_to_reference
 from suber.hyp_to_ref_alignment import levenshtein_align_hypothesis_to_reference
 from .utilities import create_temporary_file_and_read_it
@@ -167,6 +168,168 @@ class TimeAlignmentTests(unittest.TestCase):
         second_subtititle_text = " ".join(word.string for word in hypothesis_subtitles[1].word_list)
         self.assertEqual(second_subtititle_text, "frame having two lines.")
 
+    def test_overlapping_reference(self):
+        reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:04,000
+            - This is the first speaker talking.
+
+            2
+            00:00:01,000 --> 00:00:02,000
+            - Second speaker.
+
+            3
+            00:00:03,000 --> 00:00:05,000
+            And one more subtitle."""
+
+        hypothesis_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            First speaker.
+
+            2
+            00:00:02,200 --> 00:00:02,800
+            Still talking.
+
+            3
+            00:00:04,200 --> 00:00:05,000
+            One more."""
+
+        reference_subtitles = create_temporary_file_and_read_it(reference_file_content)
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis_file_content)
+
+        hypothesis_subtitles = time_align_hypothesis_to_reference(hypothesis_subtitles, reference_subtitles)
+
+        self.assertEqual(len(hypothesis_subtitles), 3)
+
+        # Words within the first subtitle are assigned to it, also those after the end of the overlapping second one.
+        first_subtititle_text = " ".join(word.string for word in hypothesis_subtitles[0].word_list)
+        self.assertEqual(first_subtititle_text, "First speaker. Still talking.")
+
+        self.assertFalse(hypothesis_subtitles[1].word_list)
+
+        third_subtititle_text = " ".join(word.string for word in hypothesis_subtitles[2].word_list)
+        self.assertEqual(third_subtititle_text, "One more.")
+
+    def test_overlapping_reference_latest_start(self):
+        reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:03,000
+            First.
+
+            2
+            00:00:02,000 --> 00:00:05,000
+            Second.
+
+            3
+            00:00:03,500 --> 00:00:04,000
+            Third."""
+
+        hypothesis_file_content = """
+            1
+            00:00:02,400 --> 00:00:02,600
+            Partial.
+
+            2
+            00:00:03,600 --> 00:00:03,800
+            Nested.
+
+            3
+            00:00:04,400 --> 00:00:04,600
+            After."""
+
+        reference_subtitles = create_temporary_file_and_read_it(reference_file_content)
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis_file_content)
+
+        hypothesis_subtitles = time_align_hypothesis_to_reference(hypothesis_subtitles, reference_subtitles)
+
+        self.assertEqual(len(hypothesis_subtitles), 3)
+
+        # Words within several subtitles are assigned to the one starting last, both for partial and nested overlap.
+        # Only a word after the end of the nested subtitle goes to the longer one containing it.
+        self.assertFalse(hypothesis_subtitles[0].word_list)
+
+        second_subtititle_text = " ".join(word.string for word in hypothesis_subtitles[1].word_list)
+        self.assertEqual(second_subtititle_text, "Partial. After.")
+
+        third_subtititle_text = " ".join(word.string for word in hypothesis_subtitles[2].word_list)
+        self.assertEqual(third_subtititle_text, "Nested.")
+
+    def test_empty_reference(self):
+        hypothesis_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame."""
+
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis_file_content)
+
+        self.assertEqual(time_align_hypothesis_to_reference(hypothesis_subtitles, []), [])
+
+        reference_subtitles = hypothesis_subtitles
+        aligned_hypothesis_subtitles = time_align_hypothesis_to_reference([], reference_subtitles)
+        self.assertEqual(len(aligned_hypothesis_subtitles), 1)
+        self.assertFalse(aligned_hypothesis_subtitles[0].word_list)
+
+    def test_japanese(self):
+        reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            これは簡単な
+
+            2
+            00:00:01,000 --> 00:00:02,000
+            最初のブロックです"""
+
+        hypothesis_file_content = """
+            1
+            00:00:00,000 --> 00:00:02,000
+            これは簡単な最初のブロックです"""
+
+        reference_subtitles = create_temporary_file_and_read_it(reference_file_content)
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis_file_content)
+
+        # Word is split into 8 tokens with evenly distributed times, half of them fall into each reference subtitle.
+        aligned_hypothesis_subtitles = time_align_hypothesis_to_reference(
+            hypothesis_subtitles, reference_subtitles, language="ja")
+
+        self.assertEqual(len(aligned_hypothesis_subtitles), 2)
+        self.assertEqual([word.string for word in aligned_hypothesis_subtitles[0].word_list], ["これは簡単な"])
+        self.assertEqual([word.string for word in aligned_hypothesis_subtitles[1].word_list], ["最初のブロックです"])
+
+    def test_japanese_overlapping_hypothesis(self):
+        reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:02,000
+            今日は天気が
+
+            2
+            00:00:02,000 --> 00:00:05,000
+            良いですね 明日は雨が降るでしょう"""
+
+        # Subtitles overlap in time, so tokens of both end up interleaved in the second reference subtitle.
+        hypothesis_file_content = """
+            1
+            00:00:00,000 --> 00:00:04,000
+            今日は 天気が良いですね
+
+            2
+            00:00:01,000 --> 00:00:05,000
+            明日は雨が降るでしょう"""
+
+        reference_subtitles = create_temporary_file_and_read_it(reference_file_content)
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis_file_content)
+
+        aligned_hypothesis_subtitles = time_align_hypothesis_to_reference(
+            hypothesis_subtitles, reference_subtitles, language="ja")
+
+        self.assertEqual(len(aligned_hypothesis_subtitles), 2)
+        self.assertEqual([word.string for word in aligned_hypothesis_subtitles[0].word_list],
+                         ["今日は", "天気", "明日は"])
+        # Same grouping as by the original detokenization: a token not starting a word is attached to the previous
+        # token, even if that comes from a different word.
+        self.assertEqual([(word.string, word.line_break) for word in aligned_hypothesis_subtitles[1].word_list],
+                         [("良いですね雨が降るでしょう", LineBreak.END_OF_BLOCK)])
+
 
 class LevenshteinAlignmentTests(unittest.TestCase):
     def test_identical_files(self):
@@ -268,6 +431,29 @@ class LevenshteinAlignmentTests(unittest.TestCase):
 
         self.assertEqual(len(hypothesis_segments), 3)
 
+    def test_japanese(self):
+        reference_file_content = """これは簡単な最初のブロックです
+                                    これは二つの行を持つ別のブロックです"""
+
+        # First word spans both reference segments, second word is fully contained in the second one.
+        hypothesis_file_content = "これは簡単な最初のブロックですこれは二つの 行を持つ別のブロックです"
+
+        reference_segments = create_temporary_file_and_read_it(reference_file_content, file_format="plain")
+        hypothesis_segments = create_temporary_file_and_read_it(hypothesis_file_content, file_format="plain")
+
+        aligned_hypothesis_segments = levenshtein_align_hypothesis_to_reference(
+            hypothesis_segments, reference_segments, language="ja")
+
+        self.assertEqual(len(aligned_hypothesis_segments), 2)
+
+        first_segment_words = [word.string for word in aligned_hypothesis_segments[0].word_list]
+        self.assertEqual(first_segment_words, ["これは簡単な最初のブロックです"])
+
+        second_segment_words = [word.string for word in aligned_hypothesis_segments[1].word_list]
+        self.assertEqual(second_segment_words, ["これは二つの", "行を持つ別のブロックです"])
+
+        # Words not split by the alignment are passed through unchanged.
+        self.assertIs(aligned_hypothesis_segments[1].word_list[1], hypothesis_segments[0].word_list[1])
 
 if __name__ == '__main__':
     unittest.main()
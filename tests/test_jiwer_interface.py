@@ -1,6 +1,7 @@
 import unittest
 
-from suber.metrics.jiwer_interface import calculate_word_error_rate
+from suber.metrics.jiwer_interface import calculate_word_error_rate, calculate_word_error_counts
+from suber.metrics.lib_wer import WordErrorCounts
 from .utilities import create_temporary_file_and_read_it
 
 
@@ -54,6 +55,27 @@ class JiWERInterfaceTest(unittest.TestCase):
         # (1 break deletion + 1 break insertion) / (13 words + 1 breaks)
         self.assertAlmostEqual(wer_seg_score, 14.286)
 
+    def test_word_error_counts(self):
+        reference_file_content = "This is a simple first frame.\nThis is another frame."
+        hypothesis_file_content = "This is simple frst frame. Extra\nThis is another frame."
+
+        reference_segments = create_temporary_file_and_read_it(reference_file_content, file_format="plain")
+        hypothesis_segments = create_temporary_file_and_read_it(hypothesis_file_content, file_format="plain")
+
+        expected_counts = WordErrorCounts(hits=8, substitutions=1, deletions=1, insertions=1)
+
+        for num_workers in [1, 2]:
+            word_error_counts = calculate_word_error_counts(
+                hypothesis=hypothesis_segments, reference=reference_segments, metric="WER", num_workers=num_workers)
+
+            self.assertEqual(word_error_counts, expected_counts)
+
+        wer_score = calculate_word_error_rate(
+            hypothesis=hypothesis_segments, reference=reference_segments, metric="WER")
+
+        # 3 errors / 10 reference words
+        self.assertAlmostEqual(wer_score, 30.0)
+
     def test_wer_chinese(self):
         reference_file_content = """
             1
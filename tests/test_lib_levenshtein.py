@@ -0,0 +1,37 @@
+import unittest
+
+from suber import lib_levenshtein
+
+
+class LevenshteinDistanceTests(unittest.TestCase):
+    string_pairs = [
+        ("", ""),
+        ("", "abc"),
+        ("kitten", "sitting"),
+        ("flaw", "lawn"),
+        ("This is a sentence.", "This is another sentence!"),
+        ("abcdef", "abcdef"),
+    ]
+
+    def test_python_backend(self):
+        expected_distances = [0, 3, 3, 2, 7, 0]
+        for (s1, s2), expected_distance in zip(self.string_pairs, expected_distances):
+            self.assertEqual(lib_levenshtein.distance(s1, s2, backend="python"), expected_distance)
+
+    def test_backends_agree(self):
+        if lib_levenshtein._rapidfuzz_levenshtein is None:
+            self.skipTest("rapidfuzz not installed")
+
+        for s1, s2 in self.string_pairs:
+            self.assertEqual(
+                lib_levenshtein.distance(s1, s2, backend="rapidfuzz"),
+                lib_levenshtein.distance(s1, s2, backend="python"))
+            self.assertEqual(lib_levenshtein.distance(s1, s2), len(lib_levenshtein.editops(s1, s2)))
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            lib_levenshtein.distance("a", "b", backend="c")
+
+
+if __name__ == '__main__':
+    unittest.main()
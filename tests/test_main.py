@@ -2,14 +2,19 @@ import unittest
 import tempfile
 import subprocess
 import json
+import os
 
 from typing import List
 from contextlib import ExitStack
 
 
+_ALL_METRIC_TYPES = ["SubER", "WER", "CER", "BLEU", "TER", "chrF", "TER-br", "WER-seg", "BLEU-seg", "AS-BLEU", "t-BLEU"]
+
+
 class MainFunctionTests(unittest.TestCase):
 
-    def _run_main(self, hypothesis_files_contents: List[str], reference_files_contents: List[str]):
+    def _run_main(self, hypothesis_files_contents: List[str], reference_files_contents: List[str],
+                  extra_arguments: List[str] = (), metrics: List[str] = tuple(_ALL_METRIC_TYPES)):
         """
         Creates temporary hypothesis and reference files, runs the SubER tool and returns the metric scores.
         """
@@ -32,8 +37,8 @@ class MainFunctionTests(unittest.TestCase):
             # Check all metrics, including hyp-to-ref-alignment.
             completed_process = subprocess.run(
                 f"python3 -m suber "
-                f"--hypothesis {hypothesis_file_names} --reference {reference_file_names} "
-                f"--metrics SubER WER CER BLEU TER chrF TER-br WER-seg BLEU-seg AS-BLEU t-BLEU".split(),
+                f"--hypothesis {hypothesis_file_names} --reference {reference_file_names} --metrics".split()
+                + list(metrics) + list(extra_arguments),
                 check=True, stdout=subprocess.PIPE)
 
             metric_scores = json.loads(completed_process.stdout.decode("utf-8"))
@@ -57,6 +62,39 @@ class MainFunctionTests(unittest.TestCase):
         # Just check that it runs through.
         self.assertTrue(metric_scores)
 
+        # Metrics computed in parallel, results expected in the same order.
+        metric_scores_parallel = self._run_main(
+            hypothesis_files_contents=[file_content], reference_files_contents=[file_content],
+            extra_arguments=["--jobs", "3", "--progress"])
+
+        self.assertEqual(list(metric_scores_parallel.items()), list(metric_scores.items()))
+
+    def test_lazy_imports(self):
+        """
+        The default SubER metric should not need slow-to-import dependencies of other metrics, keeps startup time low.
+        """
+        file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame."""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".srt") as file:
+            file.write(file_content)
+            file.flush()
+
+            completed_process = subprocess.run(
+                ["python3", "-X", "importtime", "-m", "suber", "--hypothesis", file.name, "--reference", file.name],
+                check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # Lines look like "import time: self [us] | cumulative | imported package"
+        imported_modules = {
+            line.split("|")[-1].strip() for line in completed_process.stderr.decode("utf-8").splitlines()
+            if line.startswith("import time:")}
+
+        self.assertIn("suber.metrics.suber", imported_modules)
+        for module in ["sacrebleu", "jiwer", "rapidfuzz", "regex"]:
+            self.assertNotIn(module, imported_modules)
+
     def test_multiple_files(self):
         """
         We support multiple input files, see 'suber.concat_input_files'.
@@ -113,6 +151,114 @@ class MainFunctionTests(unittest.TestCase):
         # We expect manual concatenation and giving multiple files to be equivalent.
         self.assertEqual(metric_scores_split_files, metric_scores_concatenated_files)
 
+        metric_scores_parallel_reading = self._run_main(
+            hypothesis_files_contents=[hypothesis_file1_content, hypothesis_file2_content],
+            reference_files_contents=[reference_file1_content, reference_file2_content],
+            extra_arguments=["--jobs", "2"])
+
+        self.assertEqual(metric_scores_split_files, metric_scores_parallel_reading)
+
+    def test_result_cache(self):
+        hypothesis_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple frame."""
+
+        reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame."""
+
+        changed_reference_file_content = """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a first frame."""
+
+        metric_scores = self._run_main([hypothesis_file_content], [reference_file_content])
+        changed_metric_scores = self._run_main([hypothesis_file_content], [changed_reference_file_content])
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            for _ in range(2):  # creates the cache entry, then loads it
+                self.assertEqual(
+                    self._run_main([hypothesis_file_content], [reference_file_content],
+                                   extra_arguments=["--result-cache-dir", cache_directory]),
+                    metric_scores)
+
+            self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+            self.assertEqual(
+                self._run_main([hypothesis_file_content], [changed_reference_file_content],
+                               extra_arguments=["--result-cache-dir", cache_directory]),
+                changed_metric_scores)
+
+            self.assertEqual(len(os.listdir(cache_directory)), 2)
+
+    def test_merge_statistics(self):
+        """
+        Statistics of single files merged with 'suber-merge' should give the same scores as scoring all files at once.
+        """
+        hypothesis_files_contents = [
+            """
+            1
+            00:00:00,000 --> 00:00:00,800
+            This is a first frame.""",
+            """
+            1
+            00:00:00,400 --> 00:00:01,200
+            This is another frame which should have two lines.""",
+            """
+            1
+            00:00:00,000 --> 00:00:01,000
+            Completely different words here."""]
+
+        reference_files_contents = [
+            """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame.""",
+            """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is another frame
+            having two lines.""",
+            """
+            1
+            00:00:00,000 --> 00:00:01,000
+            Nothing matches."""]
+
+        metrics = [metric for metric in _ALL_METRIC_TYPES if not metric.startswith("AS-")]
+        metrics += ["SubER-cased", "TER-seg", "t-TER", "t-chrF", "length_ratio"]
+
+        metric_scores_all_files = self._run_main(
+            hypothesis_files_contents, reference_files_contents, metrics=metrics,
+            extra_arguments=["--suber-statistics"])
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            statistics_file_names = []
+            # Two shards, the first one containing two files.
+            for shard_index, (start, end) in enumerate([(0, 2), (2, 3)]):
+                statistics = self._run_main(
+                    hypothesis_files_contents[start:end], reference_files_contents[start:end], metrics=metrics,
+                    extra_arguments=["--suber-statistics", "--emit-stats"])
+
+                statistics_file_name = os.path.join(temporary_directory, f"shard{shard_index}.json")
+                with open(statistics_file_name, "w") as statistics_file:
+                    json.dump(statistics, statistics_file)
+                statistics_file_names.append(statistics_file_name)
+
+            completed_process = subprocess.run(
+                ["python3", "-m", "suber.tools.merge_statistics", "--input-files"] + statistics_file_names,
+                check=True, stdout=subprocess.PIPE)
+
+        metric_scores_merged = json.loads(completed_process.stdout.decode("utf-8"))
+
+        self.assertEqual(list(metric_scores_merged.items()), list(metric_scores_all_files.items()))
+
+        # Hypothesis-to-reference alignment across file boundaries is not reproducible by merging.
+        with self.assertRaises(subprocess.CalledProcessError):
+            self._run_main(hypothesis_files_contents, reference_files_contents, metrics=["AS-BLEU"],
+                           extra_arguments=["--emit-stats"])
+
 
 if __name__ == '__main__':
     unittest.main()
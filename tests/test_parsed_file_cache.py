@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from suber.file_readers import read_input_file
+from .utilities import write_temporary_file
+
+
+class ParsedFileCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temporary_directory.cleanup)
+        self._cache_directory = os.path.join(self._temporary_directory.name, "cache")
+
+    def test_srt_file(self):
+        file_name = write_temporary_file(self._temporary_directory.name, """
+            1
+            00:00:00,000 --> 00:00:01,000
+            This is a simple first frame.
+
+            2
+            00:00:01,000 --> 00:00:01,000
+
+            3
+            00:00:01,500 --> 00:00:02,000
+            This is another frame
+            having two lines.""", "input.srt")
+
+        subtitles = read_input_file(file_name, file_format="SRT")
+
+        # First call creates the cache entry, second call loads it.
+        self.assertEqual(read_input_file(file_name, file_format="SRT", cache_directory=self._cache_directory),
+                         subtitles)
+        self.assertEqual(len(os.listdir(self._cache_directory)), 1)
+        self.assertEqual(read_input_file(file_name, file_format="SRT", cache_directory=self._cache_directory),
+                         subtitles)
+
+    def test_plain_file(self):
+        file_name = write_temporary_file(
+            self._temporary_directory.name, "This is a line. <eob>\nThese are <eol> two subtitle lines. <eob>\n\n",
+            "input.txt")
+
+        segments = read_input_file(file_name, file_format="plain")
+
+        self.assertEqual(read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory),
+                         segments)
+        self.assertEqual(read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory),
+                         segments)
+
+    def test_invalidation(self):
+        file_name = write_temporary_file(self._temporary_directory.name, "This is a line.", "input.txt")
+        read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+
+        file_name = write_temporary_file(self._temporary_directory.name, "This is a changed line.", "input.txt")
+        segments = read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+        self.assertEqual(" ".join(word.string for word in segments[0].word_list), "This is a changed line.")
+
+    def test_corrupt_cache_file(self):
+        file_name = write_temporary_file(self._temporary_directory.name, "This is a line.", "input.txt")
+        read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+
+        cache_file_name = os.path.join(self._cache_directory, os.listdir(self._cache_directory)[0])
+        with open(cache_file_name, "wb") as cache_file:
+            cache_file.write(b"corrupt")
+
+        segments = read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+        self.assertEqual(" ".join(word.string for word in segments[0].word_list), "This is a line.")
+
+
+    def test_cache_file_without_fingerprint(self):
+        file_name = write_temporary_file(self._temporary_directory.name, "This is a line.", "input.txt")
+        read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+
+        cache_file_name = os.path.join(self._cache_directory, os.listdir(self._cache_directory)[0])
+        with numpy.load(cache_file_name) as cache_entry:
+            arrays = {key: cache_entry[key] for key in cache_entry.files if key != "fingerprint"}
+        with open(cache_file_name, "wb") as cache_file:
+            numpy.savez(cache_file, **arrays)
+
+        segments = read_input_file(file_name, file_format="plain", cache_directory=self._cache_directory)
+        self.assertEqual(" ".join(word.string for word in segments[0].word_list), "This is a line.")
+
+if __name__ == '__main__':
+    unittest.main()
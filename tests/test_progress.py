@@ -0,0 +1,94 @@
+import io
+import unittest
+
+import suber.__main__
+from suber.__main__ import MetricCalculator
+from suber.hyp_to_ref_alignment import levenshtein_align_hypothesis_to_reference
+from suber.metrics.suber import calculate_SubER
+from suber.progress import ProgressReporter
+from .utilities import create_temporary_file_and_read_it
+
+
+class ProgressReporterTests(unittest.TestCase):
+    def test_progress_reporter(self):
+        stream = io.StringIO()
+        progress_reporter = ProgressReporter("Test", total_cost=4, stream=stream, interval=0)
+
+        progress_reporter.advance(1, status="step 1")
+        progress_reporter.set_status("step 2")
+        progress_reporter.update(3)
+        progress_reporter.finish()
+
+        lines = stream.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Test: 25.0%, ETA "))
+        self.assertTrue(lines[0].endswith(" (step 1)"))
+        self.assertTrue(lines[1].endswith(" (step 2)"))
+        self.assertTrue(lines[2].startswith("Test: 75.0%, ETA "))
+        self.assertTrue(lines[2].endswith(" (step 2)"))
+        self.assertTrue(lines[3].startswith("Test: done in "))
+
+    def test_silent_by_default_interval(self):
+        stream = io.StringIO()
+        progress_reporter = ProgressReporter("Test", total_cost=2, stream=stream)
+
+        progress_reporter.advance(1)
+        progress_reporter.advance(1)
+        progress_reporter.finish()
+
+        # Fast computations do not create any output.
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_SubER_and_alignment_progress(self):
+        reference = create_temporary_file_and_read_it("""
+            1
+            0:00:01.000 --> 0:00:02.000
+            This is a subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another one!""")
+
+        hypothesis = create_temporary_file_and_read_it("""
+            1
+            0:00:01.000 --> 0:00:02.000
+            is This a subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another
+            one!""")
+
+        stream = io.StringIO()
+        SubER_score = calculate_SubER(
+            hypothesis, reference, progress_reporter=ProgressReporter("SubER", stream=stream, interval=0))
+
+        self.assertEqual(SubER_score, calculate_SubER(hypothesis, reference))
+
+        lines = stream.getvalue().splitlines()
+        self.assertIn("SubER: 0.0%", lines[0])
+        self.assertIn("SubER: 0.0% (part 1/2, 1 shifts)", lines)
+        self.assertTrue(lines[-2].startswith("SubER: 100.0%, ETA 0s (part 2/2)"))
+        self.assertTrue(lines[-1].startswith("SubER: done in "))
+
+        stream = io.StringIO()
+        aligned_hypothesis = levenshtein_align_hypothesis_to_reference(
+            hypothesis, reference,
+            progress_reporter=ProgressReporter("Levenshtein alignment", stream=stream, interval=0))
+
+        self.assertEqual(aligned_hypothesis, levenshtein_align_hypothesis_to_reference(hypothesis, reference))
+        self.assertIn("Levenshtein alignment: 100.0%", stream.getvalue())
+
+    def test_no_progress_in_worker_processes(self):
+        metric_calculator = MetricCalculator([], [], progress=True)
+        self.assertIsNotNone(metric_calculator._create_progress_reporter("SubER"))
+
+        # Worker processes must not write to the same terminal.
+        suber.__main__._initialize_worker(metric_calculator)
+        self.addCleanup(setattr, suber.__main__, "_worker_metric_calculator", None)
+        self.assertIsNone(suber.__main__._worker_metric_calculator._create_progress_reporter("SubER"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+
+import suber.result_cache
+from suber.result_cache import get_result_cache_key, load_cached_result, store_result_in_cache
+from .utilities import write_temporary_file
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temporary_directory.cleanup)
+        self._cache_directory = os.path.join(self._temporary_directory.name, "cache")
+
+    def test_cache_key(self):
+        hypothesis_file = write_temporary_file(self._temporary_directory.name, "This is a line.", "hypothesis.txt")
+        reference_file = write_temporary_file(self._temporary_directory.name, "This is a line.", "reference.txt")
+        options = {"metrics": ["WER"], "language": None}
+
+        key = get_result_cache_key([hypothesis_file], [reference_file], options)
+
+        # Only the file contents matter, not the file names.
+        self.assertEqual(get_result_cache_key([reference_file], [hypothesis_file], options), key)
+
+        self.assertNotEqual(get_result_cache_key([hypothesis_file], [reference_file], {"metrics": ["WER", "BLEU"]}),
+                            key)
+
+        write_temporary_file(self._temporary_directory.name, "This is a changed line.", "reference.txt")
+        self.assertNotEqual(get_result_cache_key([hypothesis_file], [reference_file], options), key)
+
+    def test_cache_key_with_changed_source(self):
+        hypothesis_file = write_temporary_file(self._temporary_directory.name, "This is a line.", "hypothesis.txt")
+        options = {"metrics": ["WER"], "language": None}
+
+        # Same package version, e.g. editable install, but changed source code.
+        with unittest.mock.patch("importlib.metadata.version", return_value="1.0.0"):
+            key = get_result_cache_key([hypothesis_file], [hypothesis_file], options)
+
+            source_file = suber.result_cache.__file__
+            source_file_status = os.stat(source_file)
+            try:
+                os.utime(source_file, ns=(source_file_status.st_atime_ns, time.time_ns() + 10 ** 9))
+                self.assertNotEqual(get_result_cache_key([hypothesis_file], [hypothesis_file], options), key)
+            finally:
+                os.utime(source_file, ns=(source_file_status.st_atime_ns, source_file_status.st_mtime_ns))
+
+            self.assertEqual(get_result_cache_key([hypothesis_file], [hypothesis_file], options), key)
+
+    def test_store_and_load(self):
+        self.assertIsNone(load_cached_result("key", self._cache_directory))
+
+        store_result_in_cache('{"SubER": 0.0}', "key", self._cache_directory, max_size_bytes=1000)
+
+        self.assertEqual(load_cached_result("key", self._cache_directory), '{"SubER": 0.0}')
+        self.assertEqual(os.listdir(self._cache_directory), ["key.json"])
+
+    def test_eviction(self):
+        result = "x" * 100
+
+        store_result_in_cache(result, "key1", self._cache_directory, max_size_bytes=250)
+        time.sleep(0.01)
+        store_result_in_cache(result, "key2", self._cache_directory, max_size_bytes=250)
+        time.sleep(0.01)
+
+        # Makes "key1" the most recently used entry.
+        self.assertEqual(load_cached_result("key1", self._cache_directory), result)
+        time.sleep(0.01)
+
+        store_result_in_cache(result, "key3", self._cache_directory, max_size_bytes=250)
+
+        self.assertEqual(sorted(os.listdir(self._cache_directory)), ["key1.json", "key3.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 
+from suber.metrics.metric_input_cache import MetricInputCache
 from suber.metrics.sacrebleu_interface import calculate_sacrebleu_metric
 from .utilities import create_temporary_file_and_read_it
 
@@ -65,6 +66,21 @@ class SacreBleuInterfaceTest(unittest.TestCase):
         # 1 break shift / (13 words + 1 breaks)
         self.assertAlmostEqual(ter_seg_score, 7.143)
 
+    def test_internal_TER_backend(self):
+        for metric in ["TER", "TER-seg", "TER-br"]:
+            for score_break_at_segment_end in [True, False]:
+                expected_ter_score = calculate_sacrebleu_metric(
+                    hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric=metric,
+                    score_break_at_segment_end=score_break_at_segment_end)
+
+                for num_workers in [1, 2]:
+                    ter_score = calculate_sacrebleu_metric(
+                        hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric=metric,
+                        score_break_at_segment_end=score_break_at_segment_end, ter_backend="internal",
+                        num_workers=num_workers)
+
+                    self.assertEqual(ter_score, expected_ter_score)
+
     def test_TER_br(self):
         reference_file_content = "This is one sentence <eol> with a line break <eob> and a frame break. <eob>"
         hypothesis_file_content = "This <eol> is a sentence with <eol> a line <eob> break and a block break. <eob>"
@@ -80,12 +96,42 @@ class SacreBleuInterfaceTest(unittest.TestCase):
         expected_ter_br_score = round(3 / (12 + 3) * 100, 3)
         self.assertAlmostEqual(ter_br_score, expected_ter_br_score)
 
+        ter_br_score = calculate_sacrebleu_metric(
+            hypothesis=hypothesis_subtitles, reference=reference_subtitles, metric="TER-br", ter_backend="internal")
+
+        self.assertAlmostEqual(ter_br_score, expected_ter_br_score)
+
     def test_chrF(self):
         chrF_score = calculate_sacrebleu_metric(
             hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric="chrF")
 
         self.assertAlmostEqual(chrF_score, 100.0)
 
+    def test_shared_cache(self):
+        reference_file_content = "This is a line. <eob>\n\nThese are <eol> two subtitle lines. <eob>\n"
+        hypothesis_file_content = "This is one line. <eob>\nfiller <eob>\nThese are two <eol> subtitle lines. <eob>\n"
+
+        reference_segments = create_temporary_file_and_read_it(reference_file_content, file_format="plain")
+        hypothesis_segments = create_temporary_file_and_read_it(hypothesis_file_content, file_format="plain")
+
+        cache = MetricInputCache()
+
+        for metric in ["BLEU", "TER", "chrF", "BLEU-seg", "TER-seg", "TER-br", "BLEU", "TER-seg"]:
+            for score_break_at_segment_end in [True, False]:
+                expected_score = calculate_sacrebleu_metric(
+                    hypothesis=hypothesis_segments, reference=reference_segments, metric=metric,
+                    score_break_at_segment_end=score_break_at_segment_end)
+
+                score = calculate_sacrebleu_metric(
+                    hypothesis=hypothesis_segments, reference=reference_segments, metric=metric,
+                    score_break_at_segment_end=score_break_at_segment_end, cache=cache)
+
+                self.assertEqual(score, expected_score)
+
+        self.assertEqual(
+            cache.get_segment_strings(reference_segments, include_line_breaks=True, escape_break_symbols=True),
+            ["This is a line. eob", "", "These are eol two subtitle lines. eob"])
+
 
 class SacreBleuInterfaceTestJapanese(unittest.TestCase):
     def setUp(self):
@@ -159,6 +205,18 @@ class SacreBleuInterfaceTestJapanese(unittest.TestCase):
         # 1 break shift / (16 words + 1 breaks)
         self.assertAlmostEqual(ter_seg_score, 5.882)
 
+        for metric in ["TER", "TER-seg"]:
+            for score_break_at_segment_end in [True, False]:
+                expected_ter_score = calculate_sacrebleu_metric(
+                    hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric=metric,
+                    score_break_at_segment_end=score_break_at_segment_end, language="ja")
+
+                ter_score = calculate_sacrebleu_metric(
+                    hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric=metric,
+                    score_break_at_segment_end=score_break_at_segment_end, language="ja", ter_backend="internal")
+
+                self.assertEqual(ter_score, expected_ter_score)
+
     def test_chrF(self):
         chrF_score = calculate_sacrebleu_metric(
             hypothesis=self._hypothesis_subtitles, reference=self._reference_subtitles, metric="chrF")
@@ -0,0 +1,105 @@
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import unittest
+
+import suber
+from suber.__main__ import create_argument_parser, create_output
+from suber.scoring_daemon import ScoringService, create_server, request_scoring
+from .utilities import HYPOTHESIS_SRT, REFERENCE_SRT, write_temporary_file
+
+
+class ScoringDaemonTests(unittest.TestCase):
+    def setUp(self):
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temporary_directory.cleanup)
+        self._socket_path = os.path.join(self._temporary_directory.name, "suber.sock")
+
+        self._reference_file = write_temporary_file(self._temporary_directory.name, REFERENCE_SRT, "reference.srt")
+        self._hypothesis_files = [
+            write_temporary_file(self._temporary_directory.name, HYPOTHESIS_SRT, "hypothesis1.srt"),
+            write_temporary_file(self._temporary_directory.name, """
+                1
+                00:00:00,000 --> 00:00:01,500
+                This is the first frame,
+
+                2
+                00:00:01,500 --> 00:00:02,000
+                another one has two lines.""", "hypothesis2.srt")]
+
+    def _parse_arguments(self, hypothesis_file):
+        return create_argument_parser().parse_args(
+            ["-H", hypothesis_file, "-R", self._reference_file, "--metrics", "SubER", "WER", "BLEU", "TER-seg",
+             "AS-chrF", "t-BLEU", "--suber-statistics"])
+
+    def test_scoring_service(self):
+        scoring_service = ScoringService(max_cached_references=1)
+
+        # Second round uses the cached reference.
+        for _ in range(2):
+            for hypothesis_file in self._hypothesis_files:
+                args = self._parse_arguments(hypothesis_file)
+                self.assertEqual(scoring_service.score(vars(args)), create_output(args))
+
+    def test_server(self):
+        args = self._parse_arguments(self._hypothesis_files[1])
+
+        self.assertIsNone(request_scoring(vars(args), self._socket_path))
+
+        server = create_server(self._socket_path)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.start()
+
+        try:
+            self.assertEqual(request_scoring(vars(args), self._socket_path), create_output(args))
+
+            with self.assertRaises(RuntimeError):
+                request_scoring(dict(vars(args), metrics=["invalid"]), self._socket_path)
+
+            with self.assertRaises(RuntimeError):
+                create_server(self._socket_path)  # already running
+
+            # Client command line tool, relative file names have to work too.
+            completed_process = subprocess.run(
+                ["python3", "-m", "suber.tools.scoring_client", "--socket", self._socket_path,
+                 "-H", os.path.basename(self._hypothesis_files[1]), "-R", os.path.basename(self._reference_file),
+                 "--metrics", "SubER", "WER", "BLEU", "TER-seg", "AS-chrF", "t-BLEU", "--suber-statistics",
+                 "--checkpoint-file", "checkpoint.jsonl"],
+                cwd=self._temporary_directory.name, check=True, stdout=subprocess.PIPE,
+                env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(suber.__file__))))
+
+            self.assertEqual(completed_process.stdout.decode("utf-8").strip(), create_output(args))
+            # Written relative to the client's working directory, not the daemon's.
+            self.assertTrue(os.path.exists(os.path.join(self._temporary_directory.name, "checkpoint.jsonl")))
+        finally:
+            server.shutdown()
+            server_thread.join()
+            server.server_close()
+
+
+    def test_daemon_closing_connection(self):
+        args = self._parse_arguments(self._hypothesis_files[1])
+
+        # Daemon which terminates while handling the request, without sending a response.
+        listening_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listening_socket.bind(self._socket_path)
+        listening_socket.listen()
+
+        def accept_and_close():
+            connection, _ = listening_socket.accept()
+            with connection, connection.makefile("rb") as request_file:
+                request_file.readline()
+
+        daemon_thread = threading.Thread(target=accept_and_close)
+        daemon_thread.start()
+
+        try:
+            self.assertIsNone(request_scoring(vars(args), self._socket_path))
+        finally:
+            daemon_thread.join()
+            listening_socket.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
+import json
+import os
+import tempfile
 import unittest
 
 from suber.data_types import Subtitle
 from suber.metrics.suber import calculate_SubER, _get_independent_parts
+from suber.metrics.suber_checkpoint import PartResult, SubERCheckpoint
+from suber.metrics.suber_statistics import SubERStatisticsCollector
 from .utilities import create_temporary_file_and_read_it
 
 
@@ -394,6 +399,118 @@ class SubERCasedMetricTests(unittest.TestCase):
         # 1 shift and 2 break insertions as above for SubER, plus 1 substitution '!' -> '.'
         self.assertAlmostEqual(SubER_score, 33.333)
 
+    def test_checkpoint(self):
+        reference = """
+            1
+            0:00:01.000 --> 0:00:02.000
+            This is a subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another one!"""
+
+        hypothesis = """
+            1
+            0:00:01.000 --> 0:00:02.000
+            This is the subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another
+            one!"""
+
+        hypothesis_subtitles = create_temporary_file_and_read_it(hypothesis)
+        reference_subtitles = create_temporary_file_and_read_it(reference)
+
+        statistics_collector = SubERStatisticsCollector()
+        expected_SubER_score = calculate_SubER(
+            hypothesis_subtitles, reference_subtitles, statistics_collector=statistics_collector)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            checkpoint_file = os.path.join(temporary_directory, "checkpoint.jsonl")
+
+            for metric in ["SubER", "SubER-cased"]:
+                self.assertEqual(
+                    calculate_SubER(hypothesis_subtitles, reference_subtitles, metric=metric,
+                                    checkpoint_file=checkpoint_file),
+                    calculate_SubER(hypothesis_subtitles, reference_subtitles, metric=metric))
+
+            # One line per part and metric.
+            with open(checkpoint_file) as checkpoint_file_object:
+                lines = checkpoint_file_object.readlines()
+            self.assertEqual(len(lines), 4)
+
+            # Statistics were not stored, so the first part is computed again when collecting statistics. Simulate an
+            # interruption after that, which leaves an incomplete line.
+            resumed_statistics_collector = SubERStatisticsCollector()
+            calculate_SubER(hypothesis_subtitles[:1], reference_subtitles[:1],
+                            statistics_collector=resumed_statistics_collector, checkpoint_file=checkpoint_file)
+            with open(checkpoint_file, "a") as checkpoint_file_object:
+                checkpoint_file_object.write('{"fingerprint": ')
+
+            resumed_statistics_collector = SubERStatisticsCollector()
+            SubER_score = calculate_SubER(hypothesis_subtitles, reference_subtitles,
+                                          statistics_collector=resumed_statistics_collector,
+                                          checkpoint_file=checkpoint_file)
+
+            self.assertEqual(SubER_score, expected_SubER_score)
+            self.assertEqual(resumed_statistics_collector.get_statistics(), statistics_collector.get_statistics())
+
+            # Results are read from the checkpoint now, which we verify by manipulating them. The incomplete line is
+            # kept, new results were appended on the next line.
+            with open(checkpoint_file) as checkpoint_file_object:
+                lines = checkpoint_file_object.readlines()
+            self.assertEqual(len(lines), 7)
+            self.assertEqual(lines[5], '{"fingerprint": \n')
+
+            with open(checkpoint_file, "w") as checkpoint_file_object:
+                for line in lines[:5] + lines[6:]:
+                    record = json.loads(line)
+                    record["num_edits"] = 0
+                    checkpoint_file_object.write(json.dumps(record) + "\n")
+
+            SubER_score = calculate_SubER(hypothesis_subtitles, reference_subtitles, checkpoint_file=checkpoint_file)
+            self.assertEqual(SubER_score, 0.0)
+
+            # Results of parts with changed content are not reused.
+            changed_reference_subtitles = create_temporary_file_and_read_it(reference.replace("another", "other"))
+            SubER_score = calculate_SubER(hypothesis_subtitles, changed_reference_subtitles,
+                                          checkpoint_file=checkpoint_file)
+            self.assertGreater(SubER_score, 0.0)
+
+    def test_checkpoint_with_undecodable_lines(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            checkpoint_file = os.path.join(temporary_directory, "checkpoint.jsonl")
+
+            checkpoint = SubERCheckpoint(checkpoint_file)
+            checkpoint.add_part_result("a", PartResult(num_edits=1, reference_length=2, statistics=None))
+            with open(checkpoint_file, "a") as checkpoint_file_object:
+                checkpoint_file_object.write('{"fingerprint": "corrupted"\n')
+                # Valid json, but not a complete record.
+                checkpoint_file_object.write('{}\nnull\n5\n{"fingerprint": "e", "num_edits": 9}\n')
+            checkpoint.add_part_result("b", PartResult(num_edits=3, reference_length=4, statistics=None))
+
+            # Corrupted lines in the middle are skipped.
+            checkpoint = SubERCheckpoint(checkpoint_file)
+            self.assertEqual(checkpoint.get_part_result("a"), (1, 2, None))
+            self.assertEqual(checkpoint.get_part_result("b"), (3, 4, None))
+            self.assertIsNone(checkpoint.get_part_result("e"))
+
+            # Another computation sharing the file is in the middle of appending a line. Loading must not remove it.
+            with open(checkpoint_file, "a") as checkpoint_file_object:
+                checkpoint_file_object.write('{"fingerprint": "c", "num_edits": 5, ')
+            checkpoint = SubERCheckpoint(checkpoint_file)
+            self.assertIsNone(checkpoint.get_part_result("c"))
+
+            with open(checkpoint_file, "a") as checkpoint_file_object:
+                checkpoint_file_object.write('"reference_length": 6, "statistics": null}\n')
+            checkpoint.add_part_result("d", PartResult(num_edits=7, reference_length=8, statistics=None))
+
+            checkpoint = SubERCheckpoint(checkpoint_file)
+            for fingerprint, part_result in [("a", (1, 2, None)), ("b", (3, 4, None)), ("c", (5, 6, None)),
+                                             ("d", (7, 8, None))]:
+                self.assertEqual(checkpoint.get_part_result(fingerprint), part_result)
+
 
 class SubERHelperFunctionTests(unittest.TestCase):
 
@@ -491,6 +608,10 @@ class SubERHelperFunctionTests(unittest.TestCase):
         self.assertEqual(parts[7], (hypothesis[7:9], reference[5:7]))
         self.assertEqual(parts[8], ([], reference[7:8]))
 
+        # Same result when consuming iterators instead of lists.
+        parts_from_iterators = list(_get_independent_parts(hypothesis=iter(hypothesis), reference=iter(reference)))
+        self.assertEqual(parts_from_iterators, parts)
+
 
 if __name__ == '__main__':
     unittest.main()
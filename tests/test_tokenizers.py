@@ -1,6 +1,8 @@
 import unittest
 
-from suber.tokenizers import _reattach_punctuation, detokenize_segments, reversibly_tokenize_segments
+from suber.data_types import Segment, Word
+from suber.tokenizers import (WordTokenizer, _reattach_punctuation, detokenize_segments, get_sacrebleu_tokenizer,
+                              get_word_tokenizer, reversibly_tokenize_segments, tokenize_segment_words)
 
 from .utilities import create_temporary_file_and_read_it
 
@@ -140,6 +142,34 @@ class ReversibleTokenizationTests(unittest.TestCase):
         self.assertEqual(_reattach_punctuation(". .. ... Multiple tokens"), "......Multiple tokens")
         self.assertEqual(_reattach_punctuation("Multiple tokens . .. ..."), "Multiple tokens......")
 
+    def test_shared_word_tokenizer(self):
+        self.assertIs(get_sacrebleu_tokenizer("ja", default_to_tercom=True), get_sacrebleu_tokenizer("ja"))
+        self.assertIs(get_word_tokenizer("ja", default_to_tercom=True), get_word_tokenizer("ja"))
+        self.assertIsNot(get_word_tokenizer("en", default_to_tercom=True), get_word_tokenizer("en"))
+
+        self.assertEqual(get_word_tokenizer("ja")("最初のブロックです"), ("最初", "の", "ブロック", "です"))
+
+    def test_word_tokenizer_cache_size(self):
+        word_tokenizer = WordTokenizer("en", max_cached_words=2)
+
+        for word in ["Hello,", "world", "again.", "Hello,"]:
+            self.assertEqual(word_tokenizer(word), word_tokenizer._tokenize(word))
+
+        cache_info = word_tokenizer._cached_tokenize.cache_info()
+        self.assertEqual(cache_info.currsize, 2)
+        self.assertEqual(cache_info.hits, 0)  # "Hello," was evicted
+
+    def test_tokenize_segment_words(self):
+        segments = [Segment(word_list=[Word(string="Hello,"), Word(string="world")]),
+                    Segment(word_list=[]),
+                    Segment(word_list=[Word(string="again.")])]
+
+        tokens, word_indices, num_tokens_per_segment = tokenize_segment_words(segments, language="en")
+
+        self.assertEqual(tokens, ["Hello", ",", "world", "again", "."])
+        self.assertEqual(word_indices, [0, 0, 1, 2, 2])
+        self.assertEqual(num_tokens_per_segment, [3, 0, 2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+from suber.file_readers import read_input_file
+from suber.hyp_to_ref_alignment import levenshtein_align_hypothesis_to_reference, time_align_hypothesis_to_reference
+from suber.metrics.suber import calculate_SubER
+from suber.tracing import TracingHooks
+
+
+class RecordingHooks(TracingHooks):
+    def __init__(self):
+        self.events = []
+
+    def file_read(self, file_name, file_format, num_bytes, num_segments, duration):
+        self.events.append(("file_read", file_format, num_bytes, num_segments))
+
+    def part_started(self, part_index, num_hypothesis_subtitles, num_reference_subtitles):
+        self.events.append(("part_started", part_index, num_hypothesis_subtitles, num_reference_subtitles))
+
+    def part_finished(self, part_index, num_edits, reference_length):
+        self.events.append(("part_finished", part_index, num_edits, reference_length))
+
+    def shift_iteration(self, num_shifts, num_checked_candidates):
+        self.events.append(("shift_iteration", num_shifts))
+
+    def dp_pass(self, num_computed_cells, cache_hit_depth, num_hypothesis_words):
+        self.events.append(("dp_pass", num_computed_cells, cache_hit_depth, num_hypothesis_words))
+
+    def alignment_started(self, method, num_hypothesis_segments, num_reference_segments):
+        self.events.append(("alignment_started", method, num_hypothesis_segments, num_reference_segments))
+
+    def alignment_finished(self, method, num_aligned_segments, duration):
+        self.events.append(("alignment_finished", method, num_aligned_segments))
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        self._reference_file = self._create_file("""
+            1
+            0:00:01.000 --> 0:00:02.000
+            This is a subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another one!""")
+
+        self._hypothesis_file = self._create_file("""
+            1
+            0:00:01.000 --> 0:00:02.000
+            is This a subtitle.
+
+            2
+            0:00:03.000 --> 0:00:04.000
+            And another
+            one!""")
+
+    def tearDown(self):
+        self._reference_file.close()
+        self._hypothesis_file.close()
+
+    @staticmethod
+    def _create_file(file_content):
+        temporary_file = tempfile.NamedTemporaryFile(mode="w", suffix=".srt")
+        temporary_file.write(file_content)
+        temporary_file.flush()
+        return temporary_file
+
+    def test_file_read(self):
+        hooks = RecordingHooks()
+        segments = read_input_file(self._reference_file.name, file_format="SRT", tracing_hooks=hooks)
+
+        self.assertEqual(segments, read_input_file(self._reference_file.name, file_format="SRT"))
+        self.assertEqual(hooks.events, [("file_read", "SRT", os.path.getsize(self._reference_file.name), 2)])
+
+    def test_SubER(self):
+        hypothesis = read_input_file(self._hypothesis_file.name, file_format="SRT")
+        reference = read_input_file(self._reference_file.name, file_format="SRT")
+
+        hooks = RecordingHooks()
+        SubER_score = calculate_SubER(hypothesis, reference, tracing_hooks=hooks)
+
+        self.assertEqual(SubER_score, calculate_SubER(hypothesis, reference))
+
+        part_events = [event for event in hooks.events if event[0].startswith("part_")]
+        self.assertEqual(part_events, [
+            ("part_started", 0, 1, 1),
+            ("part_finished", 0, 1, 5),  # one shift
+            ("part_started", 1, 1, 1),
+            ("part_finished", 1, 1, 4),  # one line break insertion
+        ])
+
+        self.assertIn(("shift_iteration", 1), hooks.events)
+
+        dp_pass_events = [event for event in hooks.events if event[0] == "dp_pass"]
+        # 5 hypothesis and reference words each, all cells within the beam.
+        self.assertEqual(dp_pass_events[0], ("dp_pass", 5 * 6, 0, 5))
+        # Edit distance of shift candidates reuses rows of the common prefix.
+        self.assertTrue(any(cache_hit_depth > 0 for _, _, cache_hit_depth, _ in dp_pass_events))
+        for _, num_computed_cells, cache_hit_depth, num_hypothesis_words in dp_pass_events:
+            self.assertLessEqual(num_computed_cells, (num_hypothesis_words - cache_hit_depth) * 7)
+
+    def test_alignment(self):
+        hypothesis = read_input_file(self._hypothesis_file.name, file_format="SRT")
+        reference = read_input_file(self._reference_file.name, file_format="SRT")
+
+        hooks = RecordingHooks()
+        levenshtein_align_hypothesis_to_reference(hypothesis, reference, tracing_hooks=hooks)
+        time_align_hypothesis_to_reference(hypothesis, reference, tracing_hooks=hooks)
+
+        self.assertEqual(hooks.events, [
+            ("alignment_started", "levenshtein", 2, 2),
+            ("alignment_finished", "levenshtein", 2),
+            ("alignment_started", "time", 2, 2),
+            ("alignment_finished", "time", 2),
+        ])
+
+    def test_default_hooks_ignore_events(self):
+        hypothesis = read_input_file(self._hypothesis_file.name, file_format="SRT", tracing_hooks=TracingHooks())
+        reference = read_input_file(self._reference_file.name, file_format="SRT")
+
+        self.assertEqual(calculate_SubER(hypothesis, reference, tracing_hooks=TracingHooks()),
+                         calculate_SubER(hypothesis, reference))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy
+
+from suber.utilities import get_approximate_word_times
+
+
+class ApproximateWordTimesTests(unittest.TestCase):
+    def test_identical_to_linspace(self):
+        subtitle_start_times = [0.0, 1.0, 2.5, 3.2, 3.2, 4.0, 7.123, 10.0]
+        subtitle_end_times = [1.0, 2.5, 3.2, 3.2, 4.0, 6.999, 9.0, 10.5]
+        num_words_per_subtitle = [3, 1, 0, 0, 2, 17, 5, 4]
+
+        expected_word_times = []
+        for start_time, end_time, num_words in zip(subtitle_start_times, subtitle_end_times, num_words_per_subtitle):
+            if num_words:
+                expected_word_times += numpy.linspace(start_time + 1e-8, end_time - 1e-8, num=num_words).tolist()
+
+        word_times = get_approximate_word_times(subtitle_start_times, subtitle_end_times, num_words_per_subtitle)
+
+        self.assertEqual(word_times, expected_word_times)
+        self.assertTrue(all(type(word_time) is float for word_time in word_times))
+
+    def test_empty(self):
+        self.assertEqual(get_approximate_word_times([], [], []), [])
+        self.assertEqual(get_approximate_word_times([1.0], [1.0], [0]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,30 @@
+import os
 import tempfile
 from suber.file_readers import PlainFileReader, SRTFileReader
 
 
+# Reference and hypothesis with the same subtitle timings, differing only in the line break of the second subtitle.
+REFERENCE_SRT = """
+    1
+    00:00:00,000 --> 00:00:01,000
+    This is a simple first frame.
+
+    2
+    00:00:01,000 --> 00:00:02,000
+    This is another frame
+    having two lines."""
+
+HYPOTHESIS_SRT = """
+    1
+    00:00:00,000 --> 00:00:01,000
+    This is a simple first frame.
+
+    2
+    00:00:01,000 --> 00:00:02,000
+    This is another
+    frame having two lines."""
+
+
 def create_temporary_file_and_read_it(file_content, file_format="SRT"):
     with tempfile.NamedTemporaryFile(mode="w", suffix=".srt") as temporary_file:
         temporary_file.write(file_content)
@@ -17,3 +40,10 @@ def create_temporary_file_and_read_it(file_content, file_format="SRT"):
         segments = file_reader.read()
 
         return segments
+
+
+def write_temporary_file(directory, file_content, file_name):
+    file_name = os.path.join(directory, file_name)
+    with open(file_name, "w", encoding="utf-8") as file_object:
+        file_object.write(file_content)
+    return file_name